@@ -20,17 +20,19 @@ class Barrier:
         return entrance_x, entrance_y + 3
 
     def draw_barrier(self, color):
-        """Draws barrier with a given color"""
+        """Draws barrier with a given color and returns drawn rectangles"""
+        rects = []
         if self.visible:
             for tile_x, tile_y in self.tiles:
-                drawhelper.draw_line(tile_x - 0.25, tile_y + 0.5,
-                                     tile_x + 1.25, tile_y + 0.5,
-                                     color=color)
+                rects.append(drawhelper.draw_line(tile_x - 0.25, tile_y + 0.5,
+                                                  tile_x + 1.25, tile_y + 0.5,
+                                                  color=color))
+        return rects
 
     def draw(self):
         """Draws barrier"""
-        self.draw_barrier(constants.BARRIER_COLOR)
+        return self.draw_barrier(constants.BARRIER_COLOR)
 
     def clear(self):
         """Clears barrier"""
-        self.draw_barrier(constants.BACKGROUND_COLOR)
+        return self.draw_barrier(constants.BACKGROUND_COLOR)
@@ -0,0 +1,477 @@
+"""Module containing vectorized simulation of many independent games
+
+All games are stored as struct-of-arrays and advanced in lockstep with
+NumPy, following the rules of game.Game and characters module."""
+import numpy as np
+
+import constants, characters, levels, resources, map as gamemap
+
+GHOST_CLASSES = [
+    ('b', characters.Blinky),
+    ('p', characters.Pinky),
+    ('i', characters.Inky),
+    ('c', characters.Clyde),
+]
+BLINKY, PINKY, INKY, CLYDE = range(4)
+
+MAX_LEVEL = 256
+NO_KEY = -1
+
+DX = np.array([1, 0, -1, 0])
+DY = np.array([0, -1, 0, 1])
+CANDIDATES = np.array(gamemap.GHOST_DIRECTIONS)
+
+
+def build_exit_table():
+    """Returns GHOST_EXITS as (mask * 4 + direction, candidate) bool array"""
+    table = np.zeros((len(gamemap.GHOST_EXITS), len(CANDIDATES)), dtype=bool)
+    for index, exits in enumerate(gamemap.GHOST_EXITS):
+        for candidate, direction in enumerate(CANDIDATES):
+            table[index, candidate] = direction in exits
+    return table
+
+
+def build_level_tables():
+    """Returns dictionary of level profile values as arrays indexed by level"""
+    profiles = [levels.get_level_profile(max(level, 1))
+                for level in range(MAX_LEVEL + 1)]
+    return {
+        "pacman_speed": np.array([p.pacman_speed for p in profiles]),
+        "ghost_speed": np.array([p.ghost_speed for p in profiles]),
+        "elroy_pellets": np.array([p.elroy_pellets for p in profiles]),
+        "elroy_speed": np.array([p.elroy_speed for p in profiles]),
+        "fright_time": np.array([p.fright_time for p in profiles]),
+        "fright_ticks": np.array([p.fright_ticks for p in profiles]),
+        "mode_cycle": np.array([p.mode_cycle for p in profiles])
+                      * constants.TICKRATE,
+        "fruit_points": np.array([p.fruit[2] for p in profiles]),
+    }
+
+
+class BatchGame:
+    """N independent headless games advanced together
+
+    Actions passed to step work like Game.press - one direction
+    (or NO_KEY) per game. Ghost speeds may be scaled per game and ghost
+    to evaluate many tuning variants at once."""
+    def __init__(self, count, seed=None, ghost_speed_scale=1.0,
+                 level_map=None):
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        self.map = level_map or resources.RESOURCES.map
+        self.width_px = self.map.width * constants.TILE_SIZE
+        self.ghost_speed_scale = np.broadcast_to(
+            np.asarray(ghost_speed_scale, dtype=float), (count, 4)).copy()
+
+        cells = np.frombuffer(bytes(self.map.cells), dtype=np.uint8)
+        cells = cells.reshape(self.map.height, self.map.width)
+        self.exits = np.frombuffer(bytes(self.map.exits), dtype=np.uint8)
+        self.exits = self.exits.reshape(self.map.height, self.map.width)
+        self.walls = cells == ord(constants.WALL)
+        self.tunnels = cells == ord(constants.TUNNEL)
+        self.power_pellets = cells == ord(constants.POWER_PELLET)
+        self.start_pellets = np.unpackbits(
+            np.frombuffer(self.map.pellets, dtype=np.uint8),
+            count=cells.size, bitorder="little").reshape(cells.shape) == 1
+        self.total_pellets = self.map.total_pellets
+        self.exit_table = build_exit_table()
+        self.levels = build_level_tables()
+
+        barriers = list(self.map.get_barriers())
+        self.entrance = (sum(x for x, _ in barriers) / len(barriers),
+                         sum(y for _, y in barriers) / len(barriers) - 1)
+        self.spawn = (self.entrance[0], self.entrance[1] + 3)
+        self.fruit_tile = self.map.get_coordinates('f')
+
+        self.player_start = self.map.get_coordinates('s')
+        ghosts = [ghost_class(*self.map.get_coordinates(cell), self.map)
+                  for cell, ghost_class in GHOST_CLASSES]
+        self.ghost_start = np.array([(g.x, g.y) for g in ghosts])
+        self.ghost_start_direction = np.array([g.direction for g in ghosts])
+        self.ghost_start_freeze = np.array([g.freeze for g in ghosts])
+        self.ghost_start_in_base = np.array([g.in_base for g in ghosts])
+        self.home_corners = np.array([g.home_corner for g in ghosts],
+                                     dtype=float)
+        self.pellets_to_leave = np.array([g.pellets_to_leave for g in ghosts])
+
+        self.level = np.zeros(count, dtype=np.int64)
+        self.tick = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.lives = np.full(count, 4, dtype=np.int64)
+        self.combo = np.ones(count, dtype=np.int64)
+        self.fruit = np.zeros(count, dtype=np.int64)
+        self.wait = np.zeros(count, dtype=bool)
+        self.done = np.zeros(count, dtype=bool)
+        self.previous_ghosts_state = np.full(count, constants.SCATTER)
+        self.pellets = np.zeros((count,) + self.walls.shape, dtype=bool)
+        self.pellet_count = np.zeros(count, dtype=np.int64)
+
+        self.player_x = np.zeros(count)
+        self.player_y = np.zeros(count)
+        self.player_direction = np.zeros(count, dtype=np.int64)
+        self.player_next_direction = np.zeros(count, dtype=np.int64)
+        self.fright = np.zeros(count, dtype=np.int64)
+        self.power_pellets_eaten = np.zeros(count, dtype=np.int64)
+
+        self.ghost_x = np.zeros((count, 4))
+        self.ghost_y = np.zeros((count, 4))
+        self.ghost_direction = np.zeros((count, 4), dtype=np.int64)
+        self.ghost_state = np.zeros((count, 4), dtype=np.int64)
+        self.ghost_dead = np.zeros((count, 4), dtype=bool)
+        self.ghost_in_base = np.zeros((count, 4), dtype=bool)
+        self.ghost_freeze = np.zeros((count, 4), dtype=bool)
+        self.elroy = np.zeros(count, dtype=np.int64)
+
+        self.initialize_level(np.ones(count, dtype=bool), True)
+
+    def initialize_level(self, mask, next_level):
+        """Initializes level of masked games after death or to advance"""
+        tile_size = constants.TILE_SIZE
+        self.player_x[mask] = (self.player_start[0] + 1) * tile_size
+        self.player_y[mask] = (self.player_start[1] + 0.5) * tile_size
+        self.player_direction[mask] = constants.RIGHT
+        self.player_next_direction[mask] = constants.RIGHT
+        self.fright[mask] = 0
+        self.power_pellets_eaten[mask] = 0
+        self.ghost_x[mask] = self.ghost_start[:, 0]
+        self.ghost_y[mask] = self.ghost_start[:, 1]
+        self.ghost_direction[mask] = self.ghost_start_direction
+        self.ghost_freeze[mask] = self.ghost_start_freeze
+        self.ghost_in_base[mask] = self.ghost_start_in_base
+        self.ghost_dead[mask] = False
+        self.elroy[mask] = 0
+        self.combo[mask] = 1
+        self.fruit[mask] = 0
+        self.wait[mask] = True
+        if next_level:
+            self.pellets[mask] = self.start_pellets
+            self.pellet_count[mask] = self.total_pellets
+            self.level[mask] = np.minimum(self.level[mask] + 1, MAX_LEVEL)
+            self.tick[mask] = 0
+            self.ghost_state[mask] = constants.SCATTER
+        else:
+            self.ghost_state[mask] = self.previous_ghosts_state[mask, None]
+            self.lives[mask] -= 1
+            self.done |= mask & (self.lives == 0)
+
+    def get_cells(self, grid, tile_x, tile_y, outside=0):
+        """Returns grid values at given tiles - outside for tiles off map"""
+        height, width = grid.shape[-2:]
+        inside = (tile_x >= 0) & (tile_x < width) & \
+                 (tile_y >= 0) & (tile_y < height)
+        values = grid[np.clip(tile_y, 0, height - 1),
+                      np.clip(tile_x, 0, width - 1)]
+        return np.where(inside, values, outside)
+
+    def press(self, actions):
+        """Applies key presses (direction or NO_KEY) like Game.press"""
+        actions = np.asarray(actions)
+        pressed = (actions != NO_KEY) & ~self.done
+        horizontal = pressed & self.wait & \
+            ((actions == constants.RIGHT) | (actions == constants.LEFT))
+        turned = horizontal | (pressed & ~self.wait)
+        self.player_direction[horizontal] = actions[horizontal]
+        self.player_next_direction[turned] = actions[turned]
+        self.wait &= ~pressed
+
+    def step(self, actions=None):
+        """Advances all games by one tick like HeadlessGame.step"""
+        if actions is not None:
+            self.press(actions)
+        active = ~self.done & ~self.wait
+        self.wait &= self.done
+
+        ate = self.eat(active)
+        self.spawn_fruit(ate)
+        level_up = ate & (self.pellet_count == 0)
+        self.initialize_level(level_up, True)
+        active &= ~level_up
+
+        self.move_player(active & ~ate)
+        self.change_ghost_states(active)
+        died = self.check_collisions(active)
+        self.initialize_level(died, False)
+        active &= ~died
+
+        player_tiles = (self.player_x // constants.TILE_SIZE).astype(int), \
+            (self.player_y // constants.TILE_SIZE).astype(int)
+        for ghost in range(4):
+            self.move_ghost(ghost, active, player_tiles)
+
+        self.fruit[active & (self.fruit > 0)] -= 1
+        self.tick[active] += 1
+
+    def eat(self, mask):
+        """Eats pellets and fruits under players, returns games that ate"""
+        rows = np.arange(self.count)
+        tile_x = (self.player_x // constants.TILE_SIZE).astype(int)
+        tile_y = (self.player_y // constants.TILE_SIZE).astype(int)
+        inside = (tile_x >= 0) & (tile_x < self.map.width)
+        tile_x = np.clip(tile_x, 0, self.map.width - 1)
+        ate = mask & inside & self.pellets[rows, tile_y, tile_x]
+        self.pellets[rows[ate], tile_y[ate], tile_x[ate]] = False
+        power = ate & self.get_cells(self.power_pellets, tile_x, tile_y,
+                                     False)
+        self.pellet_count[ate] -= 1
+        self.score += np.where(power, 50, np.where(ate, 10, 0))
+
+        self.power_pellets_eaten[power] += 1
+        self.combo[power] = 1
+        self.fright[power] = self.levels["fright_ticks"][self.level[power]]
+        self.change_state(power, constants.FRIGHTENED)
+
+        elroy_pellets = self.levels["elroy_pellets"][self.level]
+        self.elroy[ate & (self.pellet_count <= elroy_pellets[:, 0])] = 1
+        self.elroy[ate & (self.pellet_count <= elroy_pellets[:, 1])] = 2
+
+        fruit_x, fruit_y = self.fruit_tile
+        fruit = mask & ~ate & (self.fruit > 0) & (tile_y == fruit_y) & \
+            ((tile_x == fruit_x) | (tile_x == fruit_x + 1))
+        self.score[fruit] += self.levels["fruit_points"][self.level[fruit]]
+        self.fruit[fruit] = 0
+        return ate
+
+    def spawn_fruit(self, mask):
+        """Spawns fruits in masked games when enough pellets are eaten"""
+        spawn = mask & np.isin(self.total_pellets - self.pellet_count,
+                               constants.FRUIT_SPAWN)
+        self.fruit[spawn] = self.rng.integers(
+            9 * constants.TICKRATE, 10 * constants.TICKRATE + 1,
+            size=np.count_nonzero(spawn))
+
+    def move_player(self, mask):
+        """Player movement mechanism for masked games"""
+        tile_size = constants.TILE_SIZE
+        level = self.level
+        speed = np.where(self.fright == 0,
+                         self.levels["pacman_speed"][level, 1],
+                         self.levels["pacman_speed"][level, 0])
+        x, y = self.player_x, self.player_y
+        direction = self.player_direction
+        distance_to_center, distance_to_next_tile = \
+            self.get_distances(x, y, direction)
+
+        at_center = mask & (0 < x) & (x < self.width_px) & \
+            (distance_to_center <= speed) & \
+            (distance_to_next_tile >= tile_size)
+        x = np.where(at_center, x + DX[direction] * distance_to_center, x)
+        y = np.where(at_center, y + DY[direction] * distance_to_center, y)
+        speed = np.where(at_center, speed - distance_to_center, speed)
+
+        tile_x = (x // tile_size).astype(int)
+        tile_y = (y // tile_size).astype(int)
+        next_direction = self.player_next_direction
+        exits = self.get_cells(self.exits, tile_x, tile_y, 0b1111)
+        turn = at_center & (direction != next_direction) & \
+            (exits >> next_direction & 1).astype(bool)
+        direction = np.where(turn, next_direction, direction)
+        blocked = self.get_cells(self.walls, tile_x + DX[direction],
+                                 tile_y + DY[direction], False)
+        speed = np.where(at_center & blocked, 0, speed)
+
+        x = x + DX[direction] * speed
+        y = y + DY[direction] * speed
+        self.player_x[mask] = self.wrap(x)[mask]
+        self.player_y[mask] = y[mask]
+        self.player_direction[mask] = direction[mask]
+
+    def get_distances(self, x, y, direction):
+        """Returns distances to current tile center and to the next one"""
+        tile_size = constants.TILE_SIZE
+        tile_x = x // tile_size
+        tile_y = y // tile_size
+        distance_to_center = np.abs((tile_x + 0.5) * tile_size - x) + \
+            np.abs((tile_y + 0.5) * tile_size - y)
+        distance_to_next_tile = \
+            np.abs((tile_x + DX[direction] + 0.5) * tile_size - x) + \
+            np.abs((tile_y + DY[direction] + 0.5) * tile_size - y)
+        return distance_to_center, distance_to_next_tile
+
+    def wrap(self, x):
+        """Returns x coordinates wrapped through the tunnel"""
+        half_tile = constants.TILE_SIZE / 2
+        return np.where(x <= -half_tile, self.width_px + half_tile,
+                        np.where(x >= self.width_px + half_tile,
+                                 -half_tile, x))
+
+    def change_state(self, mask, new_state):
+        """Changes state of all ghosts in masked games (see Ghost)"""
+        if not mask.any():
+            return
+        mask = mask[:, None]
+        reverse = mask & (self.ghost_state != constants.FRIGHTENED) & \
+            ~self.ghost_dead & ~self.ghost_in_base
+        self.ghost_direction[reverse] = (self.ghost_direction[reverse] + 2) % 4
+        self.ghost_state = np.where(mask, new_state, self.ghost_state)
+
+    def change_ghost_states(self, mask):
+        """Operates the ghost state cycle rotation for masked games"""
+        frightened = mask & (self.fright > 0)
+        self.fright[frightened] -= 1
+        mask = mask & ~frightened
+
+        fright_over = mask & (self.ghost_state ==
+                              constants.FRIGHTENED).any(axis=1)
+        for state in (constants.SCATTER, constants.CHASE):
+            self.change_state(fright_over &
+                              (self.previous_ghosts_state == state), state)
+
+        cycle_tick = self.tick - self.power_pellets_eaten * \
+            self.levels["fright_time"][self.level] * constants.TICKRATE
+        matches = self.levels["mode_cycle"][self.level] == cycle_tick[:, None]
+        cycle = mask & matches.any(axis=1)
+        new_state = np.where(matches.argmax(axis=1) % 2,
+                             constants.SCATTER, constants.CHASE)
+        self.previous_ghosts_state[cycle] = new_state[cycle]
+        for state in (constants.SCATTER, constants.CHASE):
+            self.change_state(cycle & (new_state == state), state)
+
+    def check_collisions(self, mask):
+        """Eats frightened ghosts met by players, returns games with death"""
+        tile_size = constants.TILE_SIZE
+        player_x = self.player_x // tile_size
+        player_y = self.player_y // tile_size
+        died = np.zeros(self.count, dtype=bool)
+        for ghost in range(4):
+            alive = mask & ~died & ~self.ghost_dead[:, ghost]
+            hit = alive & \
+                (self.ghost_x[:, ghost] // tile_size == player_x) & \
+                (self.ghost_y[:, ghost] // tile_size == player_y)
+            eaten = hit & (self.ghost_state[:, ghost] == constants.FRIGHTENED)
+            self.score[eaten] += 200 * self.combo[eaten]
+            self.combo[eaten] *= 2
+            self.ghost_dead[eaten, ghost] = True
+            died |= hit & ~eaten
+        return died
+
+    def get_ghost_speed(self, ghost, tile_x, tile_y):
+        """Returns speed of given ghost in every game"""
+        speeds = self.levels["ghost_speed"][self.level]
+        frightened = ~self.ghost_dead[:, ghost] & \
+            (self.ghost_state[:, ghost] == constants.FRIGHTENED)
+        speed = np.where(frightened, speeds[:, 1], speeds[:, 0])
+        if ghost == BLINKY:
+            elroy_speed = self.levels["elroy_speed"][self.level]
+            speed = np.where(~frightened & (self.elroy == 1),
+                             elroy_speed[:, 0], speed)
+            speed = np.where(~frightened & (self.elroy == 2),
+                             elroy_speed[:, 1], speed)
+        tunnel = self.get_cells(self.tunnels, tile_x, tile_y, False)
+        speed = np.where(tunnel, speeds[:, 2], speed)
+        return speed * self.ghost_speed_scale[:, ghost]
+
+    def get_chase_target(self, ghost, tile_x, tile_y, player_tiles):
+        """Returns chase targets of given ghost (see Ghost subclasses)"""
+        player_x, player_y = player_tiles
+        direction = self.player_direction
+        if ghost == PINKY:
+            return player_x + 4 * DX[direction], player_y + 4 * DY[direction]
+        if ghost == INKY:
+            blinky_x = self.ghost_x[:, BLINKY] // constants.TILE_SIZE
+            blinky_y = self.ghost_y[:, BLINKY] // constants.TILE_SIZE
+            return (blinky_x + 2 * (player_x + 2 * DX[direction] - blinky_x),
+                    blinky_y + 2 * (player_y + 2 * DY[direction] - blinky_y))
+        if ghost == CLYDE:
+            near = (tile_x - player_x) ** 2 + (tile_y - player_y) ** 2 < 64
+            return (np.where(near, self.home_corners[ghost, 0], player_x),
+                    np.where(near, self.home_corners[ghost, 1], player_y))
+        return player_x, player_y
+
+    def get_target(self, ghost, tile_x, tile_y, player_tiles):
+        """Returns targets of given ghost depending on its state"""
+        chase_x, chase_y = self.get_chase_target(ghost, tile_x, tile_y,
+                                                 player_tiles)
+        chase = self.ghost_state[:, ghost] == constants.CHASE
+        dead = self.ghost_dead[:, ghost]
+        target_x = np.where(chase, chase_x, self.home_corners[ghost, 0])
+        target_y = np.where(chase, chase_y, self.home_corners[ghost, 1])
+        return (np.where(dead, self.entrance[0], target_x),
+                np.where(dead, self.entrance[1], target_y))
+
+    def choose_direction(self, ghost, mask, tile_x, tile_y, player_tiles):
+        """Returns chosen directions and games where ghost had any exit"""
+        dead = self.ghost_dead[:, ghost]
+        exits = self.get_cells(self.exits, tile_x, tile_y, 0b1111)
+        exits = np.where(dead, exits & 0b1111, exits)
+        valid = self.exit_table[exits * 4 + self.ghost_direction[:, ghost]]
+        valid &= mask[:, None]
+        any_exit = valid.any(axis=1)
+
+        target_x, target_y = self.get_target(ghost, tile_x, tile_y,
+                                             player_tiles)
+        distances = (tile_x[:, None] + DX[CANDIDATES] - target_x[:, None]) \
+            ** 2 + (tile_y[:, None] + DY[CANDIDATES] - target_y[:, None]) ** 2
+        distances = np.where(valid, distances, np.inf)
+        randomness = np.where(valid, self.rng.random(valid.shape), -1)
+        frightened = ~dead & \
+            (self.ghost_state[:, ghost] == constants.FRIGHTENED)
+        choice = np.where(frightened, randomness.argmax(axis=1),
+                          distances.argmin(axis=1))
+        return CANDIDATES[choice], any_exit
+
+    def move_ghost(self, ghost, mask, player_tiles):
+        """Ghost movement mechanism for masked games (see Ghost.move)"""
+        tile_size = constants.TILE_SIZE
+        x = self.ghost_x[:, ghost]
+        y = self.ghost_y[:, ghost]
+        direction = self.ghost_direction[:, ghost]
+        tile_x = (x // tile_size).astype(int)
+        tile_y = (y // tile_size).astype(int)
+        speed = self.get_ghost_speed(ghost, tile_x, tile_y)
+
+        frozen = mask & self.ghost_freeze[:, ghost]
+        self.ghost_freeze[frozen, ghost] = self.pellet_count[frozen] > \
+            self.total_pellets - self.pellets_to_leave[ghost]
+        mask = mask & ~frozen
+
+        # leave base
+        in_base = mask & self.ghost_in_base[:, ghost]
+        entrance_x = (self.entrance[0] + 0.5) * tile_size
+        entrance_y = (self.entrance[1] + 0.5) * tile_size
+        aligned = in_base & (np.abs(x - entrance_x) <= speed / 2)
+        left = aligned & (np.abs(y - entrance_y) <= speed / 2)
+        going_up = aligned & ~left
+        self.ghost_in_base[left, ghost] = False
+        direction = np.where(left, constants.LEFT, direction)
+        direction = np.where(going_up, constants.UP, direction)
+        x = np.where(going_up, entrance_x, x)
+
+        # choose direction at tile center
+        outside = mask & ~in_base & (0 < x) & (x < self.width_px)
+        distance_to_center, distance_to_next_tile = \
+            self.get_distances(x, y, direction)
+        decide = outside & (distance_to_center <= speed) & \
+            (distance_to_next_tile >= tile_size)
+        new_direction, any_exit = self.choose_direction(
+            ghost, decide, tile_x, tile_y, player_tiles)
+        snap = decide & any_exit
+        new_direction = np.where(snap, new_direction, direction)
+        x = np.where(snap, (tile_x + 0.5) * tile_size, x)
+        y = np.where(snap, (tile_y + 0.5) * tile_size, y)
+        x = np.where(decide, x + DX[new_direction] * distance_to_center, x)
+        y = np.where(decide, y + DY[new_direction] * distance_to_center, y)
+        speed = np.where(decide, speed - distance_to_center, speed)
+        speed = np.where(decide & (new_direction != direction), 0, speed)
+        direction = new_direction
+
+        # go back to base if dead
+        dead = self.ghost_dead[:, ghost]
+        returning = outside & ~decide & dead & \
+            (np.abs(distance_to_center - tile_size / 2) <= speed)
+        sign = np.where(x % tile_size - tile_size / 2 >= 0, 1, -1)
+        half_tile_x = tile_x + sign * 0.5
+        at_entrance = returning & (half_tile_x == self.entrance[0]) & \
+            (tile_y == self.entrance[1])
+        at_spawn = returning & (half_tile_x == self.spawn[0]) & \
+            (tile_y == self.spawn[1])
+        direction = np.where(at_entrance, constants.DOWN, direction)
+        self.ghost_dead[at_spawn, ghost] = False
+        self.ghost_in_base[at_spawn, ghost] = True
+        self.ghost_state[at_spawn, ghost] = \
+            self.previous_ghosts_state[at_spawn]
+
+        x = self.wrap(x + DX[direction] * speed)
+        y = y + DY[direction] * speed
+        self.ghost_x[mask, ghost] = x[mask]
+        self.ghost_y[mask, ghost] = y[mask]
+        self.ghost_direction[mask, ghost] = direction[mask]
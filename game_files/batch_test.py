@@ -0,0 +1,99 @@
+"""Batch module tests - compared against headless game"""
+import random
+import unittest
+
+import numpy as np
+
+import constants, farm, game, batch
+
+
+class FirstChoice:
+    """Random number generator stand-in for both games
+
+    Frightened ghosts take the first possible direction and fruits
+    stay for the shortest time, so both games make the same choices."""
+    def choice(self, sequence):
+        return sequence[0]
+
+    def randint(self, low, _high):
+        return low
+
+    def random(self, shape):
+        return np.broadcast_to(np.arange(shape[-1], 0, -1.0), shape)
+
+    def integers(self, low, _high, size):
+        return np.full(size, low)
+
+
+class BatchGameTest(unittest.TestCase):
+    def setUp(self):
+        self.batch = batch.BatchGame(3, seed=0)
+
+    def test_setup(self):
+        np.testing.assert_array_equal(self.batch.level, 1)
+        np.testing.assert_array_equal(self.batch.lives, 4)
+        np.testing.assert_array_equal(self.batch.pellet_count, 244)
+        self.assertEqual(self.batch.pellets[0].sum(), 244)
+        self.assertTrue(self.batch.wait.all())
+
+    def test_wrap(self):
+        width = self.batch.width_px
+        half_tile = constants.TILE_SIZE / 2
+        np.testing.assert_array_equal(
+            self.batch.wrap(np.array([-half_tile, 10, width + half_tile])),
+            [width + half_tile, 10, -half_tile])
+
+    def test_matches_headless_game(self):
+        headless = game.HeadlessGame()
+        headless.random = FirstChoice()
+        headless.initialize_level(True)
+        self.batch = batch.BatchGame(1)
+        self.batch.rng = FirstChoice()
+        policy = farm.GreedyPolicy(random.Random(0))
+        events = set()
+        while not {"death", "energizer", "ghost", "level"} <= events:
+            direction = policy.choose(headless)
+            if direction is not None:
+                headless.press(direction)
+            self.batch.step([batch.NO_KEY if direction is None
+                             else direction])
+            lives, level = headless.lives, headless.level
+            power_pellets = headless.player.power_pellets
+            dead = [ghost.dead for ghost in headless.ghosts.values()]
+            headless.step()
+            if headless.lives != lives:
+                events.add("death")
+            if headless.level != level:
+                events.add("level")
+            if headless.player.power_pellets > power_pellets:
+                events.add("energizer")
+            if any(ghost.dead and not was_dead for ghost, was_dead
+                   in zip(headless.ghosts.values(), dead)):
+                events.add("ghost")
+            self.assert_same_state(headless)
+
+    def assert_same_state(self, headless):
+        self.assertEqual(self.batch.level[0], headless.level)
+        self.assertEqual(self.batch.lives[0], headless.lives)
+        self.assertEqual(self.batch.score[0], headless.score)
+        self.assertEqual(self.batch.wait[0], headless.wait)
+        self.assertEqual(self.batch.pellet_count[0], len(headless.pellets))
+        self.assertAlmostEqual(self.batch.player_x[0], headless.player.x)
+        self.assertAlmostEqual(self.batch.player_y[0], headless.player.y)
+        for ghost, character in enumerate(headless.ghosts.values()):
+            self.assertAlmostEqual(self.batch.ghost_x[0, ghost], character.x)
+            self.assertAlmostEqual(self.batch.ghost_y[0, ghost], character.y)
+            self.assertEqual(self.batch.ghost_state[0, ghost],
+                             character.state)
+            self.assertEqual(self.batch.ghost_dead[0, ghost], character.dead)
+
+    def test_games_are_independent(self):
+        for _ in range(200):
+            self.batch.step([constants.LEFT, constants.RIGHT, batch.NO_KEY])
+        self.assertNotEqual(self.batch.player_x[0], self.batch.player_x[1])
+        self.assertEqual(self.batch.player_x[1], self.batch.player_x[2])
+        self.assertGreater(self.batch.score.min(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
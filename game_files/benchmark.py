@@ -0,0 +1,319 @@
+"""Benchmark suite - measures map, simulation and drawing costs
+
+Results are saved as JSON and may be compared against a baseline file,
+every case slower than baseline by more than threshold is a regression
+and every case missing in the baseline fails the comparison as well.
+Rendered cases use SDL dummy video driver unless other one is set."""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import pygame
+
+import constants, env, game, horde, resources, map as gamemap
+
+BENCHMARKS = {}
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.2
+
+
+def benchmark(name):
+    """Registers benchmark case
+
+    Case function prepares everything needed and returns function to
+    measure and number of operations done by one call of it. Cases
+    cleaning up after measuring yield them instead."""
+    def register(case):
+        BENCHMARKS[name] = case
+        return case
+    return register
+
+
+@benchmark("map_init")
+def map_init():
+    """Reading and parsing the text map, operation is one map"""
+    return lambda: gamemap.Map(constants.GAMEMAP_FILE), 1
+
+
+@benchmark("map_init_compiled")
+def map_init_compiled():
+    """Loading the compiled map, operation is one map"""
+    with tempfile.TemporaryDirectory() as directory:
+        map_file = os.path.join(directory,
+                                os.path.basename(constants.GAMEMAP_FILE))
+        shutil.copy(constants.GAMEMAP_FILE, map_file)
+        gamemap.compile_map(map_file)
+        yield lambda: gamemap.Map(map_file), 1
+
+
+@benchmark("map_get_tile")
+def map_get_tile():
+    """Tile lookups over the whole map, operation is one tile"""
+    level_map = resources.RESOURCES.map
+    coordinates = [(x, y) for y in range(level_map.height)
+                   for x in range(level_map.width)]
+
+    def run():
+        for tile_x, tile_y in coordinates:
+            level_map.get_tile(tile_x, tile_y)
+    return run, len(coordinates)
+
+
+@benchmark("map_get_walls")
+def map_get_walls():
+    """Listing all walls of the map, operation is one listing"""
+    return lambda: list(resources.RESOURCES.map.get_walls()), 1
+
+
+@benchmark("game_remove_pellet")
+def game_remove_pellet():
+    """Eating every pellet of a level, operation is one pellet"""
+    game_obj = game.HeadlessGame(0)
+    tiles = [(tile.x, tile.y) for tile in game_obj.map.get_pellets()]
+
+    def run():
+        game_obj.initialize_level(True)
+        for tile_x, tile_y in tiles:
+            game_obj.remove_pellet(tile_x, tile_y)
+    return run, len(tiles)
+
+
+@benchmark("ghost_decision")
+def ghost_decision():
+    """Ghost targeting at intersections, operation is one ghost decision"""
+    game_obj = game.HeadlessGame(0)
+    game_obj.initialize_level(True)
+    ghosts = list(game_obj.ghosts.values())
+    positions = [(ghost.x, ghost.y, ghost.direction) for ghost in ghosts]
+    states = [constants.SCATTER, constants.CHASE, constants.FRIGHTENED]
+    game_obj.targets.update(game_obj.player, game_obj.ghosts["blinky"])
+
+    def run():
+        for state in states:
+            for ghost, (x, y, direction) in zip(ghosts, positions):
+                ghost.x, ghost.y, ghost.direction = x, y, direction
+                ghost.state = state
+                ghost.update_target(game_obj.targets)
+                ghost.choose_direction(ghost.get_possible_directions())
+    return run, len(states) * len(ghosts)
+
+
+def game_step(game_class, ghost_count=constants.GHOST_COUNT):
+    """Returns function playing one tick of given game class"""
+    def new_game():
+        game_obj = game_class(0)
+        game_obj.horde = horde.get_horde(ghost_count)
+        game_obj.initialize_level(True)
+        return game_obj
+    games = [new_game()]
+
+    def run():
+        game_obj = games[0]
+        if game_obj.finished():
+            game_obj = games[0] = new_game()
+        if game_obj.wait:
+            game_obj.press(constants.LEFT)
+        game_obj.step()
+    return run, 1
+
+
+@benchmark("headless_step")
+def headless_step():
+    """Headless game play, operation is one tick"""
+    return game_step(game.HeadlessGame)
+
+
+@benchmark("horde_step_per_ghost")
+def horde_step_per_ghost():
+    """Headless play with 256 ghosts, operation is one ghost tick"""
+    run_step, _ = game_step(game.HeadlessGame, 256)
+    return run_step, 256
+
+
+@benchmark("env_step")
+def env_step():
+    """Environment steps with scripted actions, operation is one step"""
+    environment = env.Env()
+    environment.reset(0)
+    actions = [constants.LEFT, env.NO_ACTION, constants.UP, env.NO_ACTION,
+               constants.RIGHT, env.NO_ACTION, constants.DOWN, env.NO_ACTION]
+    steps = [0]
+
+    def run():
+        _, _, done, _ = environment.step(actions[steps[0] // 30 % 8])
+        steps[0] += 1
+        if done:
+            environment.reset(steps[0])
+    return run, 1
+
+
+class RenderedGame(game.Game):
+    """Game drawn in window which does not wait for key after game over"""
+    def wait_for_key(self):
+        pass
+
+
+@benchmark("rendered_step")
+def rendered_step():
+    """Game play drawn in window, operation is one tick"""
+    open_display()
+    return game_step(RenderedGame)
+
+
+@benchmark("draw_walls")
+def draw_walls():
+    """Drawing walls of the whole view, operation is one redraw"""
+    open_display()
+    game_obj = game.Game(0)
+    game_obj.draw_walls()
+    return game_obj.draw_walls, 1
+
+
+def run_python(code):
+    """Returns function running given code in new interpreter"""
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy",
+                       PYGAME_HIDE_SUPPORT_PROMPT="1")
+    return lambda: subprocess.run([sys.executable, "-c", code],
+                                  env=environment, check=True)
+
+
+@benchmark("import_logic")
+def import_logic():
+    """New interpreter importing game logic, operation is one run"""
+    return run_python("import characters, levels, pellets"), 1
+
+
+@benchmark("startup_first_frame")
+def startup_first_frame():
+    """New interpreter rendering first frame, operation is one run"""
+    return run_python("import pygame, game; pygame.init(); "
+                      "game_obj = game.Game(0); "
+                      "game_obj.initialize_level(True); game_obj.render()"), 1
+
+
+def open_display():
+    """Initializes pygame display - dummy one if no driver is chosen"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+
+
+def measure(case, min_time, repeat):
+    """Returns best and median time of one operation in microseconds"""
+    prepared = case()
+    if not isinstance(prepared, types.GeneratorType):
+        return measure_function(*prepared, min_time, repeat)
+    with contextlib.closing(prepared):
+        return measure_function(*next(prepared), min_time, repeat)
+
+
+def measure_function(function, operations, min_time, repeat):
+    """Returns best and median time of one operation of the function"""
+    function()
+    calls = 1
+    start_time = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start_time
+    if elapsed > 0:
+        calls = max(1, int(min_time / elapsed))
+
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start_time
+        times.append(elapsed / calls / operations * 1e6)
+    return {"best_us": min(times), "median_us": statistics.median(times)}
+
+
+def run_all(names, min_time=0.2, repeat=5):
+    """Runs given benchmarks and returns results dictionary"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {name: measure(BENCHMARKS[name], min_time, repeat)
+                    for name in names},
+    }
+
+
+def get_missing(results, baseline):
+    """Returns names of measured cases which are not in the baseline"""
+    return [name for name in results["results"]
+            if name not in baseline["results"]]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Returns (name, ratio) of cases slower than baseline by threshold
+
+    Ratio is median time divided by baseline median time, cases missing
+    in the baseline are left out (see get_missing)."""
+    regressions = []
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["median_us"] / baseline["results"][name]["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main():
+    """Runs benchmarks, prints and saves results, checks for regressions"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", metavar="PATH",
+                        help="save results as JSON")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help=f"compare with results file "
+                             f"(default: {DEFAULT_BASELINE} if it exists)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown relative to baseline")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum time of one repetition in seconds")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of repetitions")
+    args = parser.parse_args()
+
+    results = run_all(args.names or list(BENCHMARKS), args.min_time,
+                      args.repeat)
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    for name, result in results["results"].items():
+        line = f"{name:20} {result['median_us']:12.2f} us"
+        if baseline and name in baseline["results"]:
+            ratio = result["median_us"] / \
+                baseline["results"][name]["median_us"]
+            line += f"  ({ratio:.2f}x baseline)"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"regression: {name} is {ratio:.2f}x slower than baseline")
+        missing = get_missing(results, baseline)
+        for name in missing:
+            print(f"missing: {name} is not in baseline, save new one "
+                  f"with --output")
+        if regressions or missing:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
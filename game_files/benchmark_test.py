@@ -0,0 +1,38 @@
+"""Benchmark module tests - comparison with baseline"""
+import json
+import unittest
+
+import benchmark
+
+
+def results(**medians):
+    return {"results": {name: {"best_us": median, "median_us": median}
+                        for name, median in medians.items()}}
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_compare(self):
+        baseline = results(fast=10, slow=10, same=10)
+        current = results(fast=5, slow=13, same=11.9, new=100)
+        self.assertEqual(benchmark.compare(current, baseline, 0.2),
+                         [("slow", 1.3)])
+
+    def test_missing(self):
+        baseline = results(old=10)
+        self.assertEqual(benchmark.get_missing(results(old=9, new=1),
+                                               baseline), ["new"])
+
+    def test_baseline_has_all_cases(self):
+        with open(benchmark.DEFAULT_BASELINE, encoding="utf-8") as file:
+            baseline = json.load(file)
+        self.assertEqual(sorted(baseline["results"]),
+                         sorted(benchmark.BENCHMARKS))
+
+    def test_measure(self):
+        result = benchmark.measure(benchmark.map_get_tile, 0.001, 2)
+        self.assertGreater(result["median_us"], 0)
+        self.assertLessEqual(result["best_us"], result["median_us"])
+
+
+if __name__ == "__main__":
+    unittest.main()
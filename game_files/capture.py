@@ -0,0 +1,181 @@
+"""Offscreen frame capture - game frames as NumPy views without a window
+
+Frames are views of the offscreen surface pixels (pygame.surfarray),
+so they are not copied. A view is valid until the next frame is played
+and it has to be dropped (or copied) by then, as surfaces can not be
+drawn on while their pixels are referenced."""
+import argparse
+import os
+import random
+import time
+import numpy as np
+import pygame
+
+import farm, game, inputs
+
+# Weights of red, green and blue in grayscale frames, sum up to 256
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+class FrameCapture:
+    """Views of surface pixels as (height, width, 3) RGB frames
+
+    Downsampled frames take every n-th pixel, so they are views as well.
+    Grayscale frames are computed into buffers allocated once."""
+    def __init__(self, surface, downsample=1, grayscale=False):
+        self.surface = surface
+        self.downsample = downsample
+        self.pixels = None
+        width, height = surface.get_size()
+        shape = (-(-height // downsample), -(-width // downsample))
+        self.gray = np.zeros(shape, dtype=np.uint8) if grayscale else None
+        self.channel = np.zeros(shape, dtype=np.uint16)
+        self.sum = np.zeros(shape, dtype=np.uint16)
+
+    def get_rgb(self):
+        """Returns RGB frame - view of surface pixels"""
+        if self.pixels is None:
+            self.pixels = pygame.surfarray.pixels3d(self.surface) \
+                .transpose(1, 0, 2)[::self.downsample, ::self.downsample]
+        return self.pixels
+
+    def get_gray(self):
+        """Returns grayscale frame computed into the buffer"""
+        rgb = self.get_rgb()
+        np.multiply(rgb[..., 0], GRAY_WEIGHTS[0], out=self.sum,
+                    dtype=np.uint16)
+        for channel, weight in enumerate(GRAY_WEIGHTS[1:], 1):
+            np.multiply(rgb[..., channel], weight, out=self.channel,
+                        dtype=np.uint16)
+            np.add(self.sum, self.channel, out=self.sum)
+        np.right_shift(self.sum, 8, out=self.gray, casting="unsafe")
+        return self.gray
+
+    def get(self):
+        """Returns frame in the chosen variant"""
+        return self.get_rgb() if self.gray is None else self.get_gray()
+
+    def release(self):
+        """Drops pixels view, so the surface can be drawn on again"""
+        self.pixels = None
+
+
+class CaptureGame(game.Game):
+    """Game rendered to offscreen surface and captured frame by frame
+
+    Every captured frame is preceded by frame skip updates. Characters
+    are cleared before next updates instead of right after drawing, so
+    they are visible in the frame. Without input source the game only
+    starts levels like headless one."""
+    offscreen = True
+
+    def __init__(self, seed=None, input_source=None, frame_skip=1,
+                 downsample=1, grayscale=False):
+        super().__init__(seed, input_source)
+        self.frame_skip = frame_skip
+        self.capture = FrameCapture(self.resources.window, downsample,
+                                    grayscale)
+        self.deferring = False
+        self.clear_pending = False
+
+    def create_input_source(self):
+        return inputs.InputSource()
+
+    def handle_input(self):
+        if self.wait:
+            self.press(None)
+        super().handle_input()
+
+    def next_frame(self):
+        """Plays frame skip updates, renders and returns captured frame
+
+        Raises RuntimeError if previous RGB frame is still referenced."""
+        self.capture.release()
+        if self.capture.surface.get_locked():
+            raise RuntimeError("previous frame is still referenced, "
+                               "copy it if it has to be kept")
+        if self.clear_pending:
+            self.clear_pending = False
+            super().clear_characters()
+        for _ in range(self.frame_skip):
+            self.update()
+            if self.finished():
+                break
+        self.render()
+        return self.capture.get()
+
+    def render(self):
+        self.deferring = True
+        super().render()
+        self.deferring = False
+
+    def clear_characters(self):
+        if self.deferring:
+            self.clear_pending = True
+        else:
+            super().clear_characters()
+
+    def update_display(self):
+        self.dirty_rects = []
+
+
+def main():
+    """Plays game offscreen, reports capture rate and may save frames"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=1000,
+                        help="number of frames to capture")
+    parser.add_argument("--frame-skip", type=int, default=1,
+                        help="updates played for every captured frame")
+    parser.add_argument("--downsample", type=int, default=1,
+                        help="keep every n-th pixel of rows and columns")
+    parser.add_argument("--grayscale", action="store_true",
+                        help="capture grayscale frames")
+    parser.add_argument("--agent", default="greedy",
+                        help=f"one of {', '.join(farm.POLICIES)} "
+                             "or module:Class import path")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the game and the agent")
+    parser.add_argument("--output", metavar="PATH",
+                        help="save frames as one .npy array")
+    args = parser.parse_args()
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    game_obj = CaptureGame(args.seed, inputs.AgentInput(
+        farm.get_policy(args.agent)(random.Random(args.seed))),
+        args.frame_skip, args.downsample, args.grayscale)
+    game_obj.initialize_level(True)
+
+    frames = None
+    shape = None
+    count = 0
+    start_time = time.perf_counter()
+    while count < args.frames and not game_obj.finished():
+        frame = game_obj.next_frame()
+        shape = frame.shape
+        if args.output:
+            if frames is None:
+                frames = np.lib.format.open_memmap(
+                    args.output, "w+", frame.dtype, (args.frames,) + shape)
+            frames[count] = frame
+        del frame
+        count += 1
+    elapsed = time.perf_counter() - start_time
+    if frames is not None and count < args.frames:
+        # Game ended early - saved without trailing empty frames, the
+        # mapped file is closed before it is replaced
+        with open(args.output + ".tmp", "wb") as file:
+            np.save(file, frames[:count])
+        del frames
+        os.replace(args.output + ".tmp", args.output)
+    elif frames is not None:
+        frames.flush()
+    print(f"frames: {count} ({count / elapsed:.0f} frames/s) "
+          f"size: {shape} score: {game_obj.score}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
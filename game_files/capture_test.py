@@ -0,0 +1,76 @@
+"""Capture module tests - offscreen game under dummy video driver"""
+import os
+import unittest
+
+import numpy as np
+import pygame
+
+import capture, resources
+
+
+class CaptureGameTest(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.font.init()
+        self.resources = resources.RESOURCES
+        resources.RESOURCES = resources.Resources()
+
+    def tearDown(self):
+        resources.RESOURCES = self.resources
+
+    def start(self, **options):
+        game_obj = capture.CaptureGame(0, **options)
+        game_obj.initialize_level(True)
+        return game_obj
+
+    def count_yellow_pixels(self, game_obj, frame):
+        """Returns number of yellow pixels around the player"""
+        x, y = int(game_obj.player.x), int(game_obj.player.y)
+        area = frame[y - 12:y + 12, x - 12:x + 12].astype(int)
+        return ((area[..., 0] > 200) & (area[..., 1] > 200) &
+                (area[..., 2] < 50)).sum()
+
+    def test_frame_is_view_of_surface(self):
+        game_obj = self.start()
+        frame = game_obj.next_frame()
+        window = resources.RESOURCES.window
+        self.assertEqual(frame.shape, (window.get_height(),
+                                       window.get_width(), 3))
+        self.assertFalse(frame.flags.owndata)
+        frame[0, 0] = (1, 2, 3)
+        self.assertEqual(tuple(window.get_at((0, 0)))[:3], (1, 2, 3))
+
+    def test_characters_are_captured(self):
+        game_obj = self.start()
+        for _ in range(30):
+            frame = game_obj.next_frame()
+            self.assertGreater(self.count_yellow_pixels(game_obj, frame), 100)
+            del frame
+        self.assertEqual(game_obj.frame, 30)
+
+    def test_kept_frame_raises(self):
+        game_obj = self.start()
+        frame = game_obj.next_frame()
+        with self.assertRaises(RuntimeError):
+            game_obj.next_frame()
+        del frame
+        game_obj.next_frame()
+
+    def test_variants(self):
+        game_obj = self.start(frame_skip=3, downsample=4, grayscale=True)
+        frame = game_obj.next_frame()
+        self.assertEqual(game_obj.frame, 3)
+        self.assertEqual(frame.dtype, np.uint8)
+        width, height = resources.RESOURCES.window.get_size()
+        self.assertEqual(frame.shape, (-(-height // 4), -(-width // 4)))
+        self.assertIs(game_obj.next_frame(), frame)
+        rgb = game_obj.capture.get_rgb()
+        self.assertEqual(rgb.shape[:2], frame.shape)
+        expected = (rgb.astype(int) @ capture.GRAY_WEIGHTS) >> 8
+        np.testing.assert_array_equal(frame, expected)
+        self.assertGreater(frame.max(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
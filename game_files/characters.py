@@ -2,36 +2,70 @@
 import random
 import math
 import pygame
-import constants, game, drawhelper
+import constants, barrier, drawhelper, resources, map as gamemap
+
+
+MODIFIERS = [
+    lambda x, y, delta: (x + delta, y),  # RIGHT
+    lambda x, y, delta: (x, y - delta),  # UP
+    lambda x, y, delta: (x - delta, y),  # LEFT
+    lambda x, y, delta: (x, y + delta),  # DOWN
+]
 
 
 def get_modified_position(coordinates, direction, delta):
     """Returns modified coortinates by given direction and value"""
-    current_x, current_y = coordinates
-    (new_x, new_y) = {
-        0: lambda x, y: (x + delta, y),  # RIGHT
-        1: lambda x, y: (x, y - delta),  # UP
-        2: lambda x, y: (x - delta, y),  # LEFT
-        3: lambda x, y: (x, y + delta),  # DOWN
-    }[direction](current_x, current_y)
-    return new_x, new_y
+    return MODIFIERS[direction](*coordinates, delta)
+
+
+class Targets:
+    """Tiles chased by ghosts - computed once a tick instead of by each
+
+    Blinky tile is the one of the first Blinky (the leader) and it is
+    updated again after the leader moves, as Inky looks at its position
+    from the current tick. Without Blinky, Inky uses two tiles ahead."""
+    def __init__(self):
+        self.player_tile = (0, 0)
+        self.two_ahead = (0, 0)
+        self.four_ahead = (0, 0)
+        self.blinky_tile = (0, 0)
+
+    def update(self, player, blinky=None):
+        """Computes tiles for current position of player and leader"""
+        self.player_tile = (player.get_tile_x(), player.get_tile_y())
+        self.two_ahead = get_modified_position(self.player_tile,
+                                               player.direction, 2)
+        self.four_ahead = get_modified_position(self.player_tile,
+                                                player.direction, 4)
+        if blinky is None:
+            self.blinky_tile = self.two_ahead
+        else:
+            self.update_blinky(blinky)
+
+    def update_blinky(self, blinky):
+        """Stores tile of the leader after it moved"""
+        self.blinky_tile = (blinky.get_tile_x(), blinky.get_tile_y())
 
 
 class Character:
-    """Base class for Player and Ghost classes"""
-    def __init__(self, tile_x, tile_y):
+    """Base class for Player and Ghost classes
+
+    Characters move on given map (map of shared resources by default)"""
+    def __init__(self, tile_x, tile_y, level_map=None):
+        self.map = level_map or resources.RESOURCES.map
         self.direction = constants.RIGHT
         self.x = (tile_x + 1)   * constants.TILE_SIZE
         self.y = (tile_y + 0.5) * constants.TILE_SIZE
 
     def clear(self):
-        """Clears character in game window"""
-        pygame.draw.rect(game.Game.WINDOW,
-                         constants.BACKGROUND_COLOR,
-                         (self.x - constants.SPRITE_SIZE / 2,
-                          self.y - constants.SPRITE_SIZE / 2,
-                          constants.SPRITE_SIZE,
-                          constants.SPRITE_SIZE))
+        """Clears character in game window and returns cleared rectangle"""
+        return pygame.draw.rect(resources.RESOURCES.window,
+                                constants.BACKGROUND_COLOR,
+                                (*drawhelper.to_screen(
+                                    self.x - constants.SPRITE_SIZE / 2,
+                                    self.y - constants.SPRITE_SIZE / 2),
+                                 constants.SPRITE_SIZE,
+                                 constants.SPRITE_SIZE))
 
     def get_distance_to_tile_center(self, next_tile=False):
         """Returns distance to the center of tile
@@ -57,9 +91,14 @@ class Character:
 
 
 class Ghost(Character):
-    """Base class for all the ghosts"""
-    def __init__(self, tile_x, tile_y, image_row):
-        super().__init__(tile_x, tile_y)
+    """Base class for all the ghosts
+
+    Kind names the ghost in hordes and profiler phases."""
+    kind = None
+    pellets_to_leave = 0
+
+    def __init__(self, tile_x, tile_y, image_row, level_map=None):
+        super().__init__(tile_x, tile_y, level_map)
         self.image_row = image_row
         self.freeze = True
         self.in_base = True
@@ -67,19 +106,21 @@ class Ghost(Character):
         self.speed = 0
         self.home_corner = (0, 0)
         self.target = (0, 0)
-        self.pellets_to_leave = 0
         self.state = constants.SCATTER
+        self.random = random
+        self.barrier = barrier.Barrier(list(self.map.get_barriers()))
+        self.path_accurate = constants.PATH_ACCURATE_GHOSTS
 
-    def get_chase_target(self, player, ghosts):
+    def get_chase_target(self, targets):
         """Abstract method - implementations should return target coordinates"""
         raise NotImplementedError
 
-    def update_target(self, player, ghosts):
+    def update_target(self, targets):
         """Updates the target which ghost will follow"""
         if self.dead:
-            self.target = game.Game.barrier.get_entrance()
+            self.target = self.barrier.get_entrance()
         elif self.state == constants.CHASE:
-            self.target = self.get_chase_target(player, ghosts)
+            self.target = self.get_chase_target(targets)
         elif self.state == constants.SCATTER:
             self.target = self.home_corner
 
@@ -95,33 +136,25 @@ class Ghost(Character):
         self.state = new_state
 
     def get_possible_directions(self):
-        """Returns all possible directions at intersection with ratings"""
-        possible_directions = []
-        tile_x, tile_y = self.get_tile_x(), self.get_tile_y()
-        tiles = [
-            game.Game.MAP.get_tile(tile_x, tile_y - 1),
-            game.Game.MAP.get_tile(tile_x - 1, tile_y),
-            game.Game.MAP.get_tile(tile_x, tile_y + 1),
-            game.Game.MAP.get_tile(tile_x + 1, tile_y),
-        ]
-        distances = [
-            self.get_distance_to_target(tile_x, tile_y - 1),
-            self.get_distance_to_target(tile_x - 1, tile_y),
-            self.get_distance_to_target(tile_x, tile_y + 1),
-            self.get_distance_to_target(tile_x + 1, tile_y),
-        ]
-        directions = [1, 2, 3, 0]  # up, left, down, right - tiebreaker
-        for tile, distance, direction in zip(tiles, distances, directions):
-            if tile not in [constants.WALL, constants.BARRIER]:
-                if self.direction != (direction + 2) % 4:
-                    possible_directions.append((direction, distance))
-
-        if possible_directions[0][0] == constants.UP:
-            if game.Game.MAP.get_tile(tile_x, tile_y) in \
-                    [constants.INTERSECTION, constants.INTERSECTION2]:
-                if not self.dead:
-                    del possible_directions[0]
+        """Returns all possible directions at intersection with ratings
 
+        Directions are rated with squared distance to the target, or with
+        shortest path length for dead ghosts in path accurate mode."""
+        tile_x, tile_y = self.get_tile_x(), self.get_tile_y()
+        target_x, target_y = self.target
+        path_accurate = self.dead and self.path_accurate
+        possible_directions = []
+        for direction in self.map.get_ghost_exits(tile_x, tile_y,
+                                                  self.direction,
+                                                  self.dead):
+            dx, dy = gamemap.DIRECTION_OFFSETS[direction]
+            if path_accurate:
+                rating = self.map.get_ghost_distance(
+                    tile_x + dx, tile_y + dy, direction, target_x, target_y)
+            else:
+                rating = (tile_x + dx - target_x) ** 2 + \
+                         (tile_y + dy - target_y) ** 2
+            possible_directions.append((direction, rating))
         return possible_directions
 
     def get_distance_to_target(self, tile_x, tile_y):
@@ -137,15 +170,13 @@ class Ghost(Character):
             self.x = (self.get_tile_x() + 0.5) * constants.TILE_SIZE
             self.y = (self.get_tile_y() + 0.5) * constants.TILE_SIZE
             if self.state == constants.FRIGHTENED and not self.dead:
-                return sorted(possible_directions,
-                              key=lambda x: random.random())[0][0]
-            return sorted(possible_directions,
-                          key=lambda x: x[1])[0][0]
+                return self.random.choice(possible_directions)[0]
+            return min(possible_directions, key=lambda x: x[1])[0]
         return self.direction
 
     def leave_base(self):
         """Leads the ghosts out of the base"""
-        self.target = game.Game.barrier.get_entrance()
+        self.target = self.barrier.get_entrance()
         tile_size = constants.TILE_SIZE
         entrance_dx = abs(self.x - (self.target[0] + 0.5) * tile_size)
         entrance_dy = abs(self.y - (self.target[1] + 0.5) * tile_size)
@@ -154,14 +185,14 @@ class Ghost(Character):
                 self.in_base = False
                 self.target = self.home_corner
                 self.direction = constants.LEFT
-                game.Game.barrier.visible = True
+                self.barrier.visible = True
             else:
                 self.x = (self.target[0] + 0.5) * tile_size
                 self.direction = constants.UP
 
-    def move(self, player, ghosts, pellet_count, previous_ghosts_state, level):
-        """Ghost movement mechanism"""
-        self.update_speed(level)
+    def move(self, targets, previous_ghosts_state, profile):
+        """Ghost movement mechanism - frozen ghost waits for release"""
+        self.update_speed(profile)
         tile_size = constants.TILE_SIZE
         if not self.freeze:
             if self.in_base:
@@ -171,11 +202,11 @@ class Ghost(Character):
                 distance_to_next_tile = self.get_distance_to_tile_center(
                     next_tile=True)
 
-                if 0 < self.x < constants.GAMEMAP_WIDTH_PX:
+                if 0 < self.x < self.map.width_px:
                     if distance_to_center <= self.speed and \
                        distance_to_next_tile >= tile_size:
                         # Move to tile center
-                        self.update_target(player, ghosts)
+                        self.update_target(targets)
                         previous_direction = self.direction
                         self.direction = self.choose_direction(
                             self.get_possible_directions())
@@ -191,13 +222,13 @@ class Ghost(Character):
                             and self.dead:
                         # Move to base if dead
                         tile_x, tile_y = self.get_tile_x(), self.get_tile_y()
-                        entrance  = game.Game.barrier.get_entrance()
-                        spawn     = game.Game.barrier.get_spawn()
+                        entrance  = self.barrier.get_entrance()
+                        spawn     = self.barrier.get_spawn()
                         sign = math.copysign(
                             1, self.x % tile_size - tile_size / 2)
                         if (tile_x + sign * 0.5, tile_y) == entrance:
                             self.direction = constants.DOWN
-                            game.Game.barrier.visible = False
+                            self.barrier.visible = False
                         if (tile_x + sign * 0.5, tile_y) == spawn:
                             self.dead = False
                             self.in_base = True
@@ -208,17 +239,14 @@ class Ghost(Character):
                                                    self.speed)
 
             if self.x <= -1 * constants.TILE_SIZE / 2:
-                self.x = constants.GAMEMAP_WIDTH_PX + constants.TILE_SIZE / 2
-            elif self.x >= constants.GAMEMAP_WIDTH_PX + constants.TILE_SIZE / 2:
+                self.x = self.map.width_px + constants.TILE_SIZE / 2
+            elif self.x >= self.map.width_px + constants.TILE_SIZE / 2:
                 self.x = -1 * constants.TILE_SIZE / 2
-        else:
-            self.unfreeze(pellet_count)
 
-    def unfreeze(self, pellet_count):
-        """Allow the ghost to move if enough pellets are eaten"""
-        if pellet_count <= game.Game.MAP.total_pellets - self.pellets_to_leave:
-            game.Game.barrier.visible = False
-            self.freeze = False
+    def release(self):
+        """Allow the ghost to move - enough pellets are eaten"""
+        self.barrier.visible = False
+        self.freeze = False
 
     def draw(self, tick, player_fright):
         """Draw ghost animation"""
@@ -226,34 +254,33 @@ class Ghost(Character):
         frame = 0 if self.freeze else int(tick * constants.ANIMATION_SPEED) % 2
 
         if self.dead:
-            game.Game.WINDOW.blit(
+            return resources.RESOURCES.window.blit(
                 drawhelper.get_image_at(4 + self.direction, 5),
-                (self.x - sprite_size / 2, self.y - sprite_size / 2))
+                drawhelper.to_screen(self.x - sprite_size / 2,
+                                     self.y - sprite_size / 2))
         elif self.state == constants.FRIGHTENED:
             if player_fright <= 100:
                 frame += int(tick * constants.ANIMATION_SPEED / 2) % 2 * 2
-            game.Game.WINDOW.blit(
+            return resources.RESOURCES.window.blit(
                 drawhelper.get_image_at(frame, 5),
-                (self.x - sprite_size / 2, self.y - sprite_size / 2))
+                drawhelper.to_screen(self.x - sprite_size / 2,
+                                     self.y - sprite_size / 2))
         else:
-            game.Game.WINDOW.blit(
+            return resources.RESOURCES.window.blit(
                 drawhelper.get_image_at(frame + self.direction * 2,
                                         self.image_row),
-                (self.x - sprite_size / 2, self.y - sprite_size / 2))
+                drawhelper.to_screen(self.x - sprite_size / 2,
+                                     self.y - sprite_size / 2))
 
-    def update_speed(self, level):
+    def update_speed(self, profile):
         """Update speed of the ghost"""
-        if game.Game.MAP.get_tile(self.get_tile_x(),
-                                  self.get_tile_y()) == constants.TUNNEL:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[2]
+        if self.map.get_tile(self.get_tile_x(),
+                             self.get_tile_y()) == constants.TUNNEL:
+            self.speed = profile.ghost_speed[2]
         elif not self.dead and self.state == constants.FRIGHTENED:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[1]
+            self.speed = profile.ghost_speed[1]
         else:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[0]
-        self.speed = constants.BASE_SPEED * multiplier
+            self.speed = profile.ghost_speed[0]
 
 
 class Blinky(Ghost):
@@ -264,35 +291,31 @@ class Blinky(Ghost):
 
     Targeting: Blinky follows the pacman directly.
     """
-    def __init__(self, tile_x, tile_y):
-        super().__init__(tile_x, tile_y, constants.BLINKY_ROW)
+    kind = "blinky"
+
+    def __init__(self, tile_x, tile_y, level_map=None):
+        super().__init__(tile_x, tile_y, constants.BLINKY_ROW, level_map)
         self.freeze = False
         self.in_base = False
-        self.home_corner = (24, -3)
-        self.target = (24, -3)
+        self.home_corner = (self.map.width - 4, -3)
+        self.target = self.home_corner
         self.elroy = 0
 
-    def get_chase_target(self, player, ghosts):
-        return player.get_tile_x(), player.get_tile_y()
+    def get_chase_target(self, targets):
+        return targets.player_tile
 
-    def update_speed(self, level):
+    def update_speed(self, profile):
         tile_x, tile_y = self.get_tile_x(), self.get_tile_y()
-        if game.Game.MAP.get_tile(tile_x, tile_y) == constants.TUNNEL:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[2]
+        if self.map.get_tile(tile_x, tile_y) == constants.TUNNEL:
+            self.speed = profile.ghost_speed[2]
         elif not self.dead and self.state == constants.FRIGHTENED:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[1]
+            self.speed = profile.ghost_speed[1]
         elif self.elroy == 1:
-            multiplier = constants.get_level_based_constant(
-                level, constants.ELROY_SPEED_MULTIPLIER)[0][1]
+            self.speed = profile.elroy_speed[0]
         elif self.elroy == 2:
-            multiplier = constants.get_level_based_constant(
-                level, constants.ELROY_SPEED_MULTIPLIER)[1][1]
+            self.speed = profile.elroy_speed[1]
         else:
-            multiplier = constants.get_level_based_constant(
-                level, constants.GHOST_SPEED_MULTIPLIER)[0]
-        self.speed = constants.BASE_SPEED * multiplier
+            self.speed = profile.ghost_speed[0]
 
 
 class Inky(Ghost):
@@ -303,18 +326,18 @@ class Inky(Ghost):
     Targeting: Inky follows the tile pointed by doubled vector
         drawn from Blinky to Pacman
     """
-    def __init__(self, tile_x, tile_y):
-        super().__init__(tile_x, tile_y, constants.INKY_ROW)
-        self.home_corner = (27, 33)
-        self.pellets_to_leave = 30
+    kind = "inky"
+    pellets_to_leave = 30
 
-    def get_chase_target(self, player, ghosts):
-        dx, dy = get_modified_position((0, 0), player.direction, 2)
-        blinky = ghosts["blinky"]
-        dx = 2 * (player.get_tile_x() + dx - blinky.get_tile_x())
-        dy = 2 * (player.get_tile_y() + dy - blinky.get_tile_y())
+    def __init__(self, tile_x, tile_y, level_map=None):
+        super().__init__(tile_x, tile_y, constants.INKY_ROW, level_map)
+        self.home_corner = (self.map.width - 1, self.map.height + 2)
 
-        return blinky.get_tile_x() + dx, blinky.get_tile_y() + dy
+    def get_chase_target(self, targets):
+        ahead_x, ahead_y = targets.two_ahead
+        blinky_x, blinky_y = targets.blinky_tile
+        return (blinky_x + 2 * (ahead_x - blinky_x),
+                blinky_y + 2 * (ahead_y - blinky_y))
 
 
 class Pinky(Ghost):
@@ -322,17 +345,16 @@ class Pinky(Ghost):
 
     Targeting: Pinky follows location 4 tiles ahead of the Pacman.
     """
-    def __init__(self, tile_x, tile_y):
-        super().__init__(tile_x, tile_y, constants.PINKY_ROW)
+    kind = "pinky"
+
+    def __init__(self, tile_x, tile_y, level_map=None):
+        super().__init__(tile_x, tile_y, constants.PINKY_ROW, level_map)
         self.direction = constants.UP
         self.freeze = False
         self.home_corner = (3, -3)
 
-    def get_chase_target(self, player, ghosts):
-        tile_x = player.get_tile_x()
-        tile_y = player.get_tile_y()
-
-        return get_modified_position((tile_x, tile_y), player.direction, 4)
+    def get_chase_target(self, targets):
+        return targets.four_ahead
 
 
 class Clyde(Ghost):
@@ -344,14 +366,16 @@ class Clyde(Ghost):
             if distance to Pacman is greater than 8 tiles.
             If else - he follows his home corner.
     """
-    def __init__(self, tile_x, tile_y):
-        super().__init__(tile_x, tile_y, constants.CLYDE_ROW)
+    kind = "clyde"
+    pellets_to_leave = 60
+
+    def __init__(self, tile_x, tile_y, level_map=None):
+        super().__init__(tile_x, tile_y, constants.CLYDE_ROW, level_map)
         self.direction = constants.LEFT
-        self.home_corner = (0, 33)
-        self.pellets_to_leave = 60
+        self.home_corner = (0, self.map.height + 2)
 
-    def get_chase_target(self, player, ghosts):
-        self.target = (player.get_tile_x(), player.get_tile_y())
+    def get_chase_target(self, targets):
+        self.target = targets.player_tile
         tile_x, tile_y = self.get_tile_x(), self.get_tile_y()
         if self.get_distance_to_target(tile_x, tile_y) < 8:
             return self.home_corner
@@ -360,9 +384,8 @@ class Clyde(Ghost):
 
 class Player(Character):
     """Player - the Pacman"""
-    def __init__(self, tile_x, tile_y):
-        super().__init__(tile_x, tile_y)
-        self.fright = 0
+    def __init__(self, tile_x, tile_y, level_map=None):
+        super().__init__(tile_x, tile_y, level_map)
         self.power_pellets = 0
         self.next_direction = constants.RIGHT
         self.speed = 0
@@ -372,50 +395,36 @@ class Player(Character):
         if points == 50:
             self.power_pellets += 1
             game_obj.combo = 1
-            fright_time_s = constants.get_level_based_constant(
-                game_obj.level, constants.FRIGHT_TIME)
-            self.fright = fright_time_s * constants.TICKRATE
-            for ghost in game_obj.ghosts.values():
-                ghost.change_state(constants.FRIGHTENED)
+            game_obj.frighten_ghosts()
         if points:
             game_obj.score += points
-            game_obj.update_caption()
+            game_obj.update_hud()
             pellets = len(game_obj.pellets)
-            pellets_to_elroy2 = constants.get_level_based_constant(
-                game_obj.level, constants.ELROY_SPEED_MULTIPLIER)[1][0]
-            pellets_to_elroy1 = constants.get_level_based_constant(
-                game_obj.level, constants.ELROY_SPEED_MULTIPLIER)[0][0]
-            if pellets <= pellets_to_elroy2:
-                game_obj.ghosts["blinky"].elroy = 2
-            elif pellets <= pellets_to_elroy1:
-                game_obj.ghosts["blinky"].elroy = 1
+            pellets_to_elroy1, pellets_to_elroy2 = \
+                game_obj.profile.elroy_pellets
+            for blinky in game_obj.blinkies:
+                if pellets <= pellets_to_elroy2:
+                    blinky.elroy = 2
+                elif pellets <= pellets_to_elroy1:
+                    blinky.elroy = 1
             return True
-        if game_obj.fruit > 0:
-            fruit_x, fruit_y = game.Game.MAP.get_coordinates('f')
+        if game_obj.has_fruit():
+            fruit_x, fruit_y = self.map.get_coordinates('f')
             if self.get_tile_x() in [fruit_x, fruit_x + 1]:
                 if self.get_tile_y() == fruit_y:
-                    game_obj.score += \
-                        constants.get_level_based_constant(
-                            game_obj.level, constants.FRUITS)[2]
-                    game_obj.fruit = 0
+                    game_obj.score += game_obj.profile.fruit[2]
+                    game_obj.timers.cancel("fruit")
                     game_obj.clear_fruit()
-                    game_obj.update_caption()
+                    game_obj.update_hud()
         return False
 
-    def move(self, level):
-        """Player movement mechanism"""
-        events = pygame.event.get()
-        keys = [pygame.K_RIGHT, pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN]
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key in keys:
-                    self.next_direction = keys.index(event.key)
-
-        self.update_speed(level)
+    def move(self, profile, fright):
+        """Player movement mechanism - fright is number of ticks left"""
+        self.update_speed(profile, fright)
         distance_to_center = self.get_distance_to_tile_center()
         distance_to_next_tile = self.get_distance_to_tile_center(next_tile=True)
 
-        if 0 < self.x < constants.GAMEMAP_WIDTH_PX:
+        if 0 < self.x < self.map.width_px:
             if distance_to_center <= self.speed and \
                distance_to_next_tile >= constants.TILE_SIZE:
                 self.x, self.y = get_modified_position((self.x, self.y),
@@ -423,19 +432,16 @@ class Player(Character):
                                                        distance_to_center)
                 self.speed -= distance_to_center
                 if self.direction != self.next_direction:
-                    tile_x, tile_y = get_modified_position((self.get_tile_x(),
-                                                            self.get_tile_y()),
-                                                           self.next_direction,
-                                                           1)
-                    if game.Game.MAP.get_tile(tile_x, tile_y) not in\
-                            [constants.WALL, constants.BARRIER]:
+                    if self.map.is_passable(self.get_tile_x(),
+                                            self.get_tile_y(),
+                                            self.next_direction):
                         self.direction = self.next_direction
 
                 tile_x, tile_y = get_modified_position((self.get_tile_x(),
                                                         self.get_tile_y()),
                                                        self.direction,
                                                        1)
-                if game.Game.MAP.get_tile(tile_x, tile_y) == constants.WALL:
+                if self.map.get_tile(tile_x, tile_y) == constants.WALL:
                     self.speed = 0
 
         self.x, self.y = get_modified_position((self.x, self.y),
@@ -443,8 +449,8 @@ class Player(Character):
                                                self.speed)
 
         if self.x <= -constants.TILE_SIZE / 2:
-            self.x = constants.GAMEMAP_WIDTH_PX + constants.TILE_SIZE / 2
-        elif self.x >= constants.GAMEMAP_WIDTH_PX + constants.TILE_SIZE / 2:
+            self.x = self.map.width_px + constants.TILE_SIZE / 2
+        elif self.x >= self.map.width_px + constants.TILE_SIZE / 2:
             self.x = -constants.TILE_SIZE / 2
 
     def draw(self, tick):
@@ -452,16 +458,13 @@ class Player(Character):
         frame = int(tick * constants.ANIMATION_SPEED) % 4
         if frame == 3:
             frame = 2
-        game.Game.WINDOW.blit(
-            pygame.transform.rotate(
-                drawhelper.get_image_at(frame, constants.PLAYER_ROW),
-                90 * self.direction),
-            (self.x - constants.SPRITE_SIZE / 2,
-             self.y - constants.SPRITE_SIZE / 2))
-
-    def update_speed(self, level):
+        return resources.RESOURCES.window.blit(
+            drawhelper.get_image_at(frame, constants.PLAYER_ROW,
+                                    90 * self.direction),
+            drawhelper.to_screen(self.x - constants.SPRITE_SIZE / 2,
+                                 self.y - constants.SPRITE_SIZE / 2))
+
+    def update_speed(self, profile, fright):
         """Updates player speed"""
-        index = 1 if self.fright == 0 else 0
-        multiplier = constants.get_level_based_constant(
-            level, constants.PACMAN_SPEED_MULTIPLIER)[index]
-        self.speed = constants.BASE_SPEED * multiplier
+        index = 1 if fright == 0 else 0
+        self.speed = profile.pacman_speed[index]
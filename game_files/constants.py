@@ -3,6 +3,11 @@ import bisect
 
 TICKRATE = 60
 DELAY = 1000 / TICKRATE
+MAX_CATCH_UP_TICKS = 5
+FRAME_HISTOGRAM_MAX_MS = 100
+PROFILER_SAMPLES = 60 * TICKRATE
+PROFILER_OVERLAY_FRAMES = 2 * TICKRATE
+PROFILER_OVERLAY_REFRESH = TICKRATE // 2
 TILE_SIZE = 32
 BASE_SPEED = TILE_SIZE / 8
 
@@ -12,6 +17,16 @@ GAMEMAP_WIDTH_PX = GAMEMAP_WIDTH * TILE_SIZE
 GAMEMAP_HEIGHT = 31
 GAMEMAP_HEIGHT_PX = GAMEMAP_HEIGHT * TILE_SIZE
 
+# Largest part of the map shown at once - bigger maps are scrolled
+VIEWPORT_WIDTH_PX = GAMEMAP_WIDTH_PX
+VIEWPORT_HEIGHT_PX = GAMEMAP_HEIGHT_PX
+WALL_CHUNK_TILES = 8
+WALL_CHUNK_CACHE = 64
+
+HUD_HEIGHT = TILE_SIZE
+HUD_FONT_SIZE = TILE_SIZE
+PROFILER_FONT_SIZE = TILE_SIZE * 5 // 8
+
 WALL    = ' '
 PELLET  = '.'
 POWER_PELLET = 'o'
@@ -38,6 +53,14 @@ PELLET_COLOR  = (222, 161, 133)
 BARRIER_COLOR = (250, 142, 225)
 TEXT_COLOR    = (250, 242, 0)
 
+# Number of ghosts - classic four are repeated for bigger hordes, every
+# next group of four leaves the base HORDE_RELEASE_STEP pellets later
+GHOST_COUNT = 4
+HORDE_RELEASE_STEP = 1
+
+# Dead ghosts return to base along shortest path instead of straight line
+PATH_ACCURATE_GHOSTS = False
+
 FRUIT_SPAWN = [70, 170]
 FRUIT_IMAGE_ROW = 6
 
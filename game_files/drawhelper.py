@@ -1,32 +1,60 @@
 """Module providing reusable functions helpful with drawing"""
+import functools
 import math
 import pygame
 
-import constants, game
+import constants, resources
 
 LINE_WIDTH = constants.TILE_SIZE // 8
 
+SPRITE_CACHE = {}
+CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def to_screen(x, y):
+    """Converts map pixel coordinates to game window coordinates"""
+    return resources.RESOURCES.viewport.to_screen(x, y)
+
+
+def get_target(surface):
+    """Returns surface to draw on and pixel offset of map coordinates
+
+    Map drawn on game window is shifted by the viewport position"""
+    if surface is not None:
+        return surface, 0, 0
+    view = resources.RESOURCES.viewport
+    return resources.RESOURCES.window, -view.x, -view.y
+
 
 def draw_arc(x0, y0, start_angle, stop_angle,
-             color=constants.WALL_COLOR):
-    """Draws arc at given coordinates with given angles in pi rad"""
+             color=constants.WALL_COLOR, surface=None):
+    """Draws arc at given coordinates with given angles in pi rad
+
+    When surface is not passed - the arc is drawn on game window
+    """
+    surface, offset_x, offset_y = get_target(surface)
     x_compensation = LINE_WIDTH / 2 if start_angle in [0, 3/2] else 0
     y_compensation = LINE_WIDTH / 2 if stop_angle  in [0, 3/2] else 0
-    pygame.draw.arc(game.Game.WINDOW, color,
-                    (x0 * constants.TILE_SIZE + x_compensation,
-                     y0 * constants.TILE_SIZE + y_compensation,
-                     constants.TILE_SIZE, constants.TILE_SIZE),
-                    start_angle * math.pi, stop_angle * math.pi, LINE_WIDTH)
+    return pygame.draw.arc(
+        surface, color,
+        (x0 * constants.TILE_SIZE + x_compensation + offset_x,
+         y0 * constants.TILE_SIZE + y_compensation + offset_y,
+         constants.TILE_SIZE, constants.TILE_SIZE),
+        start_angle * math.pi, stop_angle * math.pi, LINE_WIDTH)
+
 
+def draw_line(x0, y0, x1, y1, color=constants.WALL_COLOR, surface=None):
+    """Draws line from given start coordinates to end coordinates
 
-def draw_line(x0, y0, x1, y1, color=constants.WALL_COLOR):
-    """Draws line from given start coordinates to end coordinates"""
-    pygame.draw.line(game.Game.WINDOW, color,
-                     (x0 * constants.TILE_SIZE,
-                      y0 * constants.TILE_SIZE),
-                     (x1 * constants.TILE_SIZE,
-                      y1 * constants.TILE_SIZE),
-                     LINE_WIDTH)
+    When surface is not passed - the line is drawn on game window
+    """
+    surface, offset_x, offset_y = get_target(surface)
+    return pygame.draw.line(surface, color,
+                            (x0 * constants.TILE_SIZE + offset_x,
+                             y0 * constants.TILE_SIZE + offset_y),
+                            (x1 * constants.TILE_SIZE + offset_x,
+                             y1 * constants.TILE_SIZE + offset_y),
+                            LINE_WIDTH)
 
 
 def draw_rect(x0, y0, width, height=0, offset=0,
@@ -38,14 +66,14 @@ def draw_rect(x0, y0, width, height=0, offset=0,
 
     if height == 0:
         height = width
-    pygame.draw.rect(game.Game.WINDOW, color,
-                     (x0 * constants.TILE_SIZE + offset,
-                      y0 * constants.TILE_SIZE + offset,
-                      width, height))
+    return pygame.draw.rect(resources.RESOURCES.window, color,
+                            (*to_screen(x0 * constants.TILE_SIZE + offset,
+                                        y0 * constants.TILE_SIZE + offset),
+                             width, height))
 
 
-def get_image_at(x, y):
-    """Returns image found in sprite sheet at given coordinates"""
+def load_image_at(x, y, angle=0):
+    """Cuts image out of sprite sheet at given coordinates and rotates it"""
     rectangle = pygame.Rect((
         x * (constants.SPRITE_SIZE + constants.SPRITE_SPACING * 2)
         + constants.SPRITE_SPACING,
@@ -56,26 +84,75 @@ def get_image_at(x, y):
     ))
     image = pygame.Surface(rectangle.size).convert()
     image.set_colorkey(constants.BACKGROUND_COLOR)
-    image.blit(game.Game.SPRITE_SHEET, (0, 0), rectangle)
+    image.blit(resources.RESOURCES.sprite_sheet, (0, 0), rectangle)
+    if angle:
+        image = pygame.transform.rotate(image, angle)
     return image
 
 
+def get_image_at(x, y, angle=0):
+    """Returns image found in sprite sheet at given coordinates
+
+    Images are cut out only once and kept in the sprite cache"""
+    key = (x, y, angle)
+    image = SPRITE_CACHE.get(key)
+    if image is None:
+        CACHE_STATS["misses"] += 1
+        image = SPRITE_CACHE[key] = load_image_at(x, y, angle)
+    else:
+        CACHE_STATS["hits"] += 1
+    return image
+
+
+def preload_sprites():
+    """Fills sprite cache with every frame of the sprite sheet
+
+    Player frames are stored in all four rotations"""
+    SPRITE_CACHE.clear()
+    cell_size = constants.SPRITE_SIZE + constants.SPRITE_SPACING * 2
+    columns = resources.RESOURCES.sprite_sheet.get_width() // cell_size
+    rows = resources.RESOURCES.sprite_sheet.get_height() // cell_size
+    for y in range(rows):
+        for x in range(columns):
+            SPRITE_CACHE[(x, y, 0)] = load_image_at(x, y)
+    for x in range(columns):
+        for direction in range(1, 4):
+            SPRITE_CACHE[(x, constants.PLAYER_ROW, 90 * direction)] = \
+                load_image_at(x, constants.PLAYER_ROW, 90 * direction)
+
+
+def get_cache_stats():
+    """Returns sprite cache statistics"""
+    return dict(CACHE_STATS, size=len(SPRITE_CACHE))
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    """Returns default font of given size - loaded only once"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.SysFont(pygame.font.get_default_font(), size)
+
+
+@functools.lru_cache(maxsize=64)
+def render_text(string, size=constants.SPRITE_SIZE):
+    """Returns surface with rendered text - rendered once for every string"""
+    return get_font(size).render(string, True, constants.TEXT_COLOR,
+                                 constants.BACKGROUND_COLOR)
+
+
 def draw_text(string):
     """Draw given text on screen in place suitable for text drawing"""
-    font = pygame.font.SysFont(pygame.font.get_default_font(),
-                               constants.SPRITE_SIZE)
-    text = font.render(string, True, constants.TEXT_COLOR,
-                       constants.BACKGROUND_COLOR)
+    text = render_text(string)
     text_rect = text.get_rect()
-    text_rect.center = (constants.GAMEMAP_WIDTH_PX // 2,
-                        constants.GAMEMAP_HEIGHT_PX // 2 +
-                        2 * constants.TILE_SIZE)
-    game.Game.WINDOW.blit(text, text_rect)
-
-
-def clear_text():
-    """Clears drawn text"""
-    draw_rect(constants.GAMEMAP_WIDTH // 2 - 5,
-              constants.GAMEMAP_HEIGHT // 2 + 2,
-              width=10 * constants.TILE_SIZE,
-              height=constants.TILE_SIZE)
+    view = resources.RESOURCES.viewport
+    text_rect.center = (view.width // 2,
+                        view.height // 2 + 2 * constants.TILE_SIZE)
+    return resources.RESOURCES.window.blit(text, text_rect)
+
+
+def clear_text(text_rect):
+    """Clears text drawn in given rectangle - walls under it are redrawn"""
+    return resources.RESOURCES.walls.draw(resources.RESOURCES.window,
+                                          text_rect,
+                                          resources.RESOURCES.viewport)
@@ -0,0 +1,178 @@
+"""Gym-style environment - headless games with NumPy observations
+
+Observation is a dictionary of arrays allocated once and updated in
+place every step, so agents have to copy arrays they want to keep.
+Positions are in tiles, ghost rows follow horde order."""
+import numpy as np
+
+import constants, game, horde, resources
+
+NO_ACTION = 4
+DEATH_PENALTY = 500
+
+# Tile grid values
+PATH, WALL, BARRIER, TUNNEL = range(4)
+# Pellet mask values
+NO_PELLET, PELLET, POWER_PELLET = range(3)
+# Ghost state values - living ghosts use constants.SCATTER, CHASE, FRIGHTENED
+DEAD, IN_BASE = 3, 4
+
+
+def build_lookup(values):
+    """Returns 256 byte table mapping map cells to given values"""
+    table = np.zeros(256, dtype=np.uint8)
+    for cell, value in values.items():
+        table[ord(cell)] = value
+    return table
+
+
+TILE_LOOKUP = build_lookup({constants.WALL: WALL,
+                            constants.BARRIER: BARRIER,
+                            constants.TUNNEL: TUNNEL})
+PELLET_LOOKUP = build_lookup({constants.PELLET: PELLET,
+                              constants.PELLET2: PELLET,
+                              constants.POWER_PELLET: POWER_PELLET})
+
+
+def allocate_observation(level_map, ghost_count, shape=()):
+    """Returns zeroed observation arrays with given leading shape
+
+    tiles and pellets are (height, width) grids, player is (x, y,
+    direction), ghosts are (x, y, direction) rows with matching
+    ghost_states and status is (lives, level, fright ticks)."""
+    grid = shape + (level_map.height, level_map.width)
+    return {
+        "tiles": np.zeros(grid, dtype=np.uint8),
+        "pellets": np.zeros(grid, dtype=np.uint8),
+        "player": np.zeros(shape + (3,), dtype=np.float32),
+        "ghosts": np.zeros(shape + (ghost_count, 3), dtype=np.float32),
+        "ghost_states": np.zeros(shape + (ghost_count,), dtype=np.uint8),
+        "status": np.zeros(shape + (3,), dtype=np.int32),
+    }
+
+
+class Env:
+    """Headless game with reset and step methods
+
+    Action is a direction or NO_ACTION. Reward is score gained in the
+    step minus DEATH_PENALTY for every life lost. Episode ends at game
+    over or after max ticks. Info dictionary is reused as well.
+    Observation arrays may be passed in, e.g. rows of a vector env."""
+    def __init__(self, ghost_count=constants.GHOST_COUNT, max_ticks=None,
+                 observation=None):
+        self.map = resources.RESOURCES.map
+        self.horde = horde.get_horde(ghost_count)
+        self.max_ticks = max_ticks
+        self.observation = observation or \
+            allocate_observation(self.map, ghost_count)
+        cells = np.frombuffer(bytes(self.map.cells), dtype=np.uint8)
+        cells = cells.reshape(self.map.height, self.map.width)
+        self.observation["tiles"][...] = TILE_LOOKUP[cells]
+        self.start_pellets = PELLET_LOOKUP[cells] * np.unpackbits(
+            np.frombuffer(self.map.pellets, dtype=np.uint8),
+            count=cells.size, bitorder="little").reshape(cells.shape)
+        self.info = {"score": 0, "level": 0, "lives": 0, "ticks": 0}
+        self.game = None
+        self.ticks = 0
+
+    def reset(self, seed=None):
+        """Starts new game and returns the first observation"""
+        self.game = game.HeadlessGame(seed)
+        self.game.horde = self.horde
+        self.game.initialize_level(True)
+        self.ticks = 0
+        self.observation["pellets"][...] = self.start_pellets
+        self.observe()
+        return self.observation
+
+    def step(self, action):
+        """Plays one tick, returns (observation, reward, done, info)"""
+        game_obj = self.game
+        if action != NO_ACTION:
+            game_obj.press(action)
+        score, lives, level = game_obj.score, game_obj.lives, game_obj.level
+        pellet_count = len(game_obj.pellets)
+        tile_x = int(game_obj.player.get_tile_x())
+        tile_y = int(game_obj.player.get_tile_y())
+        game_obj.update()
+        self.ticks += 1
+
+        if game_obj.level != level:
+            self.observation["pellets"][...] = self.start_pellets
+        elif len(game_obj.pellets) != pellet_count:
+            self.observation["pellets"][tile_y, tile_x] = NO_PELLET
+        self.observe()
+        reward = game_obj.score - score - \
+            DEATH_PENALTY * (lives - game_obj.lives)
+        done = game_obj.finished() or \
+            self.max_ticks is not None and self.ticks >= self.max_ticks
+        return self.observation, reward, done, self.info
+
+    def observe(self):
+        """Writes positions, ghost states and status to observation"""
+        game_obj = self.game
+        tile_size = constants.TILE_SIZE
+        player = game_obj.player
+        self.observation["player"][:] = (player.x / tile_size,
+                                         player.y / tile_size,
+                                         player.direction)
+        positions = self.observation["ghosts"]
+        states = self.observation["ghost_states"]
+        for index, ghost in enumerate(game_obj.ghosts.values()):
+            positions[index] = (ghost.x / tile_size, ghost.y / tile_size,
+                                ghost.direction)
+            if ghost.dead:
+                states[index] = DEAD
+            elif ghost.in_base or ghost.freeze:
+                states[index] = IN_BASE
+            else:
+                states[index] = ghost.state
+        self.observation["status"][:] = (game_obj.lives, game_obj.level,
+                                         game_obj.get_fright())
+        info = self.info
+        info["score"] = game_obj.score
+        info["level"] = game_obj.level
+        info["lives"] = game_obj.lives
+        info["ticks"] = self.ticks
+
+
+class VectorEnv:
+    """Many environments stepped together with stacked observations
+
+    Observation arrays have leading dimension of env count, every env
+    writes to its own row. Finished envs are reset right away with next
+    seed, so returned observation is the first one of the new game."""
+    def __init__(self, count, ghost_count=constants.GHOST_COUNT,
+                 max_ticks=None):
+        level_map = resources.RESOURCES.map
+        self.observation = allocate_observation(level_map, ghost_count,
+                                                (count,))
+        self.envs = [Env(ghost_count, max_ticks,
+                         {key: array[index] for key, array
+                          in self.observation.items()})
+                     for index in range(count)]
+        self.rewards = np.zeros(count, dtype=np.float64)
+        self.dones = np.zeros(count, dtype=bool)
+        self.infos = [env.info for env in self.envs]
+        self.seed = None
+
+    def reset(self, seed=None):
+        """Starts new games (with consecutive seeds if seed is given)"""
+        self.seed = seed
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index)
+        if seed is not None:
+            self.seed = seed + len(self.envs)
+        return self.observation
+
+    def step(self, actions):
+        """Plays one tick of every env, returns stacked results"""
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, done, _ = env.step(action)
+            self.rewards[index] = reward
+            self.dones[index] = done
+            if done:
+                env.reset(self.seed)
+                if self.seed is not None:
+                    self.seed += 1
+        return self.observation, self.rewards, self.dones, self.infos
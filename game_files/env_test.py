@@ -0,0 +1,88 @@
+"""Env module tests - observations compared against headless game"""
+import random
+import unittest
+
+import numpy as np
+
+import constants, env, farm
+
+
+class EnvTest(unittest.TestCase):
+    def setUp(self):
+        self.env = env.Env()
+        self.observation = self.env.reset(0)
+
+    def get_pellet_mask(self):
+        mask = np.zeros_like(self.observation["pellets"])
+        for tile_x, tile_y, cell in self.env.game.pellets:
+            mask[tile_y, tile_x] = env.POWER_PELLET \
+                if cell == constants.POWER_PELLET else env.PELLET
+        return mask
+
+    def test_reset(self):
+        tiles = self.observation["tiles"]
+        self.assertEqual(tiles.shape, (31, 28))
+        self.assertEqual(tiles[0, 0], env.WALL)
+        self.assertEqual(tiles[14, 0], env.TUNNEL)
+        self.assertEqual((tiles == env.BARRIER).sum(), 2)
+        np.testing.assert_array_equal(self.observation["pellets"],
+                                      self.get_pellet_mask())
+        self.assertEqual((self.observation["pellets"] == env.POWER_PELLET)
+                         .sum(), 4)
+        np.testing.assert_array_equal(self.observation["ghost_states"],
+                                      [constants.SCATTER, env.IN_BASE,
+                                       env.IN_BASE, env.IN_BASE])
+        np.testing.assert_array_equal(self.observation["status"], [4, 1, 0])
+
+    def test_observation_follows_game(self):
+        policy = farm.GreedyPolicy(random.Random(0))
+        arrays = {key: id(array) for key, array in self.observation.items()}
+        total_reward = 0
+        done = False
+        while not done:
+            direction = policy.choose(self.env.game)
+            observation, reward, done, info = self.env.step(
+                env.NO_ACTION if direction is None else direction)
+            total_reward += reward
+            self.assertEqual({key: id(array) for key, array
+                              in observation.items()}, arrays)
+            np.testing.assert_array_equal(observation["pellets"],
+                                          self.get_pellet_mask())
+            ghost = self.env.game.ghosts["blinky"]
+            self.assertAlmostEqual(observation["ghosts"][0, 0],
+                                   ghost.x / constants.TILE_SIZE, places=4)
+        self.assertEqual(info["lives"], 0)
+        self.assertEqual(total_reward, info["score"] - 4 * env.DEATH_PENALTY)
+
+    def test_max_ticks(self):
+        limited = env.Env(max_ticks=10)
+        limited.reset(0)
+        dones = [limited.step(env.NO_ACTION)[2] for _ in range(10)]
+        self.assertEqual(dones, [False] * 9 + [True])
+
+
+class VectorEnvTest(unittest.TestCase):
+    def test_matches_single_envs(self):
+        vector = env.VectorEnv(3, max_ticks=300)
+        observation = vector.reset(5)
+        singles = [env.Env(max_ticks=300) for _ in range(3)]
+        for index, single in enumerate(singles):
+            single.reset(5 + index)
+        actions = [constants.LEFT, constants.RIGHT, env.NO_ACTION]
+        for _ in range(299):
+            _, rewards, dones, _ = vector.step(actions)
+            for index, single in enumerate(singles):
+                single_observation, reward, _, _ = single.step(actions[index])
+                self.assertEqual(rewards[index], reward)
+                for key, array in single_observation.items():
+                    np.testing.assert_array_equal(observation[key][index],
+                                                  array)
+        self.assertFalse(dones.any())
+        _, _, dones, infos = vector.step(actions)
+        self.assertTrue(dones.all())
+        self.assertEqual([info["ticks"] for info in infos], [0, 0, 0])
+        self.assertEqual(vector.seed, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
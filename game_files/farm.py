@@ -0,0 +1,228 @@
+"""Simulation farm - runs many seeded headless games in a process pool"""
+import argparse
+import collections
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+import constants, game, map as gamemap
+
+
+class IdlePolicy:
+    """Policy never pressing any key"""
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, _game_obj):
+        """Returns direction to press or None"""
+        return None
+
+
+class RandomPolicy(IdlePolicy):
+    """Policy pressing random direction from time to time"""
+    def choose(self, _game_obj):
+        if self.rng.random() < 1 / constants.TICKRATE:
+            return self.rng.randrange(4)
+        return None
+
+
+class GreedyPolicy(IdlePolicy):
+    """Policy heading towards the closest pellet (breadth first search)"""
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.tile = None
+
+    def choose(self, game_obj):
+        tile = (game_obj.player.get_tile_x(), game_obj.player.get_tile_y())
+        if tile == self.tile:
+            return None
+        self.tile = tile
+        return self.find_pellet(game_obj, *tile)
+
+    def find_pellet(self, game_obj, tile_x, tile_y):
+        """Returns first direction of shortest path to any pellet"""
+        level_map = game_obj.map
+        if not level_map.in_bounds(tile_x, tile_y):
+            return None
+        first_directions = {(tile_x, tile_y): None}
+        queue = collections.deque([(tile_x, tile_y)])
+        while queue:
+            current_x, current_y = queue.popleft()
+            first_direction = first_directions[(current_x, current_y)]
+            if first_direction is not None and \
+                    game_obj.pellets.get(current_x, current_y):
+                return first_direction
+            exits = level_map.get_exits(current_x, current_y)
+            for direction, (dx, dy) in enumerate(gamemap.DIRECTION_OFFSETS):
+                neighbour = ((current_x + dx) % level_map.width,
+                             current_y + dy)
+                if exits >> direction & 1 and \
+                        neighbour not in first_directions:
+                    first_directions[neighbour] = \
+                        direction if first_direction is None \
+                        else first_direction
+                    queue.append(neighbour)
+        return None
+
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+}
+
+
+def get_policy(name):
+    """Returns policy class by name or "module:Class" import path"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_game(task):
+    """Plays one seeded headless game and returns its statistics
+
+    Task is a (seed, policy name, max level, max ticks) tuple. The game
+    ends on game over, after finishing max level or after max ticks."""
+    seed, policy_name, max_level, max_ticks = task
+    policy = get_policy(policy_name)(random.Random(seed))
+    game_obj = game.HeadlessGame(seed)
+    game_obj.initialize_level(True)
+
+    deaths = collections.Counter()
+    level_ticks = []
+    ghosts_per_energizer = []
+    level_start = 0
+    ticks = 0
+    while game_obj.lives > 0 and game_obj.level <= max_level and \
+            ticks < max_ticks:
+        direction = policy.choose(game_obj)
+        if direction is not None:
+            game_obj.press(direction)
+        level, lives = game_obj.level, game_obj.lives
+        power_pellets = game_obj.player.power_pellets
+        dead = [ghost.dead for ghost in game_obj.ghosts.values()]
+        game_obj.update()
+        ticks += 1
+
+        if game_obj.level != level:
+            level_ticks.append(ticks - level_start)
+            level_start = ticks
+            continue
+        if game_obj.lives != lives:
+            deaths[level] += 1
+            continue
+        if game_obj.player.power_pellets != power_pellets:
+            ghosts_per_energizer.append(0)
+        if ghosts_per_energizer:
+            ghosts_per_energizer[-1] += sum(
+                ghost.dead and not was_dead for ghost, was_dead
+                in zip(game_obj.ghosts.values(), dead))
+
+    return {
+        "seed": seed,
+        "score": game_obj.score,
+        "level": game_obj.level,
+        "ticks": ticks,
+        "deaths": dict(deaths),
+        "level_ticks": level_ticks,
+        "ghosts_per_energizer": ghosts_per_energizer,
+    }
+
+
+def summarize(results):
+    """Merges statistics of many games into one summary dictionary
+
+    Score statistics are empty when there are no games."""
+    scores = sorted(result["score"] for result in results)
+    deaths = collections.Counter()
+    level_ticks = collections.defaultdict(list)
+    ghosts_eaten = collections.Counter()
+    for result in results:
+        deaths.update(result["deaths"])
+        for level, ticks in enumerate(result["level_ticks"], 1):
+            level_ticks[level].append(ticks)
+        ghosts_eaten.update(result["ghosts_per_energizer"])
+    energizers = sum(ghosts_eaten.values())
+
+    return {
+        "games": len(results),
+        "score": {
+            "min": scores[0],
+            "median": statistics.median(scores),
+            "mean": statistics.mean(scores),
+            "p90": scores[int(0.9 * (len(scores) - 1))],
+            "max": scores[-1],
+        } if scores else {},
+        "level_reached": dict(sorted(collections.Counter(
+            result["level"] for result in results).items())),
+        "deaths_per_level": dict(sorted(deaths.items())),
+        "ghosts_per_energizer": {
+            "histogram": dict(sorted(ghosts_eaten.items())),
+            "mean": sum(count * eaten for eaten, count
+                        in ghosts_eaten.items()) / energizers
+                    if energizers else 0,
+        },
+        "ticks_per_level": {level: statistics.mean(ticks)
+                            for level, ticks in sorted(level_ticks.items())},
+    }
+
+
+def run_farm(games, seed=0, policy="greedy", max_level=256,
+             max_ticks=100000, processes=None):
+    """Runs games with consecutive seeds in a process pool
+
+    Returns list of per game results sorted by seed."""
+    tasks = [(seed + index, policy, max_level, max_ticks)
+             for index in range(games)]
+    if processes == 1:
+        results = list(map(run_game, tasks))
+    else:
+        processes = processes or os.cpu_count()
+        chunksize = max(1, games // (4 * processes))
+        with multiprocessing.Pool(processes) as pool:
+            results = list(pool.imap_unordered(run_game, tasks, chunksize))
+    return sorted(results, key=lambda result: result["seed"])
+
+
+def main():
+    """Runs the farm from command line and prints summary as JSON"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100,
+                        help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game")
+    parser.add_argument("--policy", default="greedy",
+                        help=f"one of {', '.join(POLICIES)} "
+                             "or module:Class import path")
+    parser.add_argument("--max-level", type=int, default=256,
+                        help="stop games after finishing this level")
+    parser.add_argument("--max-ticks", type=int, default=100000,
+                        help="stop games after this many ticks")
+    parser.add_argument("--processes", type=int,
+                        help="number of worker processes (default: cpu count)")
+    parser.add_argument("--output", metavar="PATH",
+                        help="also save per game results as JSON")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    results = run_farm(args.games, args.seed, args.policy, args.max_level,
+                       args.max_ticks, args.processes)
+    elapsed = time.perf_counter() - start_time
+
+    summary = summarize(results)
+    summary["ticks_per_second"] = \
+        sum(result["ticks"] for result in results) / elapsed
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"summary": summary, "games": results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
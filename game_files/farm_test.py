@@ -0,0 +1,53 @@
+"""Farm module tests - short games run in this process"""
+import unittest
+
+import farm
+
+
+class FarmTest(unittest.TestCase):
+    def test_game_is_deterministic(self):
+        task = (7, "random", 1, 3000)
+        self.assertEqual(farm.run_game(task), farm.run_game(task))
+
+    def test_tick_cap(self):
+        result = farm.run_game((0, "idle", 256, 500))
+        self.assertEqual(result["ticks"], 500)
+        self.assertEqual(result["level"], 1)
+
+    def test_level_cap(self):
+        result = farm.run_game((0, "greedy", 1, 100000))
+        self.assertTrue(result["level"] == 2 or result["deaths"])
+        self.assertLessEqual(len(result["level_ticks"]), 1)
+
+    def test_policy_import_path(self):
+        self.assertIs(farm.get_policy("farm:GreedyPolicy"), farm.GreedyPolicy)
+
+    def test_summarize(self):
+        summary = farm.summarize([
+            {"seed": 0, "score": 100, "level": 1, "ticks": 10,
+             "deaths": {1: 4}, "level_ticks": [],
+             "ghosts_per_energizer": [0, 2]},
+            {"seed": 1, "score": 300, "level": 2, "ticks": 20,
+             "deaths": {1: 1, 2: 3}, "level_ticks": [15],
+             "ghosts_per_energizer": [4]},
+        ])
+        self.assertEqual(summary["games"], 2)
+        self.assertEqual(summary["score"]["mean"], 200)
+        self.assertEqual(summary["level_reached"], {1: 1, 2: 1})
+        self.assertEqual(summary["deaths_per_level"], {1: 5, 2: 3})
+        self.assertEqual(summary["ghosts_per_energizer"]["mean"], 2)
+        self.assertEqual(summary["ticks_per_level"], {1: 15})
+
+    def test_summarize_no_games(self):
+        self.assertEqual(farm.summarize([]), {
+            "games": 0,
+            "score": {},
+            "level_reached": {},
+            "deaths_per_level": {},
+            "ghosts_per_energizer": {"histogram": {}, "mean": 0},
+            "ticks_per_level": {},
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,158 +1,283 @@
 """Main module - controlling application and other objects"""
-import dataclasses
-
+import functools
 import time
 import random
 import os
 import pygame
 
-import constants, map as gamemap, barrier, drawhelper, characters
+import constants, barrier, drawhelper, characters, pellets, levels, hud, \
+    horde, inputs, profiler, recorder, resources, timers, walls
 
 os.environ['SDL_VIDEO_WINDOW_POS'] = "512, 32"
 
 
 class Game:
-    """Main class controlling the game"""
-    WINDOW = pygame.display.set_mode((
-        constants.GAMEMAP_WIDTH_PX, constants.GAMEMAP_HEIGHT_PX))
-    SPRITE_SHEET = pygame.image.load(constants.SPRITE_SHEET).convert()
-    MAP = gamemap.Map(constants.GAMEMAP_FILE)
-    barrier = barrier.Barrier(list(MAP.get_barriers()))
-
-    def __init__(self):
+    """Main class controlling the game
+
+    Map, window and other shared resources come from resources context
+    and are created on first use. Keys are pressed by input source,
+    keyboard one by default. Timed mechanics (fright, fruit, ghost mode
+    changes) are events of timers keyed by tick, ghost releases are
+    keyed by number of eaten pellets."""
+    offscreen = False
+
+    def __init__(self, seed=None, input_source=None):
+        self.resources = resources.RESOURCES
+        self.map = self.resources.map
+        self.barrier = barrier.Barrier(list(self.map.get_barriers()))
+        self.path_accurate = constants.PATH_ACCURATE_GHOSTS
+        self.horde = horde.get_horde(constants.GHOST_COUNT)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.random = random.Random(self.seed)
+        self.frame = 0
+        self.updating = False
+        self.inputs = []
+        self.input_source = input_source or self.create_input_source()
+        self.quit = False
         self.tick = 0
         self.level = 0
+        self.profile = None
         self.score = 0
         self.player = None
-        self.pellets = list(self.MAP.get_pellets())
-        self.fruit = 0
+        self.start_pellets = pellets.Pellets(self.map.get_pellets())
+        self.pellets = self.start_pellets.copy()
+        self.timers = timers.Timers()
+        self.releases = timers.Timers()
         self.lives = 4
         self.combo = 1
         self.wait = 0
         self.ghosts = {}
+        self.blinkies = []
+        self.ghost_hash = None
+        self.drawn_ghosts = []
+        self.targets = characters.Targets()
         self.previous_ghosts_state = constants.SCATTER
+        self.text_rect = None
+        self.dirty_rects = []
+        self.cleared_rects = []
+        self.profiler = profiler.Profiler()
+        self.overlay = None
+        self.recorder = None
+        self.open_window()
+
+    def open_window(self):
+        """Creates game window, sprites and HUD if not done yet
+
+        HUD labels are shown with the first frame - view redraws do not
+        cover the bar below the map."""
+        if self.resources.open_window(self.offscreen):
+            drawhelper.preload_sprites()
+            self.resources.hud = hud.Hud()
+            self.dirty_rects.extend(self.resources.hud.draw_labels())
+
+    def create_input_source(self):
+        """Returns default input source of the game"""
+        return inputs.KeyboardInput()
 
     def initialize_level(self, next_level):
-        """Initializing level after player death or to advance to new level"""
-        player_x, player_y = self.MAP.get_coordinates('s')
-        blinky_x, blinky_y = self.MAP.get_coordinates('b')
-        pinky_x,  pinky_y  = self.MAP.get_coordinates('p')
-        inky_x,   inky_y   = self.MAP.get_coordinates('i')
-        clyde_x,  clyde_y  = self.MAP.get_coordinates('c')
-        self.player = characters.Player(player_x, player_y)
-        self.ghosts = {
-            "blinky": characters.Blinky(blinky_x, blinky_y),
-            "pinky":  characters.Pinky(pinky_x, pinky_y),
-            "inky":   characters.Inky(inky_x, inky_y),
-            "clyde":  characters.Clyde(clyde_x, clyde_y),
-        }
+        """Initializing level after player death or to advance to new level
+
+        Ghosts are spawned from the horde specs. Pending events are
+        dropped and the mode clock starts again from current tick."""
+        player_x, player_y = self.map.get_coordinates('s')
+        self.player = characters.Player(player_x, player_y, self.map)
+        self.ghosts = horde.spawn(self.horde, self.map)
+        for ghost in self.ghosts.values():
+            ghost.random = self.random
+            ghost.barrier = self.barrier
+            ghost.path_accurate = self.path_accurate
+        self.blinkies = [ghost for ghost in self.ghosts.values()
+                         if isinstance(ghost, characters.Blinky)]
+        self.ghost_hash = horde.SpatialHash(list(self.ghosts.values()))
+        self.drawn_ghosts = []
         self.combo = 1
-        self.fruit = 0
-        self.update_caption()
         self.wait = 1
         if next_level:
-            self.pellets = list(self.MAP.get_pellets())
+            self.pellets = self.start_pellets.copy()
             self.draw_walls()
             self.draw_pellets()
             self.level += 1
+            self.profile = levels.get_level_profile(self.level)
             self.tick = 0
+            self.update_hud()
         else:
             for ghost in self.ghosts.values():
                 ghost.state = self.previous_ghosts_state
             self.lives -= 1
-            if self.lives == 0:
-                drawhelper.draw_text("GAME OVER!")
-                pygame.display.update()
-                while True:
-                    events = pygame.event.get()
-                    for event in events:
-                        if event.type == pygame.KEYDOWN:
-                            return
-
-    def update_caption(self):
-        """Updates caption shown on Application bar"""
-        pygame.display.set_caption(f"Pacman level: {self.level} "
-                                   f"score: {self.score} "
-                                   f"lives: {self.lives}")
+            self.update_hud()
+        self.timers.reset(self.tick)
+        self.schedule_mode_change()
+        self.releases.reset(self.map.total_pellets - len(self.pellets))
+        for name, ghost in self.ghosts.items():
+            if ghost.freeze:
+                self.releases.schedule(name, ghost.pellets_to_leave,
+                                       ghost.release)
+        if self.lives == 0:
+            self.draw_text("GAME OVER!")
+            self.update_display()
+            self.wait_for_key()
+
+    def finished(self):
+        """Checks if the game is over or the window was closed"""
+        return self.lives == 0 or self.quit
+
+    def wait_for_key(self):
+        """Blocks until input source has next key (any key for keyboard)"""
+        self.input_source.wait(self)
+
+    def handle_input(self):
+        """Lets input source press keys due in this tick"""
+        self.input_source.poll(self)
+
+    def toggle_overlay(self):
+        """Shows or hides profiler overlay"""
+        if self.overlay is None:
+            self.overlay = profiler.Overlay(self.profiler)
+        else:
+            rect = self.overlay.clear()
+            self.dirty_rects.append(rect)
+            self.cleared_rects.append(rect)
+            self.overlay = None
+
+    def save_screenshot(self):
+        """Saves game window as PNG file named by current frame"""
+        recorder.save_screenshot(self.resources.window,
+                                 f"screenshot-{self.frame:06}.png")
+
+    def press(self, direction):
+        """Handles key press - direction is None for non-arrow keys
+
+        Any key ends waiting, only horizontal ones turn the player then.
+        Every press is logged with current frame number and whether it
+        happened during update or between updates to allow replays."""
+        self.inputs.append((self.frame, direction, self.updating))
+        if self.wait:
+            if direction in [constants.RIGHT, constants.LEFT]:
+                self.player.direction = direction
+                self.player.next_direction = direction
+            self.wait = 0
+            self.clear_characters()
+            self.clear_text()
+        elif direction is not None:
+            self.player.next_direction = direction
+
+    def update_hud(self):
+        """Updates level, score and lives shown below the map"""
+        self.dirty_rects.extend(self.resources.hud.update(score=self.score,
+                                                          level=self.level,
+                                                          lives=self.lives))
 
     def remove_pellet(self, tile_x, tile_y):
         """Removes the pellet from given location and returns the value of it"""
-        try:
-            tile = next(t for t in self.pellets
-                        if t.x == tile_x and t.y == tile_y)
-            if tile.cell in [constants.PELLET, constants.PELLET2]:
-                del self.pellets[self.pellets.index(tile)]
-                return 10
-            if tile.cell == constants.POWER_PELLET:
-                del self.pellets[self.pellets.index(tile)]
-                return 50
-            return False
-        except StopIteration:
-            return False
+        return self.pellets.remove(tile_x, tile_y)
 
     def step(self):
         """Step method - executed once every frame"""
         start_time = time.time()
-        if not self.wait:
-            if self.player.eat(
-                    self,
-                    self.remove_pellet(self.player.get_tile_x(),
-                                       self.player.get_tile_y())):
-
-                self.spawn_fruit()
-                if self.next_level():
-                    return (time.time() - start_time) * 1000
-            else:
-                self.player.move(self.level)
-            self.change_ghost_states()
-            if self.check_collisions():
-                return (time.time() - start_time) * 1000
-            for ghost in self.ghosts.values():
-                ghost.move(self.player,
-                           self.ghosts,
-                           len(self.pellets),
-                           self.previous_ghosts_state,
-                           self.level)
-            self.draw_fruit()
-            self.draw_pellets()
-            self.draw_characters()
-            pygame.display.update()  # room for improvement
-            self.tick += 1
-            self.clear_characters()
+        self.update()
+        self.render()
+        return (time.time() - start_time) * 1000
+
+    def update(self):
+        """Advances the simulation by one frame"""
+        self.updating = True
+        self.profiler.next_row(self.frame, self.level)
+        self.advance()
+        self.updating = False
+        self.frame += 1
+
+    def advance(self):
+        """Advances the game by one tick or waits for key to start"""
+        if self.wait:
+            self.handle_input()
+            self.profiler.lap("input")
+            return
+        if self.player.eat(self,
+                           self.remove_pellet(self.player.get_tile_x(),
+                                              self.player.get_tile_y())):
+            self.spawn_fruit()
+            self.profiler.lap("eat")
+            if self.next_level():
+                return
         else:
+            self.profiler.lap("eat")
+            self.handle_input()
+            self.profiler.lap("input")
+            self.player.move(self.profile, self.get_fright())
+            self.profiler.lap("player_move")
+        self.timers.advance(self.tick)
+        self.profiler.lap("timers")
+        if self.check_collisions():
+            return
+        self.profiler.lap("collisions")
+        self.move_ghosts()
+        self.tick += 1
+
+    def render(self):
+        """Draws current state of the game and shows it on the screen"""
+        self.profiler.begin()
+        self.scroll()
+        self.profiler.lap("scroll")
+        if self.wait:
             self.clear_fruit()
-            self.draw_pellets()
+            self.profiler.lap("draw_fruit")
+            self.draw_cleared_pellets()
+            self.profiler.lap("draw_pellets")
             self.draw_characters()
-            drawhelper.draw_text("R E A D Y !")
-            pygame.display.update()
-
-            events = pygame.event.get()
-            keys = [pygame.K_RIGHT, 0, pygame.K_LEFT, 0]
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key in keys:
-                        self.player.direction = keys.index(event.key)
-                        self.player.next_direction = keys.index(event.key)
-                    self.wait = 0
-                    self.clear_characters()
-                    drawhelper.clear_text()
-        return (time.time() - start_time) * 1000
+            self.profiler.lap("draw_characters")
+            self.draw_text("R E A D Y !")
+            self.profiler.lap("draw_text")
+            self.draw_overlay()
+            self.profiler.lap("draw_overlay")
+            self.update_display()
+            self.profiler.lap("display_update")
+        else:
+            self.draw_fruit()
+            self.profiler.lap("draw_fruit")
+            self.draw_cleared_pellets()
+            self.profiler.lap("draw_pellets")
+            self.draw_characters()
+            self.profiler.lap("draw_characters")
+            self.draw_overlay()
+            self.profiler.lap("draw_overlay")
+            self.update_display()
+            self.profiler.lap("display_update")
+            self.clear_characters()
+            self.profiler.lap("clear_characters")
 
-    def check_collisions(self):
-        """Check for collisions of player with any of the ghosts"""
+    def move_ghosts(self):
+        """Moves all the ghosts and keeps the spatial hash up to date
+
+        Values shared by ghost targets are computed once for the tick.
+        Ghosts released after enough pellets are eaten move from the
+        next tick."""
+        leader = self.blinkies[0] if self.blinkies else None
+        self.targets.update(self.player, leader)
         for ghost in self.ghosts.values():
+            ghost.move(self.targets,
+                       self.previous_ghosts_state,
+                       self.profile)
+            self.ghost_hash.update(ghost)
+            if ghost is leader:
+                self.targets.update_blinky(ghost)
+            self.profiler.lap(ghost.kind)
+        self.releases.advance(self.map.total_pellets - len(self.pellets))
+        self.profiler.lap("timers")
+
+    def check_collisions(self):
+        """Check for collisions of player with ghosts on the same tile"""
+        for ghost in self.ghost_hash.get(self.player.get_tile_x(),
+                                         self.player.get_tile_y()):
             if not ghost.dead:
-                if ghost.get_tile_x() == self.player.get_tile_x():
-                    if ghost.get_tile_y() == self.player.get_tile_y():
-                        if ghost.state == constants.FRIGHTENED:
-                            self.score += 200 * self.combo
-                            self.combo *= 2
-                            self.update_caption()
-                            ghost.dead = True
-                            ghost.update_target(self.player, self.ghosts)
-                        else:
-                            self.initialize_level(False)
-                            return True
+                if ghost.state == constants.FRIGHTENED:
+                    self.score += 200 * self.combo
+                    self.combo *= 2
+                    self.update_hud()
+                    ghost.dead = True
+                    ghost.update_target(self.targets)
+                else:
+                    self.initialize_level(False)
+                    return True
         return False
 
     def next_level(self):
@@ -162,99 +287,249 @@ class Game:
             return True
         return False
 
-    def change_ghost_states(self):
-        """Operates the ghost state cycle rotation"""
-        if self.player.fright > 0:
-            self.player.fright -= 1
+    def get_fright(self):
+        """Returns number of ticks left until frightened ghosts recover"""
+        tick = self.timers.get_tick("fright")
+        return 0 if tick is None else tick - self.tick
+
+    def frighten_ghosts(self):
+        """Frightens the ghosts for fright time of the level
+
+        Mode clock is paused until the fright ends."""
+        for ghost in self.ghosts.values():
+            ghost.change_state(constants.FRIGHTENED)
+        self.timers.cancel("mode")
+        self.timers.schedule("fright", self.tick + self.profile.fright_ticks,
+                             self.end_fright)
+
+    def end_fright(self):
+        """Returns frightened ghosts to current mode, resumes mode clock"""
+        if any(ghost.state == constants.FRIGHTENED
+               for ghost in self.ghosts.values()):
+            for ghost in self.ghosts.values():
+                ghost.change_state(self.previous_ghosts_state)
+        self.schedule_mode_change()
+
+    def schedule_mode_change(self, first_cycle=0):
+        """Schedules the first due mode change from given cycle on
+
+        Mode clock is the tick without fright time of eaten power
+        pellets."""
+        offset = self.player.power_pellets * self.profile.fright_ticks
+        cycle_times = self.profile.mode_cycle
+        for cycle in range(first_cycle, len(cycle_times)):
+            tick = cycle_times[cycle] * constants.TICKRATE + offset
+            if tick >= self.timers.tick:
+                self.timers.schedule(
+                    "mode", tick, functools.partial(self.change_mode, cycle))
+                return
+
+    def change_mode(self, cycle):
+        """Switches the ghosts to chase or scatter mode of given cycle"""
+        new_state = constants.SCATTER if cycle % 2 else constants.CHASE
+        self.previous_ghosts_state = new_state
+        for ghost in self.ghosts.values():
+            ghost.change_state(new_state)
+        self.schedule_mode_change(cycle + 1)
+
+    def scroll(self):
+        """Moves the view after the player, redraws it if it moved
+
+        Otherwise one wall chunk next to the view may be rendered ahead."""
+        view = self.resources.viewport
+        if view.follow(self.player.x, self.player.y):
+            self.cleared_rects = []
+            self.draw_walls()
+            self.draw_pellets()
         else:
-            if any(g for g in self.ghosts.values()
-                   if g.state == constants.FRIGHTENED):
-                for ghost in self.ghosts.values():
-                    ghost.change_state(self.previous_ghosts_state)
-            cycle_times = constants.get_level_based_constant(
-                self.level, constants.GHOST_MODE_CYCLE)
-            second = self.tick / constants.TICKRATE - \
-                     self.player.power_pellets * \
-                     constants.get_level_based_constant(self.level,
-                                                        constants.FRIGHT_TIME)
-            if second in cycle_times:
-                cycle = cycle_times.index(second)
-                new_state = constants.SCATTER if cycle % 2 else constants.CHASE
-                self.previous_ghosts_state = new_state
-                for ghost in self.ghosts.values():
-                    ghost.change_state(new_state)
+            self.resources.walls.prefetch(view)
 
     def draw_walls(self):
-        """Draws all the map walls depending on wall types"""
-        for wall_x, wall_y, wall_type in self.MAP.get_walls():
-            {
-                0: lambda x, y: drawhelper.draw_arc(x + .5, y + .5, 1 / 2, 1),
-                1: lambda x, y: drawhelper.draw_arc(x - .5, y + .5, 0, 1 / 2),
-                2: lambda x, y: drawhelper.draw_arc(x - .5, y - .5, 3 / 2, 0),
-                3: lambda x, y: drawhelper.draw_arc(x + .5, y - .5, 1, 3 / 2),
-                4: lambda x, y: drawhelper.draw_line(x + .5, y, x + .5, y + 1),
-                5: lambda x, y: drawhelper.draw_line(x, y + .5, x + 1, y + .5),
-            }[wall_type](wall_x, wall_y)
-        pygame.display.update()
+        """Draws walls of the whole view from the wall layer"""
+        if self.resources.walls is None or \
+                self.resources.walls.map is not self.map:
+            self.resources.walls = walls.WallLayer(self.map)
+        view = self.resources.viewport
+        self.dirty_rects.append(
+            self.resources.walls.draw(self.resources.window, view.rect, view))
+
+    def update_display(self):
+        """Shows regions drawn since last update on the screen
+
+        Shown frame is passed to the recorder if the game is recorded."""
+        if self.recorder is not None:
+            self.recorder.capture(self.frame, self.dirty_rects)
+        pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
+
+    def draw_text(self, string):
+        """Draws text in the middle of the map"""
+        self.text_rect = drawhelper.draw_text(string)
+        self.dirty_rects.append(self.text_rect)
+
+    def clear_text(self):
+        """Clears text drawn in the middle of the map"""
+        if self.text_rect is not None:
+            rect = drawhelper.clear_text(self.text_rect)
+            self.dirty_rects.append(rect)
+            self.cleared_rects.append(rect)
+            self.text_rect = None
+
+    def draw_overlay(self):
+        """Draws profiler overlay if it is shown"""
+        if self.overlay is not None:
+            self.dirty_rects.append(self.overlay.draw())
 
     def draw_characters(self):
-        """Draws barrier, player and all the ghosts"""
-        self.barrier.draw()
-        self.player.draw(self.tick)
-        for ghost in self.ghosts.values():
-            ghost.draw(self.tick, self.player.fright)
+        """Draws barrier, player and the ghosts in the view"""
+        self.dirty_rects.extend(self.barrier.draw())
+        self.dirty_rects.append(self.player.draw(self.tick))
+        view = self.resources.viewport.world_rect.inflate(
+            constants.SPRITE_SIZE, constants.SPRITE_SIZE)
+        self.drawn_ghosts = [ghost for ghost in self.ghosts.values()
+                             if view.collidepoint(ghost.x, ghost.y)]
+        for ghost in self.drawn_ghosts:
+            self.dirty_rects.append(ghost.draw(self.tick, self.get_fright()))
 
     def clear_characters(self):
-        """Clears barrier, player and all the ghosts"""
-        self.barrier.clear()
-        self.player.clear()
-        for ghost in self.ghosts.values():
-            ghost.clear()
+        """Clears barrier, player and the ghosts drawn last time"""
+        rects = self.barrier.clear()
+        rects.append(self.player.clear())
+        for ghost in self.drawn_ghosts:
+            rects.append(ghost.clear())
+        self.dirty_rects.extend(rects)
+        self.cleared_rects.extend(rects)
 
     def spawn_fruit(self):
         """Spawn fruits when enough pellets are eaten"""
-        pellets = len(self.pellets)
-        if self.MAP.total_pellets - pellets in constants.FRUIT_SPAWN:
-            self.fruit = random.randint(
+        if self.map.total_pellets - len(self.pellets) in constants.FRUIT_SPAWN:
+            ticks = self.random.randint(
                 9 * constants.TICKRATE, 10 * constants.TICKRATE)
+            self.timers.schedule("fruit", self.tick + ticks - 1,
+                                 self.clear_fruit)
+
+    def has_fruit(self):
+        """Checks if fruit is waiting to be eaten"""
+        return self.timers.get_tick("fruit") is not None
 
     def draw_fruit(self):
         """Draws fruit on game window"""
-        if self.fruit > 0:
-            fruit_x, fruit_y = self.MAP.get_coordinates('f')
-            fruit_image_col = constants.get_level_based_constant(
-                self.level, constants.FRUITS)[0]
+        if self.has_fruit():
+            fruit_x, fruit_y = self.map.get_coordinates('f')
+            fruit_image_col = self.profile.fruit[0]
             offset = constants.TILE_SIZE / 2 - constants.SPRITE_SIZE / 2
-            self.WINDOW.blit(
+            self.dirty_rects.append(self.resources.window.blit(
                 drawhelper.get_image_at(fruit_image_col,
                                         constants.FRUIT_IMAGE_ROW),
-                ((fruit_x + 0.5) * constants.TILE_SIZE + offset,
-                 fruit_y * constants.TILE_SIZE + offset))
-            self.fruit -= 1
-            if self.fruit == 0:
-                self.clear_fruit()
+                drawhelper.to_screen(
+                    (fruit_x + 0.5) * constants.TILE_SIZE + offset,
+                    fruit_y * constants.TILE_SIZE + offset)))
 
     def clear_fruit(self):
         """Clears fruit"""
-        fruit_x, fruit_y = self.MAP.get_coordinates('f')
+        fruit_x, fruit_y = self.map.get_coordinates('f')
         offset = (constants.TILE_SIZE - constants.SPRITE_SIZE) / 2
-        if self.fruit == 0:
-            drawhelper.draw_rect(fruit_x + 0.5, fruit_y, constants.SPRITE_SIZE,
-                                 offset=offset)
+        if not self.has_fruit():
+            rect = drawhelper.draw_rect(fruit_x + 0.5, fruit_y,
+                                        constants.SPRITE_SIZE, offset=offset)
+            self.dirty_rects.append(rect)
+            self.cleared_rects.append(rect)
 
     def draw_pellets(self):
-        """Draws all pellets"""
+        """Draws all pellets in the view"""
+        view = self.resources.viewport
+        self.draw_pellets_in(view.world_rect)
+        self.dirty_rects.append(view.rect)
+
+    def draw_cleared_pellets(self):
+        """Redraws pellets lying under regions cleared since last frame"""
+        view = self.resources.viewport
+        for rect in self.cleared_rects:
+            self.draw_pellets_in(rect.move(view.x, view.y))
+        self.cleared_rects = []
+
+    def draw_pellets_in(self, rect):
+        """Draws pellets on tiles overlapping given map rectangle"""
+        tile_size = constants.TILE_SIZE
+        for tile_y in range(rect.top // tile_size,
+                            (rect.bottom - 1) // tile_size + 1):
+            for tile_x in range(rect.left // tile_size,
+                                (rect.right - 1) // tile_size + 1):
+                pellet_type = self.pellets.get(tile_x, tile_y)
+                if pellet_type:
+                    self.draw_pellet(tile_x, tile_y, pellet_type)
+
+    def draw_pellet(self, pellet_x, pellet_y, pellet_type):
+        """Draws pellet of given type at given tile"""
         tile_size = constants.TILE_SIZE
         size = tile_size / 8
         offset = tile_size / 2 - size / 2
-        for pellet in self.pellets:
-            pellet_x, pellet_y, pellet_type = dataclasses.astuple(pellet)
-            if pellet_type in [constants.PELLET, constants.PELLET2]:
-                drawhelper.draw_rect(pellet_x, pellet_y, size,
-                                     offset=offset,
-                                     color=constants.PELLET_COLOR)
-            elif pellet_type == constants.POWER_PELLET:
-                pygame.draw.circle(self.WINDOW, constants.PELLET_COLOR,
-                                   (int((pellet_x + 0.5) * tile_size),
-                                    int((pellet_y + 0.5) * tile_size)),
-                                   int(size * 2))
+        if pellet_type in [constants.PELLET, constants.PELLET2]:
+            drawhelper.draw_rect(pellet_x, pellet_y, size,
+                                 offset=offset,
+                                 color=constants.PELLET_COLOR)
+        elif pellet_type == constants.POWER_PELLET:
+            pygame.draw.circle(self.resources.window, constants.PELLET_COLOR,
+                               drawhelper.to_screen(
+                                   int((pellet_x + 0.5) * tile_size),
+                                   int((pellet_y + 0.5) * tile_size)),
+                               int(size * 2))
+
+
+class HeadlessGame(Game):
+    """Game running the same simulation without window or drawing
+
+    The player is driven by `press` calls or by given input source and
+    the level starts right away instead of waiting for a key."""
+    def create_input_source(self):
+        return inputs.InputSource()
+
+    def open_window(self):
+        pass
+
+    def render(self):
+        pass
+
+    def handle_input(self):
+        if self.wait:
+            self.press(None)
+        super().handle_input()
+
+    def update_hud(self):
+        pass
+
+    def update_display(self):
+        pass
+
+    def draw_text(self, string):
+        pass
+
+    def clear_text(self):
+        pass
+
+    def draw_overlay(self):
+        pass
+
+    def scroll(self):
+        pass
+
+    def draw_walls(self):
+        pass
+
+    def draw_pellets(self):
+        pass
+
+    def draw_cleared_pellets(self):
+        pass
+
+    def draw_characters(self):
+        pass
+
+    def clear_characters(self):
+        pass
+
+    def draw_fruit(self):
+        pass
+
+    def clear_fruit(self):
+        pass
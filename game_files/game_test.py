@@ -0,0 +1,81 @@
+"""Game module tests - run on headless game and dummy video driver"""
+import os
+import unittest
+from unittest import mock
+
+import pygame
+
+import constants, game, resources
+
+
+class HeadlessGameTest(unittest.TestCase):
+    def setUp(self):
+        self.game = game.HeadlessGame()
+        self.game.initialize_level(True)
+
+    def test_setup(self):
+        self.assertEqual(self.game.level, 1)
+        self.assertEqual(self.game.lives, 4)
+        self.assertEqual(len(self.game.pellets), 244)
+        self.assertEqual(self.game.wait, 1)
+
+    def test_no_window_is_opened(self):
+        self.assertIsNone(resources.RESOURCES.window)
+        self.assertIs(self.game.map, resources.RESOURCES.map)
+
+    def test_barrier_is_not_shared(self):
+        other = game.HeadlessGame()
+        other.initialize_level(True)
+        other.barrier.visible = True
+        self.assertFalse(self.game.barrier.visible)
+        self.assertIs(self.game.ghosts["inky"].barrier, self.game.barrier)
+
+    def test_starts_without_key(self):
+        self.game.step()
+        self.assertEqual(self.game.wait, 0)
+        self.game.step()
+        self.assertEqual(self.game.tick, 1)
+
+    def test_press_turns_player(self):
+        self.game.press(constants.LEFT)
+        self.assertEqual(self.game.player.direction, constants.LEFT)
+        self.game.press(constants.UP)
+        self.assertEqual(self.game.player.next_direction, constants.UP)
+        self.assertEqual(self.game.player.direction, constants.LEFT)
+
+    def test_player_eats_and_dies(self):
+        self.game.press(constants.LEFT)
+        while self.game.lives == 4:
+            self.game.step()
+        self.assertGreater(self.game.score, 0)
+        self.assertLess(len(self.game.pellets), 244)
+        self.assertEqual(self.game.wait, 1)
+
+
+class WindowGameTest(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.font.init()
+        self.resources = resources.RESOURCES
+        resources.RESOURCES = resources.Resources()
+
+    def tearDown(self):
+        resources.RESOURCES = self.resources
+
+    def test_hud_labels_are_shown(self):
+        with mock.patch("pygame.display.update") as update:
+            game_obj = game.Game(0)
+            game_obj.initialize_level(True)
+            game_obj.render()
+        shown = [rect for call in update.call_args_list
+                 for rect in call.args[0]]
+        labels = resources.RESOURCES.hud.draw_labels()
+        self.assertGreater(labels[0].top,
+                           resources.RESOURCES.viewport.rect.bottom)
+        for rect in labels:
+            self.assertIn(rect, shown)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Module with ghost hordes - any number of ghosts of the four kinds
+
+Horde is a list of ghost specs. Ghosts of the same kind behave like the
+classic one, but may spawn elsewhere and leave the base later."""
+from dataclasses import dataclass
+
+import constants, characters
+
+KINDS = {ghost_class.kind: ghost_class for ghost_class in [
+    characters.Blinky, characters.Pinky, characters.Inky, characters.Clyde]}
+SPAWN_CELLS = {"blinky": 'b', "pinky": 'p', "inky": 'i', "clyde": 'c'}
+
+
+@dataclass(frozen=True)
+class GhostSpec:
+    """Ghost of a horde - its kind, spawn point and release threshold
+
+    Spawn is a map cell type or (tile_x, tile_y) tuple, it has to be
+    inside the base for all kinds but Blinky. Ghost with pellets to
+    leave set waits until that many pellets are eaten, otherwise default
+    of its kind is used."""
+    kind: str
+    spawn: object = None
+    pellets_to_leave: int = None
+
+
+CLASSIC_HORDE = [GhostSpec(kind) for kind in KINDS]
+
+
+def get_horde(size, release_step=constants.HORDE_RELEASE_STEP):
+    """Returns specs of classic ghosts repeated up to given size
+
+    Every next group of four ghosts leaves the base release_step
+    pellets later than the previous one."""
+    specs = []
+    for index in range(size):
+        group, kind_index = divmod(index, len(CLASSIC_HORDE))
+        spec = CLASSIC_HORDE[kind_index]
+        if group:
+            ghost_class = KINDS[spec.kind]
+            spec = GhostSpec(spec.kind, pellets_to_leave=(
+                ghost_class.pellets_to_leave + group * release_step))
+        specs.append(spec)
+    return specs
+
+
+def spawn(specs, level_map):
+    """Returns dictionary of ghosts created from specs by unique names
+
+    The first ghost of every kind is named after it, next ones get
+    numbers (e.g. "inky", "inky2")."""
+    ghosts = {}
+    counts = dict.fromkeys(KINDS, 0)
+    for spec in specs:
+        spawn_point = spec.spawn or SPAWN_CELLS[spec.kind]
+        if isinstance(spawn_point, str):
+            spawn_point = level_map.get_coordinates(spawn_point)
+        ghost = KINDS[spec.kind](*spawn_point, level_map)
+        if spec.pellets_to_leave is not None:
+            ghost.pellets_to_leave = spec.pellets_to_leave
+            ghost.freeze = True
+        counts[spec.kind] += 1
+        name = spec.kind if counts[spec.kind] == 1 \
+            else f"{spec.kind}{counts[spec.kind]}"
+        ghosts[name] = ghost
+    return ghosts
+
+
+class SpatialHash:
+    """Ghosts bucketed by the tile they stand on
+
+    Ghosts found on a tile are returned in horde order, so collisions
+    are resolved the same way as when checking every ghost."""
+    def __init__(self, ghosts):
+        self.order = {ghost: index for index, ghost in enumerate(ghosts)}
+        self.tiles = {}
+        self.buckets = {}
+        for ghost in ghosts:
+            self.insert(ghost)
+
+    def insert(self, ghost):
+        """Adds ghost to the bucket of its current tile"""
+        tile = (ghost.get_tile_x(), ghost.get_tile_y())
+        self.tiles[ghost] = tile
+        self.buckets.setdefault(tile, []).append(ghost)
+
+    def update(self, ghost):
+        """Moves ghost to another bucket if it changed the tile"""
+        tile = self.tiles[ghost]
+        if tile != (ghost.get_tile_x(), ghost.get_tile_y()):
+            bucket = self.buckets[tile]
+            bucket.remove(ghost)
+            if not bucket:
+                del self.buckets[tile]
+            self.insert(ghost)
+
+    def get(self, tile_x, tile_y):
+        """Returns list of ghosts standing on given tile in horde order"""
+        bucket = self.buckets.get((tile_x, tile_y))
+        if not bucket:
+            return []
+        return sorted(bucket, key=self.order.__getitem__)
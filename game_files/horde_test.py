@@ -0,0 +1,89 @@
+"""Horde module tests - specs, spawning and spatial hash"""
+import unittest
+from parameterized import parameterized
+
+import constants, characters, game, horde, resources
+
+
+class HordeTest(unittest.TestCase):
+    def test_classic_horde(self):
+        ghosts = horde.spawn(horde.get_horde(4), resources.RESOURCES.map)
+        self.assertEqual(list(ghosts), ["blinky", "pinky", "inky", "clyde"])
+        self.assertEqual([ghost.pellets_to_leave for ghost in ghosts.values()],
+                         [0, 0, 30, 60])
+        self.assertFalse(ghosts["pinky"].freeze)
+
+    def test_bigger_horde(self):
+        ghosts = horde.spawn(horde.get_horde(10, release_step=5),
+                             resources.RESOURCES.map)
+        self.assertEqual(list(ghosts)[4:],
+                         ["blinky2", "pinky2", "inky2", "clyde2",
+                          "blinky3", "pinky3"])
+        self.assertEqual(ghosts["inky2"].pellets_to_leave, 35)
+        self.assertEqual(ghosts["pinky3"].pellets_to_leave, 10)
+        self.assertTrue(ghosts["blinky2"].freeze)
+        self.assertFalse(ghosts["blinky2"].in_base)
+        self.assertEqual((ghosts["clyde2"].x, ghosts["clyde2"].y),
+                         (ghosts["clyde"].x, ghosts["clyde"].y))
+
+    def test_spawn_tile(self):
+        spec = horde.GhostSpec("blinky", (1, 1), pellets_to_leave=20)
+        ghost = horde.spawn([spec], resources.RESOURCES.map)["blinky"]
+        self.assertEqual((ghost.get_tile_x(), ghost.get_tile_y()), (2, 1))
+        self.assertEqual(ghost.pellets_to_leave, 20)
+
+
+class SpatialHashTest(unittest.TestCase):
+    def setUp(self):
+        self.ghosts = list(horde.spawn(horde.get_horde(8),
+                                       resources.RESOURCES.map).values())
+        self.hash = horde.SpatialHash(self.ghosts)
+
+    def test_get_in_horde_order(self):
+        pinky, pinky2 = self.ghosts[1], self.ghosts[5]
+        tile = (pinky.get_tile_x(), pinky.get_tile_y())
+        self.assertEqual(self.hash.get(*tile), [pinky, pinky2])
+        self.assertEqual(self.hash.get(0, 0), [])
+
+    def test_update(self):
+        pinky = self.ghosts[1]
+        tile = (pinky.get_tile_x(), pinky.get_tile_y())
+        pinky.x -= constants.TILE_SIZE
+        self.hash.update(pinky)
+        self.assertEqual(self.hash.get(*tile), [self.ghosts[5]])
+        self.assertEqual(self.hash.get(tile[0] - 1, tile[1]), [pinky])
+
+    @parameterized.expand([(4,), (64,)])
+    def test_matches_every_ghost_check(self, ghost_count):
+        game_obj = game.HeadlessGame(0)
+        game_obj.horde = horde.get_horde(ghost_count)
+        game_obj.initialize_level(True)
+        game_obj.press(constants.LEFT)
+        for _ in range(600):
+            game_obj.update()
+            ghosts = list(game_obj.ghosts.values())
+            tile = (game_obj.player.get_tile_x(), game_obj.player.get_tile_y())
+            self.assertEqual(
+                game_obj.ghost_hash.get(*tile),
+                [ghost for ghost in ghosts
+                 if (ghost.get_tile_x(), ghost.get_tile_y()) == tile])
+        self.assertGreater(game_obj.score, 0)
+
+
+class TargetsTest(unittest.TestCase):
+    def test_targets(self):
+        player = characters.Player(10, 20)
+        player.direction = constants.UP
+        blinky = characters.Blinky(4, 4)
+        targets = characters.Targets()
+        targets.update(player, blinky)
+        self.assertEqual(targets.player_tile, (11, 20))
+        self.assertEqual(targets.four_ahead, (11, 16))
+        self.assertEqual(characters.Inky(0, 0).get_chase_target(targets),
+                         (5 + 2 * (11 - 5), 4 + 2 * (18 - 4)))
+        targets.update(player)
+        self.assertEqual(targets.blinky_tile, targets.two_ahead)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Module containing heads-up display drawn below the map"""
+import pygame
+
+import constants, drawhelper, resources
+
+FIELDS = ["score", "level", "lives"]
+FIELD_DIGITS = {"score": 7, "level": 3, "lives": 2}
+
+
+class Hud:
+    """Heads-up display showing score, level and lives
+
+    Digits are rendered once into a strip and numbers are composed
+    from it, fields are redrawn only when their value changes."""
+    def __init__(self):
+        font = drawhelper.get_font(constants.HUD_FONT_SIZE)
+        glyphs = [font.render(str(digit), True, constants.TEXT_COLOR,
+                              constants.BACKGROUND_COLOR)
+                  for digit in range(10)]
+        self.digit_width = max(glyph.get_width() for glyph in glyphs)
+        self.digit_height = max(glyph.get_height() for glyph in glyphs)
+        self.digits = pygame.Surface((self.digit_width * 10,
+                                      self.digit_height)).convert()
+        self.digits.fill(constants.BACKGROUND_COLOR)
+        for digit, glyph in enumerate(glyphs):
+            self.digits.blit(glyph, (digit * self.digit_width +
+                                     (self.digit_width - glyph.get_width())
+                                     // 2, 0))
+
+        view = resources.RESOURCES.viewport
+        self.top = view.height + \
+            (constants.HUD_HEIGHT - self.digit_height) // 2
+        self.labels = {}
+        self.positions = {}
+        field_width = view.width // len(FIELDS)
+        for index, field in enumerate(FIELDS):
+            label = drawhelper.render_text(field.upper() + " ",
+                                           constants.HUD_FONT_SIZE)
+            label_x = index * field_width + constants.TILE_SIZE
+            self.labels[field] = (label, label_x)
+            self.positions[field] = label_x + label.get_width()
+        self.values = dict.fromkeys(FIELDS)
+
+    def draw_labels(self):
+        """Draws field labels and returns drawn rectangles
+
+        Values are forgotten, so all of them are redrawn on next update"""
+        self.values = dict.fromkeys(FIELDS)
+        return [resources.RESOURCES.window.blit(label, (label_x, self.top))
+                for label, label_x in self.labels.values()]
+
+    def draw_number(self, field, number):
+        """Draws number in place of given field and returns its rectangle"""
+        digits = FIELD_DIGITS[field]
+        rect = pygame.Rect(self.positions[field], self.top,
+                           digits * self.digit_width, self.digit_height)
+        resources.RESOURCES.window.fill(constants.BACKGROUND_COLOR, rect)
+        string = str(number)[-digits:]
+        for index, digit in enumerate(string):
+            resources.RESOURCES.window.blit(
+                self.digits,
+                (rect.x + index * self.digit_width, rect.y),
+                (int(digit) * self.digit_width, 0,
+                 self.digit_width, self.digit_height))
+        return rect
+
+    def update(self, **values):
+        """Redraws fields whose values changed and returns their rectangles"""
+        rects = []
+        for field, number in values.items():
+            if self.values[field] != number:
+                self.values[field] = number
+                rects.append(self.draw_number(field, number))
+        return rects
@@ -0,0 +1,123 @@
+"""Module with input sources - keyboard, scripted keys and agents
+
+Game polls its source once a tick during update and the source presses
+keys with game.press. Window events are read only by WindowInput, other
+sources drive the player without any SDL events."""
+import pygame
+
+import constants
+
+KEYS = {
+    pygame.K_RIGHT: constants.RIGHT,
+    pygame.K_UP: constants.UP,
+    pygame.K_LEFT: constants.LEFT,
+    pygame.K_DOWN: constants.DOWN,
+}
+SCRIPT_KEYS = {
+    "right": constants.RIGHT,
+    "up": constants.UP,
+    "left": constants.LEFT,
+    "down": constants.DOWN,
+    "any": None,
+}
+
+
+class InputSource:
+    """Base of input sources - presses nothing and never blocks"""
+    def poll(self, game_obj):
+        """Presses keys due in current tick"""
+
+    def wait(self, game_obj):
+        """Blocks while the game is idle until next key is available"""
+
+
+class WindowInput(InputSource):
+    """Events of the game window pumped once a tick
+
+    Closing the window quits the game, F3 toggles profiler overlay and
+    F12 saves screenshot.
+    Keys of the player come from given source (e.g. agent playing in the
+    window), other keys are ignored."""
+    def __init__(self, source=None):
+        self.source = source or InputSource()
+        self.pending = []
+
+    def poll(self, game_obj):
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        for event in events:
+            self.handle_event(game_obj, event)
+        self.source.poll(game_obj)
+
+    def handle_event(self, game_obj, event):
+        """Handles one window event"""
+        if event.type == pygame.QUIT:
+            game_obj.quit = True
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            game_obj.toggle_overlay()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+            game_obj.save_screenshot()
+
+    def wait(self, game_obj):
+        self.source.wait(game_obj)
+
+
+class KeyboardInput(WindowInput):
+    """Keys pressed in the game window
+
+    Waiting blocks on the event queue, so idle game uses no CPU. The
+    event ending the wait is kept and handled by next poll."""
+    def handle_event(self, game_obj, event):
+        super().handle_event(game_obj, event)
+        if event.type == pygame.KEYDOWN and \
+                event.key not in [pygame.K_F3, pygame.K_F12]:
+            game_obj.press(KEYS.get(event.key))
+
+    def wait(self, game_obj):
+        while True:
+            event = pygame.event.wait()
+            if event.type in [pygame.KEYDOWN, pygame.QUIT]:
+                self.pending.append(event)
+                return
+
+
+def load_script(path):
+    """Returns (frame, direction) entries of script file
+
+    Every line holds frame number and key name (right, up, left, down
+    or any), empty lines and lines starting with # are skipped."""
+    entries = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                frame, key = line.split()
+                entries.append((int(frame), SCRIPT_KEYS[key.lower()]))
+    return sorted(entries, key=lambda entry: entry[0])
+
+
+class ScriptedInput(InputSource):
+    """Keys pressed at given frames - (frame, direction) entries"""
+    def __init__(self, entries):
+        self.entries = entries
+        self.index = 0
+
+    def poll(self, game_obj):
+        while self.index < len(self.entries) and \
+                self.entries[self.index][0] <= game_obj.frame:
+            game_obj.press(self.entries[self.index][1])
+            self.index += 1
+
+
+class AgentInput(InputSource):
+    """Keys chosen by an agent - object with choose(game) method
+
+    Choose returns direction to press or None (see farm policies).
+    Waiting game is started right away."""
+    def __init__(self, agent):
+        self.agent = agent
+
+    def poll(self, game_obj):
+        direction = self.agent.choose(game_obj)
+        if direction is not None or game_obj.wait:
+            game_obj.press(direction)
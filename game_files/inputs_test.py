@@ -0,0 +1,80 @@
+"""Inputs module tests - sources driving headless games"""
+import os
+import random
+import tempfile
+import unittest
+import pygame
+
+import constants, farm, game, inputs
+
+
+class ScriptedInputTest(unittest.TestCase):
+    def test_load_script(self):
+        file, path = tempfile.mkstemp()
+        with os.fdopen(file, "w") as script:
+            script.write("# frame key\n30 up\n\n0 any\n12 LEFT\n")
+        try:
+            self.assertEqual(inputs.load_script(path),
+                             [(0, None), (12, constants.LEFT),
+                              (30, constants.UP)])
+        finally:
+            os.remove(path)
+
+    def test_presses_at_frames(self):
+        source = inputs.ScriptedInput([(0, constants.LEFT),
+                                       (40, constants.DOWN)])
+        game_obj = game.HeadlessGame(0, source)
+        game_obj.initialize_level(True)
+        for _ in range(60):
+            game_obj.update()
+        self.assertEqual(game_obj.inputs, [(0, None, True),
+                                           (0, constants.LEFT, True),
+                                           (40, constants.DOWN, True)])
+
+
+class AgentInputTest(unittest.TestCase):
+    def test_agent_plays(self):
+        source = inputs.AgentInput(farm.GreedyPolicy(random.Random(0)))
+        game_obj = game.HeadlessGame(0, source)
+        game_obj.initialize_level(True)
+        for _ in range(1000):
+            game_obj.update()
+        self.assertGreater(game_obj.score, 500)
+
+
+class KeyboardInputTest(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.event.clear()
+        self.source = inputs.KeyboardInput()
+        self.game = game.HeadlessGame(0, self.source)
+        self.game.initialize_level(True)
+
+    def post_key(self, key):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def test_keys_are_pressed_once(self):
+        self.post_key(pygame.K_UP)
+        self.post_key(pygame.K_a)
+        self.source.poll(self.game)
+        self.source.poll(self.game)
+        self.assertEqual([direction for _, direction, _ in self.game.inputs],
+                         [constants.UP, None])
+
+    def test_wait_keeps_key_for_poll(self):
+        self.post_key(pygame.K_LEFT)
+        self.source.wait(self.game)
+        self.assertEqual(self.game.inputs, [])
+        self.game.update()
+        self.assertEqual(self.game.inputs[-1][1], constants.LEFT)
+
+    def test_quit(self):
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        self.source.wait(self.game)
+        self.game.update()
+        self.assertTrue(self.game.finished())
+
+
+if __name__ == "__main__":
+    unittest.main()
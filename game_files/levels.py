@@ -0,0 +1,46 @@
+"""Module with level profiles - level based constants resolved once"""
+import functools
+from dataclasses import dataclass
+
+import constants
+
+
+@dataclass(frozen=True)
+class LevelProfile:
+    """Dataclass holding all level dependent values
+
+    Speeds are already multiplied by base speed and keep the order
+    of constants tables (e.g. ghost speed: normal, fright, tunnel)"""
+    level: int
+    pacman_speed: tuple
+    ghost_speed: tuple
+    elroy_pellets: tuple
+    elroy_speed: tuple
+    fright_time: int
+    fright_ticks: int
+    mode_cycle: tuple
+    fruit: tuple
+
+
+@functools.lru_cache(maxsize=None)
+def get_level_profile(level):
+    """Returns profile of given level - built only once for every level"""
+    def get(constant):
+        return constants.get_level_based_constant(level, constant)
+
+    elroy = get(constants.ELROY_SPEED_MULTIPLIER)
+    fright_time = get(constants.FRIGHT_TIME)
+    return LevelProfile(
+        level=level,
+        pacman_speed=tuple(constants.BASE_SPEED * multiplier for multiplier
+                           in get(constants.PACMAN_SPEED_MULTIPLIER)),
+        ghost_speed=tuple(constants.BASE_SPEED * multiplier for multiplier
+                          in get(constants.GHOST_SPEED_MULTIPLIER)),
+        elroy_pellets=tuple(pellets for pellets, _ in elroy),
+        elroy_speed=tuple(constants.BASE_SPEED * multiplier
+                          for _, multiplier in elroy),
+        fright_time=fright_time,
+        fright_ticks=fright_time * constants.TICKRATE,
+        mode_cycle=get(constants.GHOST_MODE_CYCLE),
+        fruit=get(constants.FRUITS),
+    )
@@ -1,5 +1,16 @@
-"""Module containing immutable map class and methods to access its elements"""
+"""Module containing immutable map class and methods to access its elements
+
+Maps are read from text files or, when present and up to date, from
+binary files made by the map compiler - those are memory mapped."""
+import array
+import collections
+import functools
+import math
+import mmap
+import os
 import re
+import struct
+import zlib
 from dataclasses import dataclass
 
 import constants
@@ -10,6 +21,32 @@ NEIGHBOR_COORDINATES = [
     (-1, +1), (0, +1), (+1, +1),
 ]
 
+# (dx, dy) of neighbour tile indexed by constants.RIGHT, UP, LEFT, DOWN
+DIRECTION_OFFSETS = [(+1, 0), (0, -1), (-1, 0), (0, +1)]
+
+# Order in which ghosts rate directions - used as a tiebreaker
+GHOST_DIRECTIONS = [constants.UP, constants.LEFT,
+                    constants.DOWN, constants.RIGHT]
+
+# Exit mask flag of intersections where living ghosts can not turn up
+NO_UP = 1 << 4
+
+# Distance table value of tiles from which the target can not be reached
+UNREACHABLE = 0xFFFF
+
+# Wall type grid value of tiles which are not walls
+NO_WALL = 0xFF
+
+# Compiled map: header, then cells, exits, wall types, pellet bitmap,
+# intersection and barrier indices, spawn points and tunnel pairs.
+# Sections start at multiples of 4 bytes, so index arrays can be cast.
+COMPILED_EXTENSION = ".pmap"
+COMPILED_MAGIC = b"PMAP"
+COMPILED_VERSION = 1
+COMPILED_HEADER = struct.Struct("<4sBxHHIIIIIII")
+COMPILED_COORDINATES = struct.Struct("<BxHH")
+COMPILED_TUNNEL = struct.Struct("<II")
+
 WALL_RULES = [re.compile(x) for x in """
     ^(...11.10)|(.0..1.10)|(.1.01.10)|(.0.01.1.)$
     ^(.0.10.1.)|(.0.1101.)|(.1.1.01.)$
@@ -20,6 +57,25 @@ WALL_RULES = [re.compile(x) for x in """
 """.split()]
 
 
+def build_ghost_exits():
+    """Returns table of directions ghost may take leaving a tile
+
+    Table is indexed by exit mask (with NO_UP flag) * 4 + incoming
+    direction. Ghosts never reverse and do not turn up at NO_UP tiles."""
+    table = []
+    for mask in range(NO_UP * 2):
+        for direction in range(4):
+            table.append(tuple(
+                exit_direction for exit_direction in GHOST_DIRECTIONS
+                if mask >> exit_direction & 1
+                and exit_direction != (direction + 2) % 4
+                and not (mask & NO_UP and exit_direction == constants.UP)))
+    return table
+
+
+GHOST_EXITS = build_ghost_exits()
+
+
 @dataclass
 class Tile:
     """Dataclass needed for map tiles representation"""
@@ -29,54 +85,396 @@ class Tile:
 
 
 class Map:
-    """Class containing tiles (read from file) and methods to access them"""
-    def __init__(self, map_file):
-        with open(map_file) as file:
-            self.game_map = [line.rstrip('\n') for line in file]
-        self.tiles = []
-        for y, line_str in enumerate(self.game_map):
-            for x, cell in enumerate(line_str):
-                self.tiles.append(Tile(x, y, cell))
-        self.total_pellets = sum(1 for i in self.get_pellets())
+    """Class containing tiles (read from file) and methods to access them
+
+    Cells are stored row by row in one flat bytearray, so every lookup
+    is a single index operation regardless of the map size.
+    """
+    def __init__(self, map_file, compiled=True):
+        with open(map_file, "rb") as file:
+            source = file.read()
+        self.distance_tables = {}
+        self.mapped = None
+        if not compiled or \
+                not self.load_compiled(get_compiled_path(map_file), source):
+            self.parse(source.decode("ascii"))
+        self.width_px = self.width * constants.TILE_SIZE
+        self.height_px = self.height * constants.TILE_SIZE
+
+    def parse(self, text):
+        """Builds the map from text representation"""
+        lines = text.splitlines()
+        self.width = max(len(line) for line in lines)
+        self.height = len(lines)
+        self.cells = bytearray(b"".join(
+            line.ljust(self.width, constants.WALL).encode("ascii")
+            for line in lines))
+        self.coordinates = {}
+        for index, cell in enumerate(self.cells):
+            tile_y, tile_x = divmod(index, self.width)
+            self.coordinates.setdefault(chr(cell), (tile_x, tile_y))
+        self.exits = self.build_exits()
+        self.pellets = self.build_pellets()
+        self.total_pellets = sum(bin(byte).count("1") for byte in self.pellets)
+        intersections = {ord(constants.INTERSECTION),
+                         ord(constants.INTERSECTION2)}
+        self.intersections = array.array('I', (
+            index for index, cell in enumerate(self.cells)
+            if cell in intersections))
+        barrier = ord(constants.BARRIER)
+        self.barriers = [divmod(index, self.width)[::-1]
+                         for index, cell in enumerate(self.cells)
+                         if cell == barrier]
+        tunnel = ord(constants.TUNNEL)
+        self.tunnels = [((0, y), (self.width - 1, y))
+                        for y in range(self.height)
+                        if self.cells[y * self.width] == tunnel and
+                        self.cells[(y + 1) * self.width - 1] == tunnel]
+
+    def load_compiled(self, path, source):
+        """Memory maps compiled map, returns False if it is missing or stale
+
+        Compiled file is stale when it was made from other source text,
+        stale files are never mapped. Files shorter than their header
+        says (e.g. truncated) are rejected too. Grids are read-only views
+        of the mapped file - nothing is copied until the map is closed."""
+        try:
+            with open(path, "rb") as file:
+                header = file.read(COMPILED_HEADER.size)
+                if len(header) < COMPILED_HEADER.size:
+                    return False
+                (magic, version, width, height, source_size, source_crc,
+                 total_pellets, intersections, barriers, coordinates,
+                 tunnels) = COMPILED_HEADER.unpack(header)
+                if magic != COMPILED_MAGIC or \
+                        version != COMPILED_VERSION or \
+                        source_size != len(source) or \
+                        source_crc != zlib.crc32(source):
+                    return False
+                size = width * height
+                lengths = [size, size, size, (size + 7) // 8,
+                           4 * intersections, 4 * barriers,
+                           COMPILED_COORDINATES.size * coordinates,
+                           COMPILED_TUNNEL.size * tunnels]
+                self.mapped = mmap.mmap(file.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(self.mapped) < get_compiled_size(lengths):
+            self.mapped.close()
+            self.mapped = None
+            return False
+
+        self.width, self.height = width, height
+        self.total_pellets = total_pellets
+        with memoryview(self.mapped) as data:
+            sections = iter_sections(data, lengths)
+            self.cells = next(sections)
+            self.exits = next(sections)
+            self.wall_types = next(sections)
+            self.pellets = next(sections)
+            self.intersections = next(sections).cast('I')
+            with next(sections) as section, section.cast('I') as indices:
+                self.barriers = [divmod(index, width)[::-1]
+                                 for index in indices]
+            with next(sections) as section:
+                self.coordinates = {
+                    chr(cell): (x, y) for cell, x, y
+                    in COMPILED_COORDINATES.iter_unpack(section)}
+            with next(sections) as section:
+                self.tunnels = [(divmod(first, width)[::-1],
+                                 divmod(second, width)[::-1])
+                                for first, second
+                                in COMPILED_TUNNEL.iter_unpack(section)]
+        return True
+
+    def close(self):
+        """Copies grids out of the mapped file and closes it
+
+        The map stays usable. Mapped file can not be replaced on some
+        systems, so it is closed before the map is compiled again."""
+        if self.mapped is None:
+            return
+        views = [self.cells, self.exits, self.wall_types, self.pellets]
+        self.cells, self.exits, self.wall_types, self.pellets = [
+            bytearray(view) for view in views]
+        views.append(self.intersections)
+        self.intersections = array.array('I', self.intersections)
+        for view in views:
+            view.release()
+        self.mapped.close()
+        self.mapped = None
+
+    def compile(self, path, source):
+        """Saves the map as compiled file made from given source text"""
+        coordinates = b"".join(
+            COMPILED_COORDINATES.pack(ord(cell), x, y)
+            for cell, (x, y) in self.coordinates.items())
+        tunnels = b"".join(
+            COMPILED_TUNNEL.pack(first_y * self.width + first_x,
+                                 second_y * self.width + second_x)
+            for (first_x, first_y), (second_x, second_y) in self.tunnels)
+        barriers = array.array('I', (y * self.width + x
+                                     for x, y in self.barriers))
+        header = COMPILED_HEADER.pack(
+            COMPILED_MAGIC, COMPILED_VERSION, self.width, self.height,
+            len(source), zlib.crc32(source), self.total_pellets,
+            len(self.intersections), len(self.barriers),
+            len(self.coordinates), len(self.tunnels))
+        # Games may have the old file mapped, so it is replaced, not changed
+        self.close()
+        with open(path + ".tmp", "wb") as file:
+            for section in [header, self.cells, self.exits, self.wall_types,
+                            self.pellets, self.intersections, barriers,
+                            coordinates, tunnels]:
+                section = bytes(section)
+                file.write(section)
+                file.write(bytes(get_padded_size(len(section)) -
+                                 len(section)))
+        os.replace(path + ".tmp", path)
+
+    def build_exits(self):
+        """Returns passability mask for every tile
+
+        Bit number `direction` is set when the neighbour in that direction
+        is neither a wall nor a barrier (tiles outside map are passable).
+        Intersections restricting ghost movement get NO_UP flag."""
+        blocked = {ord(constants.WALL), ord(constants.BARRIER)}
+        restricted = {ord(constants.INTERSECTION), ord(constants.INTERSECTION2)}
+        exits = bytearray(len(self.cells))
+        for y in range(self.height):
+            for x in range(self.width):
+                mask = 0
+                for direction, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+                    if not self.in_bounds(x + dx, y + dy) or \
+                            self.cells[(y + dy) * self.width + x + dx] \
+                            not in blocked:
+                        mask |= 1 << direction
+                if self.cells[y * self.width + x] in restricted:
+                    mask |= NO_UP
+                exits[y * self.width + x] = mask
+        return exits
+
+    def build_pellets(self):
+        """Returns bitmap of pellet tiles, bit per tile in cells order"""
+        pellet_cells = {ord(constants.PELLET),
+                        ord(constants.PELLET2),
+                        ord(constants.POWER_PELLET)}
+        pellets = bytearray((len(self.cells) + 7) // 8)
+        for index, cell in enumerate(self.cells):
+            if cell in pellet_cells:
+                pellets[index >> 3] |= 1 << (index & 7)
+        return pellets
+
+    @functools.cached_property
+    def wall_types(self):
+        """Returns wall type of every tile (NO_WALL for other tiles)
+
+        Wall types of text maps are matched on first use only."""
+        wall = ord(constants.WALL)
+        wall_types = bytearray([NO_WALL]) * len(self.cells)
+        for index, cell in enumerate(self.cells):
+            if cell != wall:
+                continue
+            tile_y, tile_x = divmod(index, self.width)
+            pattern_string = ""
+            for dx, dy in NEIGHBOR_COORDINATES:
+                if self.get_tile(dx + tile_x, dy + tile_y) == constants.WALL:
+                    pattern_string += "1"
+                else:
+                    pattern_string += "0"
+
+            for wall_type, regex in enumerate(WALL_RULES):
+                if regex.match(pattern_string):
+                    wall_types[index] = wall_type
+                    break
+        return wall_types
+
+    @property
+    def tiles(self):
+        """Returns list of all tiles in the map"""
+        return [Tile(x, y, self.get_tile(x, y))
+                for y in range(self.height) for x in range(self.width)]
+
+    def in_bounds(self, x, y):
+        """Checks if given coordinates lie inside the map"""
+        return 0 <= x < self.width and 0 <= y < self.height
 
     def get_tile(self, x, y):
         """Returns type of tile at given coordinates"""
-        if x < 0 or x > self.tiles[-1].x:
+        if x < 0 or x >= self.width:
             return False
-        if y < 0 or y > self.tiles[-1].y:
+        if y < 0 or y >= self.height:
             return False
-        return next(t for t in self.tiles if t.x == x and t.y == y).cell
+        return chr(self.cells[int(y) * self.width + int(x)])
+
+    def get_exits(self, x, y):
+        """Returns passability mask of tile at given coordinates"""
+        if not self.in_bounds(x, y):
+            return 0b1111
+        return self.exits[int(y) * self.width + int(x)] & 0b1111
+
+    def is_passable(self, x, y, direction):
+        """Checks if neighbour of given tile in given direction is passable"""
+        return bool(self.get_exits(x, y) >> direction & 1)
+
+    def get_ghost_exits(self, x, y, direction, dead=False):
+        """Returns directions ghost moving in given direction may take
+
+        Dead ghosts are allowed to turn up at restricted intersections."""
+        mask = self.exits[int(y) * self.width + int(x)] \
+            if self.in_bounds(x, y) else 0b1111
+        if dead:
+            mask &= 0b1111
+        return GHOST_EXITS[mask * 4 + direction]
+
+    def build_distance_table(self, targets):
+        """Returns shortest path lengths from every tile to nearest target
+
+        Breadth first search from target tiles following exit masks,
+        tiles on opposite map edges are connected through the tunnel."""
+        blocked = {ord(constants.WALL), ord(constants.BARRIER)}
+        table = array.array('H', [UNREACHABLE]) * len(self.cells)
+        queue = collections.deque()
+        for tile_x, tile_y in targets:
+            table[tile_y * self.width + tile_x] = 0
+            queue.append((tile_x, tile_y))
+        while queue:
+            tile_x, tile_y = queue.popleft()
+            distance = table[tile_y * self.width + tile_x] + 1
+            exits = self.exits[tile_y * self.width + tile_x]
+            for direction, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+                next_x, next_y = (tile_x + dx) % self.width, tile_y + dy
+                if not exits >> direction & 1 or \
+                        not 0 <= next_y < self.height:
+                    continue
+                index = next_y * self.width + next_x
+                if table[index] == UNREACHABLE and \
+                        self.cells[index] not in blocked:
+                    table[index] = distance
+                    queue.append((next_x, next_y))
+        return table
+
+    def build_ghost_distance_table(self, targets):
+        """Returns shortest path lengths to nearest target for ghosts
+
+        Ghosts can not reverse, so the table is indexed by
+        (y * width + x) * 4 + direction the ghost is moving in. It is
+        filled by breadth first search backwards from target tiles over
+        moves allowed by ghost exits table (as for dead ghosts)."""
+        table = array.array('H', [UNREACHABLE]) * (len(self.cells) * 4)
+        queue = collections.deque()
+        for tile_x, tile_y in targets:
+            for direction in range(4):
+                table[(tile_y * self.width + tile_x) * 4 + direction] = 0
+                queue.append((tile_x, tile_y, direction))
+        while queue:
+            tile_x, tile_y, direction = queue.popleft()
+            distance = table[(tile_y * self.width + tile_x) * 4 +
+                             direction] + 1
+            dx, dy = DIRECTION_OFFSETS[direction]
+            previous_x = (tile_x - dx) % self.width
+            previous_y = tile_y - dy
+            if not 0 <= previous_y < self.height:
+                continue
+            index = previous_y * self.width + previous_x
+            for previous_direction in range(4):
+                if direction in GHOST_EXITS[(self.exits[index] & 0b1111) * 4
+                                            + previous_direction] and \
+                        table[index * 4 + previous_direction] == UNREACHABLE:
+                    table[index * 4 + previous_direction] = distance
+                    queue.append((previous_x, previous_y, previous_direction))
+        return table
+
+    def get_distance_table(self, target_x, target_y, ghost=False):
+        """Returns uint16 distance table to given target
+
+        Target lying between tiles (like barrier entrance) counts as both
+        of them, target off the map (like home corners above it) is moved
+        to the nearest tile on the map. Every table is computed only once."""
+        target_x = min(max(target_x, 0), self.width - 1)
+        target_y = min(max(target_y, 0), self.height - 1)
+        targets = tuple(sorted({
+            (int(math.floor(target_x)), int(math.floor(target_y))),
+            (int(math.ceil(target_x)), int(math.ceil(target_y)))}))
+        table = self.distance_tables.get((targets, ghost))
+        if table is None:
+            build = self.build_ghost_distance_table if ghost \
+                else self.build_distance_table
+            table = self.distance_tables[(targets, ghost)] = build(targets)
+        return table
+
+    def get_distance(self, tile_x, tile_y, target_x, target_y):
+        """Returns length of shortest path from given tile to the target"""
+        if not 0 <= tile_y < self.height:
+            return UNREACHABLE
+        return self.get_distance_table(target_x, target_y)[
+            int(tile_y) * self.width + int(tile_x) % self.width]
+
+    def get_ghost_distance(self, tile_x, tile_y, direction,
+                           target_x, target_y):
+        """Returns length of shortest path to the target for ghost
+        entering given tile in given direction (without reversing)"""
+        if not 0 <= tile_y < self.height:
+            return UNREACHABLE
+        return self.get_distance_table(target_x, target_y, ghost=True)[
+            (int(tile_y) * self.width + int(tile_x) % self.width) * 4 +
+            direction]
 
     def get_coordinates(self, cell):
         """Returns coordinates of first tile of given cell type"""
-        tile = next(t for t in self.tiles if t.cell == cell)
-        return tile.x, tile.y
+        return self.coordinates[cell]
 
     def get_pellets(self):
         """Returns generator of all pellet tiles in the map"""
-        for tile in self.tiles:
-            if tile.cell in [constants.PELLET,
-                             constants.PELLET2,
-                             constants.POWER_PELLET]:
-                yield tile
+        for index, byte in enumerate(self.pellets):
+            while byte:
+                bit = byte & -byte
+                byte ^= bit
+                y, x = divmod(index * 8 + bit.bit_length() - 1, self.width)
+                yield Tile(x, y, chr(self.cells[y * self.width + x]))
 
     def get_barriers(self):
         """Returns generator of all barrier tiles in the map"""
-        for tile in self.tiles:
-            if tile.cell == constants.BARRIER:
-                yield tile.x, tile.y
+        yield from self.barriers
 
     def get_walls(self):
         """Returns generator of all walls in the map"""
-        for tile in [t for t in self.tiles if t.cell == constants.WALL]:
-            pattern_string = ""
-            for dx, dy in NEIGHBOR_COORDINATES:
-                if self.get_tile(dx + tile.x, dy + tile.y) == constants.WALL:
-                    pattern_string += "1"
-                else:
-                    pattern_string += "0"
+        for index, wall_type in enumerate(self.wall_types):
+            if wall_type != NO_WALL:
+                tile_y, tile_x = divmod(index, self.width)
+                yield tile_x, tile_y, wall_type
 
-            for wall_type, regex in enumerate(WALL_RULES):
-                if regex.match(pattern_string):
-                    yield tile.x, tile.y, wall_type
-                    break
+
+def get_compiled_path(map_file):
+    """Returns path of compiled version of given text map"""
+    return os.path.splitext(map_file)[0] + COMPILED_EXTENSION
+
+
+def iter_sections(data, lengths):
+    """Yields views of compiled map sections of given lengths"""
+    offset = get_padded_size(COMPILED_HEADER.size)
+    for length in lengths:
+        yield data[offset:offset + length]
+        offset += get_padded_size(length)
+
+
+def get_compiled_size(lengths):
+    """Returns size of compiled map with sections of given lengths"""
+    return get_padded_size(COMPILED_HEADER.size) + \
+        sum(get_padded_size(length) for length in lengths)
+
+
+def get_padded_size(size):
+    """Returns given section size rounded up to multiple of 4 bytes"""
+    return (size + 3) & ~3
+
+
+def compile_map(map_file):
+    """Compiles given text map, returns path of the compiled file"""
+    with open(map_file, "rb") as file:
+        source = file.read()
+    level_map = Map(map_file, compiled=False)
+    path = get_compiled_path(map_file)
+    level_map.compile(path, source)
+    return path
@@ -1,5 +1,8 @@
 """Map module tests"""
+import os
+import shutil
 import sys
+import tempfile
 import unittest
 import parameterized
 
@@ -35,6 +38,41 @@ class MapTest(unittest.TestCase):
         x, y = input_value
         self.assertEqual(self.map.get_tile(x, y), expected_value)
 
+    @parameterized.parameterized.expand([
+        [(-1, 14), False],
+        [(28, 14), False],
+        [(5, 31), False],
+    ])
+    def test_get_tile_out_of_bounds(self, input_value, expected_value):
+        x, y = input_value
+        self.assertEqual(self.map.get_tile(x, y), expected_value)
+
+    @parameterized.parameterized.expand([
+        [(1, 1), 0b1001],
+        [(6, 5), 0b1111],
+        [(12, 11), 0b0111],
+        [(13, 11), 0b0101],
+        [(0, 14), 0b0101],
+        [(0, 0), 0b0110],
+    ])
+    def test_get_exits(self, input_value, expected_value):
+        x, y = input_value
+        self.assertEqual(self.map.get_exits(x, y), expected_value)
+
+    @parameterized.parameterized.expand([
+        [(6, 5, constants.RIGHT, False), (constants.UP, constants.DOWN,
+                                          constants.RIGHT)],
+        [(6, 5, constants.DOWN, False), (constants.LEFT, constants.DOWN,
+                                         constants.RIGHT)],
+        [(12, 11, constants.LEFT, False), (constants.LEFT,)],
+        [(12, 11, constants.LEFT, True), (constants.UP, constants.LEFT)],
+        [(13, 11, constants.LEFT, True), (constants.LEFT,)],
+        [(0, 14, constants.LEFT, False), (constants.LEFT,)],
+    ])
+    def test_get_ghost_exits(self, input_value, expected_value):
+        self.assertEqual(self.map.get_ghost_exits(*input_value),
+                         expected_value)
+
     @parameterized.parameterized.expand([
         ['s', (13, 23)],
         ['b', (13, 11)],
@@ -71,6 +109,113 @@ class MapTest(unittest.TestCase):
     def test_get_walls(self, expected_value):
         self.assertIn(expected_value, self.map.get_walls())
 
+    @parameterized.parameterized.expand([
+        [(1, 1), 22],
+        [(13, 11), 0],
+        [(14, 11), 0],
+        [(12, 11), 1],
+        [(0, 0), map.UNREACHABLE],
+        [(13, 14), map.UNREACHABLE],
+    ])
+    def test_get_distance(self, input_value, expected_value):
+        self.assertEqual(self.map.get_distance(*input_value, 13.5, 11),
+                         expected_value)
+
+    def test_get_distance_through_tunnel(self):
+        self.assertEqual(self.map.get_distance(0, 14, 27, 14), 1)
+        self.assertIs(self.map.get_distance_table(27, 14),
+                      self.map.get_distance_table(27, 14))
+
+    def test_get_distance_to_target_off_map(self):
+        self.assertIs(self.map.get_distance_table(25, -4),
+                      self.map.get_distance_table(25, 0))
+        self.assertIs(self.map.get_distance_table(30.5, 40, ghost=True),
+                      self.map.get_distance_table(27, 30, ghost=True))
+        self.assertEqual(self.map.get_distance(1, 1, 1, -3), 1)
+        self.assertEqual(self.map.get_ghost_distance(
+            1, 1, constants.UP, -2, -3), map.UNREACHABLE)
+
+    def test_get_ghost_distance(self):
+        self.assertEqual(self.map.get_ghost_distance(
+            12, 11, constants.RIGHT, 13.5, 11), 1)
+        self.assertGreater(self.map.get_ghost_distance(
+            12, 11, constants.LEFT, 13.5, 11), 1)
+
+
+class CompiledMapTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.map_file = os.path.join(self.directory, "gamemap.txt")
+        shutil.copy("gamemap.txt", self.map_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_compiled_path(self):
+        self.assertEqual(map.compile_map(self.map_file),
+                         os.path.join(self.directory, "gamemap.pmap"))
+
+    def test_compiled_map_is_the_same(self):
+        text_map = map.Map(self.map_file)
+        map.compile_map(self.map_file)
+        compiled_map = map.Map(self.map_file)
+        self.assertIsInstance(compiled_map.cells, memoryview)
+        for name in ["width", "height", "total_pellets", "coordinates",
+                     "barriers", "tunnels"]:
+            self.assertEqual(getattr(compiled_map, name),
+                             getattr(text_map, name))
+        for name in ["cells", "exits", "wall_types", "pellets",
+                     "intersections"]:
+            self.assertEqual(bytes(getattr(compiled_map, name)),
+                             bytes(getattr(text_map, name)))
+        self.assertEqual(list(compiled_map.get_pellets()),
+                         list(text_map.get_pellets()))
+        self.assertEqual(list(compiled_map.get_walls()),
+                         list(text_map.get_walls()))
+        self.assertEqual(compiled_map.get_distance(1, 1, 13.5, 11), 22)
+
+    def test_stale_compiled_map(self):
+        map.compile_map(self.map_file)
+        with open(self.map_file, "a", encoding="ascii") as file:
+            file.write("#" * 28 + "\n")
+        level_map = map.Map(self.map_file)
+        self.assertIsInstance(level_map.cells, bytearray)
+        self.assertIsNone(level_map.mapped)
+        self.assertEqual(level_map.height, constants.GAMEMAP_HEIGHT + 1)
+
+    def test_close_compiled_map(self):
+        path = map.compile_map(self.map_file)
+        level_map = map.Map(self.map_file)
+        cells = bytes(level_map.cells)
+        mapped = level_map.mapped
+        level_map.compile(path, b"")
+        self.assertTrue(mapped.closed)
+        self.assertIsNone(level_map.mapped)
+        self.assertIsInstance(level_map.cells, bytearray)
+        self.assertEqual(bytes(level_map.cells), cells)
+        self.assertEqual(level_map.get_distance(1, 1, 13.5, 11), 22)
+        level_map.close()
+
+    def test_invalid_compiled_map(self):
+        with open(map.get_compiled_path(self.map_file), "wb") as file:
+            file.write(b"PMAP")
+        level_map = map.Map(self.map_file)
+        self.assertIsInstance(level_map.cells, bytearray)
+
+    def test_truncated_compiled_map(self):
+        path = map.compile_map(self.map_file)
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) // 2)
+        level_map = map.Map(self.map_file)
+        self.assertIsInstance(level_map.cells, bytearray)
+        self.assertIsNone(level_map.mapped)
+        self.assertEqual(len(list(level_map.get_pellets())), 244)
+        self.assertEqual(level_map.get_coordinates("s"), (13, 23))
+
+    def test_tunnels(self):
+        self.assertEqual(map.Map(self.map_file).tunnels,
+                         [((0, 14), (constants.GAMEMAP_WIDTH - 1, 14))])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
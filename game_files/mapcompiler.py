@@ -0,0 +1,32 @@
+"""Map compiler - saves text maps in binary format loaded with mmap
+
+Compiled file is saved next to the text map (gamemap.txt is compiled to
+gamemap.pmap) and used by the game only while the text map is unchanged."""
+import argparse
+import os
+import time
+
+import constants, map as gamemap
+
+
+def main():
+    """Compiles maps given in command line and prints loading times"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("maps", nargs="*", metavar="MAP",
+                        default=[constants.GAMEMAP_FILE],
+                        help=f"text maps (default: {constants.GAMEMAP_FILE})")
+    args = parser.parse_args()
+
+    for map_file in args.maps:
+        path = gamemap.compile_map(map_file)
+        times = []
+        for compiled in [False, True]:
+            start_time = time.perf_counter()
+            gamemap.Map(map_file, compiled).close()
+            times.append((time.perf_counter() - start_time) * 1000)
+        print(f"{map_file} -> {path} ({os.path.getsize(path)} bytes), "
+              f"load {times[0]:.2f} ms -> {times[1]:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
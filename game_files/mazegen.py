@@ -0,0 +1,150 @@
+"""Maze generator - makes random maps of any size playable by the game
+
+Corridors run along every third row and column, they are carved by
+randomized depth first search and dead ends are opened afterwards, as
+ghosts can not turn back. The ghost base of the original map is placed
+in the middle, with player start below it."""
+import argparse
+import random
+
+import constants, map as gamemap
+
+# Ghost base with corridor around it, copied from the original map
+BASE = [
+    "###xb#x###",
+    "#   ee   #",
+    "# ###### #",
+    "# i#p#c# #",
+    "# ###### #",
+    "#        #",
+    "####f#####",
+]
+BASE_NODES = (3, 2)
+SPACING = 3
+MIN_NODES = 6
+
+
+class Maze:
+    """Grid of corridor nodes and edges between them
+
+    Nodes are SPACING tiles apart, edge joins two neighbouring nodes
+    with a corridor. Nodes inside the ghost base are left out."""
+    def __init__(self, nodes_x, nodes_y, rng):
+        self.nodes_x, self.nodes_y = nodes_x, nodes_y
+        self.rng = rng
+        self.base_x = (nodes_x - BASE_NODES[0]) // 2
+        self.base_y = (nodes_y - 3) // 2
+        self.inside_base = {
+            (x, y) for x in range(self.base_x + 1,
+                                  self.base_x + BASE_NODES[0])
+            for y in range(self.base_y + 1, self.base_y + BASE_NODES[1])}
+        self.start_y = self.base_y + BASE_NODES[1] + 1
+        self.edges = set()
+
+    def neighbours(self, node):
+        """Yields neighbouring nodes outside the base"""
+        x, y = node
+        for dx, dy in gamemap.DIRECTION_OFFSETS:
+            neighbour = (x + dx, y + dy)
+            if 0 <= x + dx < self.nodes_x and 0 <= y + dy < self.nodes_y \
+                    and neighbour not in self.inside_base:
+                yield neighbour
+
+    def carve(self):
+        """Joins all nodes with randomized depth first search"""
+        start = (0, 0)
+        visited = {start} | self.inside_base
+        stack = [start]
+        while stack:
+            node = stack[-1]
+            choices = [neighbour for neighbour in self.neighbours(node)
+                       if neighbour not in visited]
+            if not choices:
+                stack.pop()
+                continue
+            neighbour = self.rng.choice(choices)
+            self.edges.add(frozenset((node, neighbour)))
+            visited.add(neighbour)
+            stack.append(neighbour)
+
+    def add_base_corridors(self):
+        """Adds corridor around the base and the one with player start"""
+        base_x, base_y = self.base_x, self.base_y
+        right, bottom = base_x + BASE_NODES[0], base_y + BASE_NODES[1]
+        for x in range(base_x, right):
+            self.edges.add(frozenset(((x, base_y), (x + 1, base_y))))
+            self.edges.add(frozenset(((x, bottom), (x + 1, bottom))))
+        for y in range(base_y, bottom):
+            self.edges.add(frozenset(((base_x, y), (base_x, y + 1))))
+            self.edges.add(frozenset(((right, y), (right, y + 1))))
+        self.edges.add(frozenset(((base_x + 1, self.start_y),
+                                  (base_x + 2, self.start_y))))
+
+    def braid(self):
+        """Opens dead ends by joining them with a random neighbour"""
+        nodes = {(x, y) for x in range(self.nodes_x)
+                 for y in range(self.nodes_y)} - self.inside_base
+        for node in sorted(nodes):
+            degree = sum(frozenset((node, neighbour)) in self.edges
+                         for neighbour in self.neighbours(node))
+            if degree == 1:
+                choices = [neighbour for neighbour in self.neighbours(node)
+                           if frozenset((node, neighbour)) not in self.edges]
+                self.edges.add(frozenset((node, self.rng.choice(choices))))
+
+    def get_lines(self):
+        """Returns lines of the map with corridors, base and pellets"""
+        cells = [[constants.WALL] * (self.nodes_x * SPACING)
+                 for _ in range(self.nodes_y * SPACING)]
+        for edge in self.edges:
+            (x0, y0), (x1, y1) = sorted(edge)
+            for tile_y in range(y0 * SPACING + 1, y1 * SPACING + 2):
+                for tile_x in range(x0 * SPACING + 1, x1 * SPACING + 2):
+                    cells[tile_y][tile_x] = constants.PELLET
+        for x, y in [(0, 0), (self.nodes_x - 1, 0), (0, self.nodes_y - 1),
+                     (self.nodes_x - 1, self.nodes_y - 1)]:
+            cells[y * SPACING + 1][x * SPACING + 1] = constants.POWER_PELLET
+        left, top = self.base_x * SPACING + 1, self.base_y * SPACING + 1
+        for y, line in enumerate(BASE):
+            cells[top + y][left:left + len(line)] = line
+        cells[self.start_y * SPACING + 1][left + BASE[0].index("b")] = "s"
+        return ["".join(row) for row in cells]
+
+
+def generate(width, height, seed=None):
+    """Returns lines of random map of given size in tiles
+
+    Size is rounded down to fit the corridor grid."""
+    nodes_x, nodes_y = width // SPACING, height // SPACING
+    if min(nodes_x, nodes_y) < MIN_NODES:
+        raise ValueError(f"maze must be at least {MIN_NODES * SPACING} "
+                         f"tiles wide and high")
+    maze = Maze(nodes_x, nodes_y, random.Random(seed))
+    maze.carve()
+    maze.add_base_corridors()
+    maze.braid()
+    return maze.get_lines()
+
+
+def main():
+    """Generates maze from command line, optionally compiles it"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", metavar="PATH", help="text map to write")
+    parser.add_argument("--width", type=int, default=200,
+                        help="map width in tiles")
+    parser.add_argument("--height", type=int, default=200,
+                        help="map height in tiles")
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--compile", action="store_true",
+                        help="compile the map too")
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.write("\n".join(generate(args.width, args.height, args.seed)))
+        file.write("\n")
+    if args.compile:
+        gamemap.compile_map(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Maze generator tests - generated maps are played headless"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import constants, game, mazegen, resources, map as gamemap
+
+
+class MazeGenTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.map_file = os.path.join(self.directory, "maze.txt")
+        with open(self.map_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(mazegen.generate(61, 45, 1)))
+        self.map = gamemap.Map(self.map_file)
+        self.resources = resources.RESOURCES
+
+    def tearDown(self):
+        resources.RESOURCES = self.resources
+        shutil.rmtree(self.directory)
+
+    def test_size(self):
+        self.assertEqual((self.map.width, self.map.height), (60, 45))
+        with self.assertRaises(ValueError):
+            mazegen.generate(15, 100)
+
+    def test_deterministic(self):
+        self.assertEqual(mazegen.generate(61, 45, 1),
+                         mazegen.generate(61, 45, 1))
+        self.assertNotEqual(mazegen.generate(61, 45, 1),
+                            mazegen.generate(61, 45, 2))
+
+    def test_no_dead_ends(self):
+        corridors = {ord(constants.PELLET), ord(constants.POWER_PELLET)}
+        for index, cell in enumerate(self.map.cells):
+            if cell in corridors:
+                exits = self.map.exits[index] & 0b1111
+                self.assertGreaterEqual(bin(exits).count("1"), 2)
+
+    def test_pellets_are_reachable(self):
+        start_x, start_y = self.map.get_coordinates("s")
+        for tile in self.map.get_pellets():
+            self.assertNotEqual(self.map.get_distance(
+                tile.x, tile.y, start_x, start_y), gamemap.UNREACHABLE)
+
+    def test_game_on_generated_map(self):
+        resources.RESOURCES = resources.Resources(self.map_file)
+        game_obj = game.HeadlessGame(0)
+        game_obj.initialize_level(True)
+        self.assertEqual(game_obj.ghosts["inky"].home_corner, (59, 47))
+        self.assertEqual(game_obj.ghosts["blinky"].home_corner, (56, -3))
+        for tick in range(2000):
+            game_obj.press(tick // 100 % 4)
+            game_obj.update()
+        self.assertGreater(game_obj.score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
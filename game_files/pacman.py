@@ -1,26 +1,150 @@
 """Pacman game - application entry-point"""
+import argparse
+import random
 import sys
+import time
 import pygame
 
-import constants, game
+import constants, game, drawhelper, farm, inputs, recorder, replay, \
+    resources, scheduler
 
 
-def delay(time_ms):
-    """Time delay between each frame"""
-    pygame.time.wait(int(time_ms))
+def run_headless(game_obj, max_ticks):
+    """Runs the game without window until game over or tick limit"""
+    game_obj.initialize_level(True)
+
+    start_time = time.perf_counter()
+    steps = 0
+    while not game_obj.finished() and steps < max_ticks:
+        game_obj.step()
+        steps += 1
+    elapsed = time.perf_counter() - start_time
+
+    print(f"level: {game_obj.level} score: {game_obj.score} "
+          f"lives: {game_obj.lives} steps: {steps} "
+          f"({steps / elapsed:.0f} steps/s)")
+
+
+def run_window(game_obj, loop):
+    """Runs the game in window with ticks timed by given scheduler
+
+    While the game waits for a key the loop blocks on input source
+    instead of rendering the same frame again."""
+    game_obj.initialize_level(True)
+
+    while not game_obj.finished():
+        game_obj.profiler.begin()
+        ticks = loop.next_frame()
+        game_obj.profiler.carry("sleep")
+        for _ in range(ticks):
+            game_obj.update()
+            if game_obj.finished():
+                break
+        else:
+            game_obj.render()
+            if game_obj.wait:
+                game_obj.input_source.wait(game_obj)
+                loop.reset()
+
+
+def get_input_source(args):
+    """Returns input source chosen by command line or None for default"""
+    if args.script:
+        return inputs.ScriptedInput(inputs.load_script(args.script))
+    if args.agent:
+        return inputs.AgentInput(
+            farm.get_policy(args.agent)(random.Random(args.seed)))
+    return None
 
 
 def main():
     """Main function of the game"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--headless", action="store_true",
+                        help="run simulation without window and frame delay")
+    parser.add_argument("--ticks", type=int, default=100000,
+                        help="maximum number of steps in headless mode")
+    parser.add_argument("--frame-histogram", metavar="PATH",
+                        help="save frame time histogram (.json or .csv)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="save per-phase tick timings (.json or .csv)")
+    parser.add_argument("--seed", type=int,
+                        help="seed of the game random number generator")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save key presses to replay file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay game saved with --record")
+    parser.add_argument("--script", metavar="PATH",
+                        help="press keys listed in script file "
+                             "(frame and key name per line)")
+    parser.add_argument("--agent", metavar="POLICY",
+                        help=f"let agent play: one of "
+                             f"{', '.join(farm.POLICIES)} "
+                             "or module:Class import path")
+    parser.add_argument("--video", metavar="PATH",
+                        help="record frames to PNG directory or stream file")
+    parser.add_argument("--video-format", choices=recorder.FORMATS,
+                        default="png", help="format of recorded frames")
+    parser.add_argument("--video-drop", choices=recorder.DROP_POLICIES,
+                        default="newest",
+                        help="frame dropped when recorder falls behind")
+    parser.add_argument("--video-buffers", type=int, default=4,
+                        help="number of frames waiting to be written")
+    parser.add_argument("--speed", type=float, default=1,
+                        help="replay speed as multiple of real time")
+    parser.add_argument("--map", default=constants.GAMEMAP_FILE,
+                        help="text map to play (compiled one is used "
+                             "if it is up to date)")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be greater than 0")
+    resources.RESOURCES = resources.Resources(args.map)
+    source = get_input_source(args)
+
+    if args.headless:
+        if args.replay:
+            game_obj = replay.HeadlessReplayGame(*replay.load(args.replay))
+        else:
+            game_obj = game.HeadlessGame(args.seed, source)
+        run_headless(game_obj, args.ticks)
+        if args.record:
+            replay.save(args.record, game_obj)
+        if args.profile:
+            game_obj.profiler.export(args.profile)
+        sys.exit()
+
     pygame.init()
 
-    game_obj = game.Game()
-    game_obj.initialize_level(True)
+    if args.replay:
+        game_obj = replay.ReplayGame(*replay.load(args.replay))
+        loop = scheduler.Scheduler(constants.TICKRATE * args.speed)
+    else:
+        game_obj = game.Game(args.seed, source and inputs.WindowInput(source))
+        loop = scheduler.Scheduler()
+    if args.video:
+        game_obj.recorder = recorder.Recorder(
+            resources.RESOURCES.window, args.video, args.video_format,
+            args.video_buffers, args.video_drop)
+    run_window(game_obj, loop)
 
-    while game_obj.lives > 0:
-        step_ms = game_obj.step()
-        delay(constants.DELAY - step_ms)
+    if args.record:
+        replay.save(args.record, game_obj)
+    if args.frame_histogram:
+        loop.histogram.export(args.frame_histogram)
+    if args.profile:
+        game_obj.profiler.export(args.profile)
 
+    if game_obj.recorder is not None:
+        try:
+            stats = game_obj.recorder.close()
+            print(f"video - captured: {stats['captured']} "
+                  f"dropped: {stats['dropped']} "
+                  f"written: {stats['written']}")
+        except OSError as error:
+            print(f"video - {error}")
+    stats = drawhelper.get_cache_stats()
+    print(f"sprite cache - hits: {stats['hits']} misses: {stats['misses']} "
+          f"size: {stats['size']}")
     pygame.display.quit()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,50 @@
+"""Module containing pellet layer - pellets left on the map indexed by tile"""
+import constants
+
+PELLET_POINTS = {
+    constants.PELLET: 10,
+    constants.PELLET2: 10,
+    constants.POWER_PELLET: 50,
+}
+
+
+def get_pellet_type(cell):
+    """Returns pellet type of given cell (intersection pellets are pellets)"""
+    return constants.PELLET if cell == constants.PELLET2 else cell
+
+
+class Pellets:
+    """Class storing pellets left on the map keyed by their tile"""
+    def __init__(self, tiles):
+        self.cells = {}
+        self.counts = {constants.PELLET: 0, constants.POWER_PELLET: 0}
+        for tile in tiles:
+            self.cells[(tile.x, tile.y)] = tile.cell
+            self.counts[get_pellet_type(tile.cell)] += 1
+
+    def copy(self):
+        """Returns new layer with the same pellets"""
+        pellets = Pellets([])
+        pellets.cells = dict(self.cells)
+        pellets.counts = dict(self.counts)
+        return pellets
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        """Iterates over (x, y, cell) tuples of remaining pellets"""
+        for (tile_x, tile_y), cell in self.cells.items():
+            yield tile_x, tile_y, cell
+
+    def get(self, tile_x, tile_y):
+        """Returns pellet cell at given tile or False if there is none"""
+        return self.cells.get((tile_x, tile_y), False)
+
+    def remove(self, tile_x, tile_y):
+        """Removes the pellet from given tile and returns the value of it"""
+        cell = self.cells.pop((tile_x, tile_y), None)
+        if cell is None:
+            return False
+        self.counts[get_pellet_type(cell)] -= 1
+        return PELLET_POINTS[cell]
@@ -0,0 +1,36 @@
+"""Pellets module tests"""
+import unittest
+
+import constants, map, pellets
+
+
+class PelletsTest(unittest.TestCase):
+    def setUp(self):
+        self.pellets = pellets.Pellets(map.Map("gamemap.txt").get_pellets())
+
+    def test_setup(self):
+        self.assertEqual(len(self.pellets), 244)
+        self.assertEqual(self.pellets.counts[constants.PELLET], 240)
+        self.assertEqual(self.pellets.counts[constants.POWER_PELLET], 4)
+
+    def test_remove(self):
+        self.assertEqual(self.pellets.remove(1, 1), 10)
+        self.assertEqual(self.pellets.remove(1, 1), False)
+        self.assertEqual(self.pellets.remove(26.0, 23.0), 50)
+        self.assertEqual(self.pellets.remove(12, 23), 10)
+        self.assertEqual(self.pellets.remove(0, 0), False)
+        self.assertEqual(len(self.pellets), 241)
+        self.assertEqual(self.pellets.counts[constants.PELLET], 238)
+        self.assertEqual(self.pellets.counts[constants.POWER_PELLET], 3)
+        self.assertNotIn((1, 1, constants.PELLET), list(self.pellets))
+
+    def test_copy(self):
+        copy = self.pellets.copy()
+        copy.remove(1, 1)
+        self.assertEqual(len(copy), 243)
+        self.assertEqual(len(self.pellets), 244)
+        self.assertEqual(self.pellets.counts[constants.PELLET], 240)
+
+
+if __name__ == "__main__":
+    unittest.main()
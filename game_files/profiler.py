@@ -0,0 +1,165 @@
+"""Module containing tick profiler - timings of every phase of recent frames
+
+Timings are kept in a fixed-size ring buffer (one row per frame), so
+profiling costs the same no matter how long the game runs."""
+import array
+import csv
+import json
+import time
+import pygame
+
+import constants, drawhelper, resources
+
+PHASES = [
+    "input", "eat", "player_move", "timers", "collisions",
+    "blinky", "pinky", "inky", "clyde", "scroll",
+    "draw_fruit", "draw_pellets", "draw_characters", "draw_text",
+    "draw_overlay", "display_update", "clear_characters", "sleep",
+]
+PHASE_INDEX = {phase: index for index, phase in enumerate(PHASES)}
+PERCENTILES = [50, 95, 99]
+
+
+def get_percentile(values, percent):
+    """Returns nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Profiler:
+    """Ring buffer of per-phase timings in milliseconds
+
+    Each update starts new row, phases are measured with laps - time
+    since previous lap or begin call is added to the given phase. Time
+    spent before the update (like sleeping) can be carried to its row."""
+    def __init__(self, size=constants.PROFILER_SAMPLES):
+        self.size = size
+        self.samples = array.array('d', bytes(8 * size * len(PHASES)))
+        self.frames = array.array('q', bytes(8 * size))
+        self.levels = array.array('q', bytes(8 * size))
+        self.count = 0
+        self.row = 0
+        self.offset = 0
+        self.carried = array.array('d', bytes(8 * len(PHASES)))
+        self.last_time = time.perf_counter()
+
+    def next_row(self, frame, level):
+        """Starts new row for given frame, overwriting the oldest one
+
+        The row starts with timings carried since the previous row."""
+        self.row = self.count % self.size
+        self.offset = self.row * len(PHASES)
+        self.count += 1
+        self.samples[self.offset:self.offset + len(PHASES)] = self.carried
+        self.carried = array.array('d', bytes(8 * len(PHASES)))
+        self.frames[self.row] = frame
+        self.levels[self.row] = level
+        self.begin()
+
+    def begin(self):
+        """Starts measuring next phase"""
+        self.last_time = time.perf_counter()
+
+    def lap(self, phase):
+        """Adds time since previous lap to given phase of current row"""
+        now = time.perf_counter()
+        self.samples[self.offset + PHASE_INDEX[phase]] += \
+            (now - self.last_time) * 1000
+        self.last_time = now
+
+    def carry(self, phase):
+        """Adds time since previous lap to given phase of the next row"""
+        now = time.perf_counter()
+        self.carried[PHASE_INDEX[phase]] += (now - self.last_time) * 1000
+        self.last_time = now
+
+    def get_rows(self, last=None):
+        """Returns (frame, level, timings) of stored rows, oldest first"""
+        stored = min(self.count, self.size)
+        if last is not None:
+            stored = min(stored, last)
+        rows = []
+        for number in range(self.count - stored, self.count):
+            row = number % self.size
+            offset = row * len(PHASES)
+            rows.append((self.frames[row], self.levels[row],
+                         self.samples[offset:offset + len(PHASES)]))
+        return rows
+
+    def summary(self, last=None):
+        """Returns percentiles and maximum of every phase and of total
+
+        Only given number of last rows is summarized if passed."""
+        rows = self.get_rows(last)
+        columns = [sorted(timings[index] for _, _, timings in rows)
+                   for index in range(len(PHASES))]
+        columns.append(sorted(sum(timings) for _, _, timings in rows))
+        summary = {}
+        for phase, values in zip(PHASES + ["total"], columns):
+            summary[phase] = {f"p{percent}_ms": get_percentile(values, percent)
+                              for percent in PERCENTILES}
+            summary[phase]["max_ms"] = values[-1] if values else 0.0
+        return summary
+
+    def export(self, path):
+        """Saves rows to .csv file or summary with rows to .json file"""
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if path.endswith(".csv"):
+                writer = csv.writer(file)
+                writer.writerow(["frame", "level"] + PHASES)
+                for frame, level, timings in self.get_rows():
+                    writer.writerow([frame, level] + list(timings))
+            else:
+                json.dump({
+                    "summary": self.summary(),
+                    "columns": ["frame", "level"] + PHASES,
+                    "rows": [[frame, level] + list(timings)
+                             for frame, level, timings in self.get_rows()],
+                }, file, indent=2)
+
+
+class Overlay:
+    """Table of recent phase timings drawn over the map
+
+    The table is rendered again only every few frames, in between the
+    same surface is blitted."""
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.font = drawhelper.get_font(constants.PROFILER_FONT_SIZE)
+        self.surface = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.frame = 0
+
+    def render(self):
+        """Renders table of p50 and p99 of last frames of every phase"""
+        summary = self.profiler.summary(constants.PROFILER_OVERLAY_FRAMES)
+        lines = ["phase             p50 ms  p99 ms"]
+        for phase, values in summary.items():
+            lines.append(f"{phase:16} {values['p50_ms']:7.2f} "
+                         f"{values['p99_ms']:7.2f}")
+        images = [self.font.render(line, True, constants.TEXT_COLOR)
+                  for line in lines]
+        line_height = self.font.get_linesize()
+        self.surface = pygame.Surface(
+            (max(image.get_width() for image in images),
+             line_height * len(images))).convert()
+        self.surface.fill(constants.BACKGROUND_COLOR)
+        for index, image in enumerate(images):
+            self.surface.blit(image, (0, index * line_height))
+
+    def draw(self):
+        """Draws the table and returns drawn rectangle"""
+        if self.frame % constants.PROFILER_OVERLAY_REFRESH == 0:
+            self.render()
+        self.frame += 1
+        self.rect = resources.RESOURCES.window.blit(
+            self.surface, (constants.TILE_SIZE, constants.TILE_SIZE))
+        return self.rect
+
+    def clear(self):
+        """Restores walls under the table and returns cleared rectangle"""
+        self.frame = 0
+        return resources.RESOURCES.walls.draw(resources.RESOURCES.window,
+                                              self.rect,
+                                              resources.RESOURCES.viewport)
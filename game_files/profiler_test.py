@@ -0,0 +1,72 @@
+"""Profiler module tests - ring buffer and summaries"""
+import csv
+import os
+import tempfile
+import unittest
+
+import game, profiler
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.profiler = profiler.Profiler(size=4)
+
+    def add_row(self, frame, **timings):
+        self.profiler.next_row(frame, 1)
+        for phase, value in timings.items():
+            offset = self.profiler.offset + profiler.PHASE_INDEX[phase]
+            self.profiler.samples[offset] = value
+
+    def test_ring_buffer_keeps_last_rows(self):
+        for frame in range(6):
+            self.add_row(frame, eat=frame)
+        rows = self.profiler.get_rows()
+        self.assertEqual([frame for frame, _, _ in rows], [2, 3, 4, 5])
+        self.assertEqual(rows[0][2][profiler.PHASE_INDEX["eat"]], 2)
+        self.assertEqual(len(self.profiler.get_rows(last=2)), 2)
+
+    def test_summary(self):
+        for frame, value in enumerate([1, 2, 3, 10]):
+            self.add_row(frame, blinky=value, sleep=1)
+        summary = self.profiler.summary()
+        self.assertEqual(summary["blinky"]["p50_ms"], 3)
+        self.assertEqual(summary["blinky"]["p99_ms"], 10)
+        self.assertEqual(summary["total"]["max_ms"], 11)
+        self.assertEqual(summary["input"]["max_ms"], 0)
+
+    def test_carried_phase_is_added_to_next_row(self):
+        self.add_row(0, input=1)
+        self.profiler.carry("sleep")
+        self.profiler.carried[profiler.PHASE_INDEX["sleep"]] = 5
+        self.profiler.next_row(1, 1)
+        self.profiler.next_row(2, 1)
+        rows = self.profiler.get_rows()
+        sleep = profiler.PHASE_INDEX["sleep"]
+        self.assertEqual([timings[sleep] for _, _, timings in rows],
+                         [0, 5, 0])
+
+    def test_export_csv(self):
+        self.add_row(7, input=0.5)
+        file, path = tempfile.mkstemp(suffix=".csv")
+        os.close(file)
+        try:
+            self.profiler.export(path)
+            with open(path, newline="", encoding="utf-8") as file:
+                rows = list(csv.reader(file))
+        finally:
+            os.remove(path)
+        self.assertEqual(rows[0][:3], ["frame", "level", "input"])
+        self.assertEqual(rows[1][:3], ["7", "1", "0.5"])
+
+    def test_game_update_is_profiled(self):
+        game_obj = game.HeadlessGame(0)
+        game_obj.initialize_level(True)
+        for _ in range(10):
+            game_obj.update()
+        rows = game_obj.profiler.get_rows()
+        self.assertEqual(len(rows), 10)
+        self.assertGreater(rows[-1][2][profiler.PHASE_INDEX["blinky"]], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,305 @@
+"""Module with frame recorder - presented frames written by worker process
+
+Recorder copies the window into one of few reusable buffers in shared
+memory and queues it, a worker process with low priority encodes and
+writes queued frames. When no buffer is free the drop policy decides
+which frame is lost, so the game loop never waits for the encoder
+(unless policy is "block").
+
+Streams are a header (magic, version, format, width, height) followed
+by (frame, size) entries with raw or zlib compressed RGB rows."""
+import collections
+import multiprocessing
+import os
+import struct
+import threading
+import zlib
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+
+MAGIC = b"PMVR"
+VERSION = 1
+FORMATS = ["png", "raw", "zlib"]
+DROP_POLICIES = ["newest", "oldest", "block"]
+HEADER = struct.Struct("<4sBBHH")
+ENTRY = struct.Struct("<II")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+COMPRESSION_LEVEL = 1
+# Buffer copies the whole window after this many dirty regions
+MAX_DIRTY_RECTS = 64
+# Frames sent to the worker at once, others wait and may be dropped
+MAX_IN_FLIGHT = 2
+# Niceness of the worker process - it gets only CPU time the game leaves
+WORKER_NICENESS = 19
+
+
+def encode_png(rows, width, height):
+    """Returns PNG file of RGB rows prefixed with filter byte"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + \
+            struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return PNG_SIGNATURE + chunk(b"IHDR", header) + \
+        chunk(b"IDAT", zlib.compress(rows, COMPRESSION_LEVEL)) + \
+        chunk(b"IEND", b"")
+
+
+def get_png_rows(width, height):
+    """Returns PNG rows buffer and (height, width, 3) view of its pixels"""
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    return rows, rows[:, 1:].reshape(height, width, 3)
+
+
+def save_screenshot(surface, path):
+    """Saves copy of the surface as PNG file in background thread"""
+    width, height = surface.get_size()
+    rows, pixels = get_png_rows(width, height)
+    pixels[...] = pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+    def write():
+        with open(path, "wb") as file:
+            file.write(encode_png(rows, width, height))
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+
+def read_stream(path):
+    """Yields (frame, pixels) of raw or zlib stream as (height, width, 3)"""
+    with open(path, "rb") as file:
+        magic, version, compressed, width, height = \
+            HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a video stream")
+        while entry := file.read(ENTRY.size):
+            frame, size = ENTRY.unpack(entry)
+            data = file.read(size)
+            if compressed:
+                data = zlib.decompress(data)
+            yield frame, np.frombuffer(data, np.uint8).reshape(height,
+                                                               width, 3)
+
+
+def get_frames(connection, buffers, shifts, pixels):
+    """Yields (number, frame) of queued frames converted to RGB pixels
+
+    Buffer is given back to the recorder once the frame is written."""
+    channel = np.zeros(pixels.shape[:2], np.uint32)
+    while (task := connection.recv()) is not None:
+        number, frame, index = task
+        for position, shift in enumerate(shifts):
+            np.right_shift(buffers[index], shift, out=channel)
+            np.copyto(pixels[..., position], channel, casting="unsafe")
+        yield number, frame
+        connection.send(("done", index))
+
+
+def write_frames(connection, memory_name, path, video_format, width,
+                 height, count, shifts):
+    """Worker process - encodes and writes frames until None is received
+
+    Buffers hold 32 bit pixels, shifts give position of red, green and
+    blue bytes. ("done", buffer index) is sent for every written frame.
+    After failed write ("error", written frames, message) is sent and
+    next frames are ignored. The last message is ("closed", written
+    frames)."""
+    try:
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (AttributeError, OSError):
+        try:
+            os.nice(WORKER_NICENESS)
+        except (AttributeError, OSError):
+            pass
+    memory = shared_memory.SharedMemory(memory_name)
+    buffers = get_buffers(memory, width, height, count)
+    rows, row_pixels = get_png_rows(width, height)
+    pixels = row_pixels if video_format == "png" else \
+        np.zeros((height, width, 3), np.uint8)
+    frames = get_frames(connection, buffers, shifts, pixels)
+    written = 0
+    try:
+        if video_format == "png":
+            os.makedirs(path, exist_ok=True)
+            for number, _ in frames:
+                with open(os.path.join(path, f"{number:06}.png"),
+                          "wb") as png_file:
+                    png_file.write(encode_png(rows, width, height))
+                written += 1
+        else:
+            with open(path, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION,
+                                       video_format == "zlib",
+                                       width, height))
+                for _, frame in frames:
+                    data = memoryview(pixels).cast("B")
+                    if video_format == "zlib":
+                        data = zlib.compress(data, COMPRESSION_LEVEL)
+                    file.write(ENTRY.pack(frame, len(data)))
+                    file.write(data)
+                    written += 1
+    except OSError as error:
+        connection.send(("error", written, str(error)))
+        while connection.recv() is not None:
+            pass
+    finally:
+        frames.close()
+        del frames, buffers
+        memory.close()
+    connection.send(("closed", written))
+
+
+def get_buffers(memory, width, height, count):
+    """Returns (height, width) 32 bit frame buffers in shared memory"""
+    size = width * height * 4
+    return [np.ndarray((height, width), np.uint32, memory.buf, index * size)
+            for index in range(count)]
+
+
+class Recorder:
+    """Records frames of given surface to PNG files or stream file
+
+    PNG files in the path directory are numbered in capture order (gaps
+    are dropped frames), stream entries keep frame number of the game.
+    Buffers keep 32 bit pixels of the surface as they are, so copying a
+    frame is plain memory copy and the worker converts it to RGB. Each
+    buffer remembers regions changed since it was filled, so only those
+    are copied when it is used again."""
+    def __init__(self, surface, path, video_format="png", buffers=4,
+                 drop="newest"):
+        if video_format not in FORMATS:
+            raise ValueError(f"unknown format {video_format}")
+        if drop not in DROP_POLICIES:
+            raise ValueError(f"unknown drop policy {drop}")
+        if surface.get_bytesize() != 4:
+            raise ValueError("only 32 bit surfaces can be recorded")
+        self.surface = surface
+        self.drop = drop
+        self.width, self.height = surface.get_size()
+        count = max(MAX_IN_FLIGHT + 1, buffers)
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=count * self.width * self.height * 4)
+        self.buffers = get_buffers(self.memory, self.width, self.height,
+                                   count)
+        self.dirty = [None] * count
+        self.free = collections.deque(range(count))
+        self.pending = collections.deque()
+        self.in_flight = 0
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self.closed = False
+
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        context = multiprocessing.get_context("spawn")
+        self.connection, worker_connection = context.Pipe()
+        self.worker = context.Process(
+            target=write_frames, daemon=True,
+            args=(worker_connection, self.memory.name, path, video_format,
+                  self.width, self.height, count, surface.get_shifts()[:3]))
+        self.worker.start()
+
+    def receive(self):
+        """Handles next message of the worker - frees written buffer
+
+        After failed write the worker ignores next frames, so those
+        waiting or being written are dropped."""
+        try:
+            message = self.connection.recv()
+        except (EOFError, OSError) as error:
+            message = ("error", self.written, f"worker stopped ({error})")
+            self.closed = True
+        if message[0] == "done":
+            self.free.append(message[1])
+            self.in_flight -= 1
+            self.written += 1
+            return
+        if message[0] == "error" and self.error is None:
+            self.error = message[2]
+            self.dropped += self.in_flight + len(self.pending)
+            self.in_flight = 0
+            self.pending.clear()
+        self.written = message[1]
+        if message[0] == "closed":
+            self.closed = True
+
+    def send(self):
+        """Sends waiting frames to the worker while it has room for them"""
+        while not self.closed and self.connection.poll():
+            self.receive()
+        while self.error is None and self.pending and \
+                self.in_flight < MAX_IN_FLIGHT:
+            self.connection.send(self.pending.popleft())
+            self.in_flight += 1
+
+    def get_buffer(self):
+        """Returns index of buffer to fill or None to drop the frame"""
+        self.send()
+        if not self.free and self.error is None:
+            if self.drop == "oldest" and self.pending:
+                self.dropped += 1
+                return self.pending.popleft()[2]
+            while self.drop == "block" and not self.free and \
+                    self.error is None:
+                self.receive()
+        if not self.free or self.error is not None:
+            self.dropped += 1
+            return None
+        return self.free.popleft()
+
+    def capture(self, frame, dirty_rects):
+        """Queues copy of the surface, dirty rects changed since last one"""
+        surface_rect = self.surface.get_rect()
+        rects = [rect.clip(surface_rect) for rect in dirty_rects]
+        for index, buffer_rects in enumerate(self.dirty):
+            if buffer_rects is not None:
+                buffer_rects.extend(rects)
+                if len(buffer_rects) > MAX_DIRTY_RECTS:
+                    self.dirty[index] = None
+        self.captured += 1
+
+        index = self.get_buffer()
+        if index is None:
+            return
+        buffer = self.buffers[index]
+        pixels = pygame.surfarray.pixels2d(self.surface).T
+        if self.dirty[index] is None:
+            buffer[...] = pixels
+        else:
+            for rect in self.dirty[index]:
+                buffer[rect.top:rect.bottom, rect.left:rect.right] = \
+                    pixels[rect.top:rect.bottom, rect.left:rect.right]
+        del pixels
+        self.dirty[index] = []
+        self.pending.append((self.captured, frame, index))
+        self.send()
+
+    def close(self):
+        """Writes waiting frames, stops the worker and returns counters
+
+        Shared memory is released even if the worker failed. Raises
+        OSError if the worker could not write the frames."""
+        try:
+            while self.error is None and (self.pending or self.in_flight):
+                if self.pending and self.in_flight < MAX_IN_FLIGHT:
+                    self.send()
+                else:
+                    self.receive()
+            if not self.closed:
+                try:
+                    self.connection.send(None)
+                except OSError:
+                    pass
+            while not self.closed:
+                self.receive()
+            self.worker.join()
+        finally:
+            self.connection.close()
+            del self.buffers
+            self.memory.close()
+            self.memory.unlink()
+        if self.error is not None:
+            raise OSError(f"video not recorded: {self.error}")
+        return {"captured": self.captured, "dropped": self.dropped,
+                "written": self.written}
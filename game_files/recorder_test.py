@@ -0,0 +1,102 @@
+"""Recorder module tests - frames of offscreen surface written by worker"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pygame
+
+import recorder
+
+
+class RecorderTest(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        self.surface = pygame.Surface((40, 30)).convert()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_pixels(self):
+        return pygame.surfarray.array3d(self.surface).transpose(1, 0, 2)
+
+    def record(self, video_format):
+        """Records frames changing only dirty rects of the surface
+
+        There are more frames than buffers, so buffers are reused.
+        Returns path and expected (frame, pixels) entries."""
+        path = os.path.join(self.directory, "video")
+        video = recorder.Recorder(self.surface, path, video_format,
+                                  buffers=3, drop="block")
+        self.surface.fill((10, 20, 30))
+        video.capture(5, [self.surface.get_rect()])
+        expected = [(5, self.get_pixels())]
+        for frame in range(6, 12):
+            rect = pygame.Rect(frame * 3, frame * 2 - 10, 8, 6)
+            self.surface.fill((frame * 20, 200, frame), rect)
+            video.capture(frame, [rect])
+            expected.append((frame, self.get_pixels()))
+        self.assertEqual(video.close(), {"captured": 7, "dropped": 0,
+                                         "written": 7})
+        return path, expected
+
+    def test_streams(self):
+        for video_format in ["raw", "zlib"]:
+            path, expected = self.record(video_format)
+            frames = list(recorder.read_stream(path))
+            self.assertEqual([frame for frame, _ in frames],
+                             list(range(5, 12)))
+            for (_, pixels), (_, expected_pixels) in zip(frames, expected):
+                np.testing.assert_array_equal(pixels, expected_pixels)
+
+    def test_png_files(self):
+        path, expected = self.record("png")
+        self.assertEqual(sorted(os.listdir(path)),
+                         [f"{number:06}.png" for number in range(1, 8)])
+        image = pygame.image.load(os.path.join(path, "000007.png"))
+        np.testing.assert_array_equal(
+            pygame.surfarray.array3d(image).transpose(1, 0, 2),
+            expected[-1][1])
+
+    def test_drop_policies(self):
+        for drop in ["newest", "oldest"]:
+            path = os.path.join(self.directory, drop)
+            video = recorder.Recorder(self.surface, path, "raw", drop=drop)
+            video.free.clear()
+            video.capture(1, [])
+            self.assertEqual(video.dropped, 1)
+            self.assertEqual(video.close()["written"], 0)
+
+    def test_write_failure(self):
+        path = os.path.join(self.directory, "missing", "video.raw")
+        for drop in recorder.DROP_POLICIES:
+            video = recorder.Recorder(self.surface, path, "raw", buffers=3,
+                                      drop=drop)
+            for frame in range(10):
+                video.capture(frame, [self.surface.get_rect()])
+            with self.assertRaises(OSError):
+                video.close()
+            self.assertEqual(video.written, 0)
+            self.assertEqual(video.captured, video.dropped)
+            self.assertFalse(video.worker.is_alive())
+
+    def test_screenshot(self):
+        self.surface.fill((1, 2, 3))
+        path = os.path.join(self.directory, "screenshot.png")
+        recorder.save_screenshot(self.surface, path).join()
+        image = pygame.image.load(path)
+        self.assertEqual(tuple(image.get_at((39, 29)))[:3], (1, 2, 3))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            recorder.Recorder(self.surface, self.directory, "gif")
+        with self.assertRaises(ValueError):
+            recorder.Recorder(self.surface, self.directory, drop="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
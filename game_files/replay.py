@@ -0,0 +1,92 @@
+"""Module with input log files and games replaying them
+
+Log file is a header (magic, version, seed, frame count) followed by
+one (frame, key) entry per key press. Key is a direction or ANY_KEY,
+with IN_UPDATE flag set for keys read during update of that frame."""
+import struct
+
+import game, inputs
+
+MAGIC = b"PMRL"
+VERSION = 1
+ANY_KEY = 4
+IN_UPDATE = 0x80
+HEADER = struct.Struct("<4sBQI")
+ENTRY = struct.Struct("<IB")
+
+
+def save(path, game_obj):
+    """Saves seed and key presses of given game to the log file"""
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, game_obj.seed, game_obj.frame))
+        for frame, direction, in_update in game_obj.inputs:
+            key = ANY_KEY if direction is None else direction
+            file.write(ENTRY.pack(frame, key | IN_UPDATE if in_update else key))
+
+
+def load(path):
+    """Returns seed, frame count and key presses read from the log file"""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, seed, frames = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a replay file")
+    presses = []
+    for frame, key in ENTRY.iter_unpack(data[HEADER.size:]):
+        direction = key & ~IN_UPDATE
+        presses.append((frame, None if direction == ANY_KEY else direction,
+                        bool(key & IN_UPDATE)))
+    return seed, frames, presses
+
+
+class Replay(game.Game):
+    """Game fed with recorded key presses instead of input
+
+    Keys are pressed at the same frame and at the same point of update
+    as they were originally, so the run is rebuilt exactly. Combined
+    with other game classes (e.g. headless one) by inheritance."""
+    def __init__(self, seed, frames, presses):
+        super().__init__(seed)
+        self.frames = frames
+        self.recorded_inputs = presses
+        self.input_index = 0
+
+    def finished(self):
+        """Checks if all recorded frames were replayed"""
+        return self.frame >= self.frames or super().finished()
+
+    def press_recorded(self, in_update):
+        """Presses recorded keys due in current frame"""
+        while self.input_index < len(self.recorded_inputs):
+            frame, direction, key_in_update = \
+                self.recorded_inputs[self.input_index]
+            if frame > self.frame or key_in_update and not in_update:
+                return
+            self.input_index += 1
+            self.press(direction)
+
+    def update(self):
+        """Presses keys recorded before update and advances the game"""
+        self.press_recorded(False)
+        super().update()
+
+    def handle_input(self):
+        """Presses keys recorded during update instead of input source"""
+        self.press_recorded(True)
+
+    def wait_for_key(self):
+        """Does not wait - keys ending the wait are recorded as well"""
+
+
+class ReplayGame(Replay):
+    """Replay shown in game window - keys of the player are ignored"""
+    def create_input_source(self):
+        return inputs.WindowInput()
+
+    def handle_input(self):
+        self.input_source.poll(self)
+        super().handle_input()
+
+
+class HeadlessReplayGame(Replay, game.HeadlessGame):
+    """Replay simulated without window at maximum speed"""
@@ -0,0 +1,94 @@
+"""Replay module tests - recorded headless games replayed from file"""
+import os
+import random
+import tempfile
+import unittest
+
+import constants, game, farm, replay
+
+
+class KeyboardGame(game.HeadlessGame):
+    """Headless game reading random keys during update like Game does"""
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.keys = random.Random(seed)
+
+    def handle_input(self):
+        if self.wait or self.keys.random() < 0.05:
+            self.press(self.keys.choice([None, constants.RIGHT,
+                                         constants.UP, constants.LEFT,
+                                         constants.DOWN]))
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        file, self.path = tempfile.mkstemp()
+        os.close(file)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def replay(self, original):
+        replay.save(self.path, original)
+        game_obj = replay.HeadlessReplayGame(*replay.load(self.path))
+        game_obj.initialize_level(True)
+        while not game_obj.finished():
+            game_obj.update()
+        for attribute in ["frame", "tick", "score", "level", "lives",
+                          "inputs"]:
+            self.assertEqual(getattr(game_obj, attribute),
+                             getattr(original, attribute))
+        self.assertEqual(len(game_obj.pellets), len(original.pellets))
+        self.assertEqual((game_obj.player.x, game_obj.player.y),
+                         (original.player.x, original.player.y))
+
+    def test_same_seed_same_game(self):
+        games = [game.HeadlessGame(3), game.HeadlessGame(3)]
+        for game_obj in games:
+            game_obj.initialize_level(True)
+            game_obj.press(constants.LEFT)
+            for _ in range(2000):
+                game_obj.update()
+        self.assertEqual(games[0].score, games[1].score)
+        self.assertEqual(games[0].lives, games[1].lives)
+        self.assertEqual(
+            [(g.x, g.y) for g in games[0].ghosts.values()],
+            [(g.x, g.y) for g in games[1].ghosts.values()])
+
+    def test_replay_keys_pressed_between_updates(self):
+        original = game.HeadlessGame(11)
+        original.initialize_level(True)
+        policy = farm.GreedyPolicy(random.Random(11))
+        while not original.finished() and original.frame < 5000:
+            direction = policy.choose(original)
+            if direction is not None:
+                original.press(direction)
+            original.update()
+        self.replay(original)
+
+    def test_replay_keys_pressed_during_update(self):
+        original = KeyboardGame(5)
+        original.initialize_level(True)
+        while not original.finished():
+            original.update()
+        self.replay(original)
+
+    def test_file_size(self):
+        original = game.HeadlessGame(1)
+        original.initialize_level(True)
+        for direction in [constants.LEFT, constants.UP, constants.DOWN]:
+            original.press(direction)
+            original.update()
+        replay.save(self.path, original)
+        self.assertEqual(os.path.getsize(self.path),
+                         replay.HEADER.size + 3 * replay.ENTRY.size)
+
+    def test_load_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"\0" * replay.HEADER.size)
+        with self.assertRaises(ValueError):
+            replay.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
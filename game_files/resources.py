@@ -0,0 +1,51 @@
+"""Module with resources shared by games - created lazily on first use
+
+Drawing modules and characters get the window and the map from here
+instead of Game class, so none of them has to import game module."""
+import functools
+import pygame
+
+import constants, viewport, map as gamemap
+
+
+class Resources:
+    """Context holding map, window, viewport, sprites, wall layer and HUD
+
+    The map is loaded on first access. Window, viewport and sprite sheet
+    are created by open_window, wall layer and HUD are set by the game."""
+    def __init__(self, map_file=constants.GAMEMAP_FILE):
+        self.map_file = map_file
+        self.window = None
+        self.viewport = None
+        self.sprite_sheet = None
+        self.walls = None
+        self.hud = None
+
+    @functools.cached_property
+    def map(self):
+        """Returns the map - read from file only once"""
+        return gamemap.Map(self.map_file)
+
+    def open_window(self, offscreen=False):
+        """Creates window and loads sprite sheet, returns if it was needed
+
+        Offscreen window is a plain surface - display mode is set only to
+        1x1 pixel, so surfaces can be converted to its pixel format."""
+        if self.window is not None:
+            return False
+        self.viewport = viewport.Viewport(self.map.width_px,
+                                          self.map.height_px)
+        size = (self.viewport.width,
+                self.viewport.height + constants.HUD_HEIGHT)
+        if offscreen:
+            pygame.display.set_mode((1, 1))
+            self.window = pygame.Surface(size).convert()
+        else:
+            self.window = pygame.display.set_mode(size)
+            pygame.display.set_caption("Pacman")
+        self.sprite_sheet = pygame.image.load(
+            constants.SPRITE_SHEET).convert()
+        return True
+
+
+RESOURCES = Resources()
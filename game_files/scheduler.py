@@ -0,0 +1,109 @@
+"""Module containing fixed timestep loop scheduler and frame time histogram"""
+import csv
+import json
+import time
+
+import constants
+
+
+class FrameHistogram:
+    """Histogram of frame times with 1 ms wide buckets
+
+    The last bucket collects all frames longer than the maximum"""
+    def __init__(self, max_ms=constants.FRAME_HISTOGRAM_MAX_MS):
+        self.buckets = [0] * (max_ms + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_frame_ms = 0.0
+
+    def add(self, frame_ms):
+        """Adds frame time in milliseconds to the histogram"""
+        self.buckets[min(int(frame_ms), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.total_ms += frame_ms
+        self.max_frame_ms = max(self.max_frame_ms, frame_ms)
+
+    def percentile(self, percent):
+        """Returns upper bound (in ms) of bucket containing given percentile"""
+        threshold = self.count * percent / 100
+        seen = 0
+        for bucket_ms, frames in enumerate(self.buckets):
+            seen += frames
+            if frames and seen >= threshold:
+                return bucket_ms + 1
+        return 0
+
+    def to_dict(self):
+        """Returns histogram with summary as dictionary"""
+        return {
+            "frames": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0,
+            "max_ms": self.max_frame_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {bucket_ms: frames for bucket_ms, frames
+                        in enumerate(self.buckets) if frames},
+        }
+
+    def export(self, path):
+        """Saves histogram to .csv (bucket per row) or .json file"""
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if path.endswith(".csv"):
+                writer = csv.writer(file)
+                writer.writerow(["frame_ms", "frames"])
+                writer.writerows(enumerate(self.buckets))
+            else:
+                json.dump(self.to_dict(), file, indent=2)
+
+
+class Scheduler:
+    """Fixed timestep scheduler driven by monotonic clock
+
+    Real time is accumulated and consumed in whole ticks, so game speed
+    does not depend on how long simulation and rendering take."""
+    def __init__(self, tickrate=constants.TICKRATE,
+                 max_catch_up=constants.MAX_CATCH_UP_TICKS):
+        self.tick_time = 1 / tickrate
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0
+        self.last_time = None
+        self.frame_start = None
+        self.dropped_ticks = 0
+        self.histogram = FrameHistogram()
+
+    def reset(self):
+        """Forgets time passed so far - used after the game was idle"""
+        self.accumulator = 0.0
+        self.last_time = None
+        self.frame_start = None
+
+    def advance_clock(self):
+        """Adds time passed since last call to the accumulator"""
+        now = time.perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        return now
+
+    def next_frame(self):
+        """Waits until at least one tick is due and returns number of ticks
+
+        Ticks above the catch-up limit are dropped to avoid spiralling
+        when the machine can not keep up."""
+        if self.last_time is None:
+            self.last_time = time.perf_counter() - self.tick_time
+        now = self.advance_clock()
+        while self.accumulator < self.tick_time:
+            time.sleep(self.tick_time - self.accumulator)
+            now = self.advance_clock()
+
+        if self.frame_start is not None:
+            self.histogram.add((now - self.frame_start) * 1000)
+        self.frame_start = now
+
+        ticks = int(self.accumulator / self.tick_time)
+        self.accumulator -= ticks * self.tick_time
+        if ticks > self.max_catch_up:
+            self.dropped_ticks += ticks - self.max_catch_up
+            ticks = self.max_catch_up
+        return ticks
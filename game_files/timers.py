@@ -0,0 +1,59 @@
+"""Module with timers - named game events due at given tick
+
+Events are kept in a dictionary keyed by their tick, so advancing takes
+the same time no matter how many events are pending or how far ahead
+they are. Keys are usually game ticks, but any growing count works
+(e.g. number of eaten pellets)."""
+
+
+class Timers:
+    """Named events fired once their tick is reached
+
+    Scheduling a name again replaces its pending event. Events scheduled
+    for a tick which was already fired are due on the next advance."""
+    def __init__(self, tick=0):
+        self.tick = tick
+        self.due = {}
+        self.ticks = {}
+
+    def reset(self, tick=0):
+        """Drops all events, next advance starts with given tick"""
+        self.tick = tick
+        self.due.clear()
+        self.ticks.clear()
+
+    def schedule(self, name, tick, callback):
+        """Calls callback (without arguments) when the tick is reached"""
+        self.cancel(name)
+        tick = max(tick, self.tick)
+        self.ticks[name] = tick
+        self.due.setdefault(tick, {})[name] = callback
+
+    def cancel(self, name):
+        """Drops pending event of given name if there is one"""
+        tick = self.ticks.pop(name, None)
+        if tick is not None:
+            events = self.due[tick]
+            del events[name]
+            if not events:
+                del self.due[tick]
+
+    def get_tick(self, name):
+        """Returns tick of pending event or None"""
+        return self.ticks.get(name)
+
+    def get_pending(self):
+        """Returns sorted (tick, name) pairs of pending events"""
+        return sorted((tick, name) for name, tick in self.ticks.items())
+
+    def advance(self, tick):
+        """Fires events due up to the tick in order they were scheduled
+
+        Events scheduled by callbacks for the tick being fired are
+        fired as well."""
+        while self.tick <= tick:
+            while events := self.due.get(self.tick):
+                name, callback = next(iter(events.items()))
+                self.cancel(name)
+                callback()
+            self.tick += 1
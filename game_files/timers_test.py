@@ -0,0 +1,100 @@
+"""Timers module tests - events and timed mechanics of headless game"""
+import unittest
+
+import constants, game, timers
+
+
+class TimersTest(unittest.TestCase):
+    def setUp(self):
+        self.timers = timers.Timers()
+        self.fired = []
+
+    def schedule(self, name, tick):
+        self.timers.schedule(name, tick, lambda: self.fired.append(name))
+
+    def test_events_fire_at_their_tick(self):
+        self.schedule("b", 3)
+        self.schedule("a", 1)
+        self.schedule("c", 3)
+        self.assertEqual(self.timers.get_pending(),
+                         [(1, "a"), (3, "b"), (3, "c")])
+        self.timers.advance(2)
+        self.assertEqual(self.fired, ["a"])
+        self.timers.advance(3)
+        self.assertEqual(self.fired, ["a", "b", "c"])
+        self.assertEqual(self.timers.get_pending(), [])
+
+    def test_cancel_and_replace(self):
+        self.schedule("a", 1)
+        self.schedule("b", 1)
+        self.schedule("a", 2)
+        self.timers.cancel("b")
+        self.timers.cancel("missing")
+        self.assertEqual(self.timers.get_tick("a"), 2)
+        self.assertIsNone(self.timers.get_tick("b"))
+        self.timers.advance(2)
+        self.assertEqual(self.fired, ["a"])
+
+    def test_callback_schedules_same_tick(self):
+        self.timers.schedule("a", 1, lambda: self.schedule("b", 1))
+        self.timers.advance(1)
+        self.assertEqual(self.fired, ["b"])
+
+    def test_past_tick_is_due_next(self):
+        self.timers.advance(5)
+        self.schedule("a", 2)
+        self.assertEqual(self.timers.get_tick("a"), 6)
+        self.timers.advance(6)
+        self.assertEqual(self.fired, ["a"])
+
+    def test_reset(self):
+        self.schedule("a", 1)
+        self.timers.reset(10)
+        self.timers.advance(20)
+        self.assertEqual(self.fired, [])
+        self.assertEqual(self.timers.tick, 21)
+
+
+class GameTimersTest(unittest.TestCase):
+    def setUp(self):
+        self.game = game.HeadlessGame()
+        self.game.initialize_level(True)
+        self.game.step()
+
+    def test_mode_changes(self):
+        profile = self.game.profile
+        self.assertEqual(self.game.timers.get_tick("mode"),
+                         profile.mode_cycle[0] * constants.TICKRATE)
+        self.game.timers.advance(profile.mode_cycle[0] * constants.TICKRATE)
+        self.assertEqual(self.game.previous_ghosts_state, constants.CHASE)
+        self.assertEqual(self.game.timers.get_tick("mode"),
+                         profile.mode_cycle[1] * constants.TICKRATE)
+
+    def test_fright_pauses_mode_clock(self):
+        fright_ticks = self.game.profile.fright_ticks
+        self.game.player.power_pellets += 1
+        self.game.frighten_ghosts()
+        self.assertIsNone(self.game.timers.get_tick("mode"))
+        self.assertEqual(self.game.get_fright(), fright_ticks)
+        self.game.tick = fright_ticks
+        self.game.timers.advance(self.game.tick)
+        self.assertEqual(self.game.get_fright(), 0)
+        self.assertEqual(self.game.timers.get_tick("mode"),
+                         self.game.profile.mode_cycle[0] * constants.TICKRATE
+                         + fright_ticks)
+        for ghost in self.game.ghosts.values():
+            self.assertEqual(ghost.state, constants.SCATTER)
+
+    def test_ghosts_are_released(self):
+        inky = self.game.ghosts["inky"]
+        self.assertEqual(self.game.releases.get_pending(),
+                         [(30, "inky"), (60, "clyde")])
+        for tile_x, tile_y, _ in list(self.game.pellets)[-30:]:
+            self.game.pellets.remove(tile_x, tile_y)
+        self.game.step()
+        self.assertFalse(inky.freeze)
+        self.assertTrue(self.game.ghosts["clyde"].freeze)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Module containing viewport - part of the map shown in the game window"""
+import pygame
+
+import constants
+
+
+class Viewport:
+    """Window into the map following the player
+
+    Maps bigger than the viewport are scrolled - the view moves only when
+    the player gets close to its edge and then centers on the player, so
+    the whole view has to be redrawn only from time to time."""
+    def __init__(self, map_width_px, map_height_px,
+                 max_width=constants.VIEWPORT_WIDTH_PX,
+                 max_height=constants.VIEWPORT_HEIGHT_PX):
+        self.map_width_px = map_width_px
+        self.map_height_px = map_height_px
+        self.width = min(map_width_px, max_width)
+        self.height = min(map_height_px, max_height)
+        self.x = 0
+        self.y = 0
+
+    @property
+    def rect(self):
+        """Returns window rectangle the map is shown in"""
+        return pygame.Rect(0, 0, self.width, self.height)
+
+    @property
+    def world_rect(self):
+        """Returns rectangle of the map currently shown"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def follow(self, x, y):
+        """Moves the view if given point is close to its edge
+
+        Returns True when the view moved and has to be redrawn."""
+        new_x = self.get_position(self.x, x, self.width, self.map_width_px)
+        new_y = self.get_position(self.y, y, self.height, self.map_height_px)
+        if (new_x, new_y) == (self.x, self.y):
+            return False
+        self.x, self.y = new_x, new_y
+        return True
+
+    @staticmethod
+    def get_position(position, point, size, map_size):
+        """Returns view position along one axis for given point"""
+        margin = size // 4
+        if margin <= point - position < size - margin:
+            return position
+        return int(max(0, min(map_size - size, point - size // 2)))
+
+    def to_screen(self, x, y):
+        """Converts map pixel coordinates to window coordinates"""
+        return x - self.x, y - self.y
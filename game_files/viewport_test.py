@@ -0,0 +1,31 @@
+"""Viewport module tests"""
+import unittest
+
+import viewport
+
+
+class ViewportTest(unittest.TestCase):
+    def test_small_map_is_not_scrolled(self):
+        view = viewport.Viewport(640, 480, 896, 992)
+        self.assertEqual((view.width, view.height), (640, 480))
+        self.assertFalse(view.follow(630, 470))
+        self.assertEqual((view.x, view.y), (0, 0))
+
+    def test_follow(self):
+        view = viewport.Viewport(3200, 3200, 800, 600)
+        self.assertFalse(view.follow(400, 300))
+        self.assertFalse(view.follow(599, 449))
+        self.assertTrue(view.follow(600, 300))
+        self.assertEqual((view.x, view.y), (200, 0))
+        self.assertEqual(view.to_screen(600, 300), (400, 300))
+
+    def test_follow_stays_in_map(self):
+        view = viewport.Viewport(3200, 3200, 800, 600)
+        self.assertTrue(view.follow(3190, 3190))
+        self.assertEqual((view.x, view.y), (2400, 2600))
+        self.assertTrue(view.follow(10, 3190))
+        self.assertEqual((view.x, view.y), (0, 2600))
+
+
+if __name__ == "__main__":
+    unittest.main()
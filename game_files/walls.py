@@ -0,0 +1,119 @@
+"""Module containing wall layer - walls prerendered in square chunks
+
+Only chunks around the viewport are rendered and kept in a small cache,
+so maps of any size use the same amount of memory for wall graphics."""
+import collections
+import pygame
+
+import constants, drawhelper, map as gamemap
+
+# Tiles drawn around every chunk
+CHUNK_MARGIN = 2
+
+WALL_SHAPES = {
+    0: lambda x, y, surface: drawhelper.draw_arc(x + .5, y + .5, 1 / 2, 1,
+                                                 surface=surface),
+    1: lambda x, y, surface: drawhelper.draw_arc(x - .5, y + .5, 0, 1 / 2,
+                                                 surface=surface),
+    2: lambda x, y, surface: drawhelper.draw_arc(x - .5, y - .5, 3 / 2, 0,
+                                                 surface=surface),
+    3: lambda x, y, surface: drawhelper.draw_arc(x + .5, y - .5, 1, 3 / 2,
+                                                 surface=surface),
+    4: lambda x, y, surface: drawhelper.draw_line(x + .5, y, x + .5, y + 1,
+                                                  surface=surface),
+    5: lambda x, y, surface: drawhelper.draw_line(x, y + .5, x + 1, y + .5,
+                                                  surface=surface),
+}
+
+
+def render_walls(surface, level_map, left, top):
+    """Draws walls on given surface with its top left corner at given tile"""
+    width = level_map.width
+    right = min(width, left + surface.get_width() // constants.TILE_SIZE)
+    bottom = min(level_map.height,
+                 top + surface.get_height() // constants.TILE_SIZE)
+    for tile_y in range(max(0, top), bottom):
+        for tile_x in range(max(0, left), right):
+            wall_type = level_map.wall_types[tile_y * width + tile_x]
+            if wall_type != gamemap.NO_WALL:
+                WALL_SHAPES[wall_type](tile_x - left, tile_y - top, surface)
+
+
+class WallLayer:
+    """Walls of the map rendered lazily in chunks of few tiles
+
+    Least recently used chunks are dropped when the cache is full."""
+    def __init__(self, level_map, chunk_tiles=constants.WALL_CHUNK_TILES,
+                 cache_size=constants.WALL_CHUNK_CACHE):
+        self.map = level_map
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * constants.TILE_SIZE
+        self.cache_size = cache_size
+        self.chunks = collections.OrderedDict()
+        self.prefetched = None
+
+    def render_chunk(self, chunk_x, chunk_y):
+        """Returns new surface with walls of given chunk
+
+        Walls are drawn with a margin, so shapes of neighbouring tiles
+        reaching into the chunk are drawn whole - clipped lines and arcs
+        are rasterized differently."""
+        margin = CHUNK_MARGIN * constants.TILE_SIZE
+        surface = pygame.Surface((self.chunk_size + 2 * margin,
+                                  self.chunk_size + 2 * margin)).convert()
+        surface.fill(constants.BACKGROUND_COLOR)
+        render_walls(surface, self.map,
+                     chunk_x * self.chunk_tiles - CHUNK_MARGIN,
+                     chunk_y * self.chunk_tiles - CHUNK_MARGIN)
+        return surface.subsurface((margin, margin, self.chunk_size,
+                                   self.chunk_size)).copy()
+
+    def get_chunk(self, chunk_x, chunk_y):
+        """Returns surface of given chunk - rendered only if not cached"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = self.render_chunk(chunk_x, chunk_y)
+            if len(self.chunks) > self.cache_size:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def get_chunk_range(self, world_rect, margin=0):
+        """Returns chunk coordinates covering given map rectangle"""
+        first_x = max(0, world_rect.left // self.chunk_size - margin)
+        first_y = max(0, world_rect.top // self.chunk_size - margin)
+        last_x = min((self.map.width_px - 1) // self.chunk_size,
+                     (world_rect.right - 1) // self.chunk_size + margin)
+        last_y = min((self.map.height_px - 1) // self.chunk_size,
+                     (world_rect.bottom - 1) // self.chunk_size + margin)
+        return [(chunk_x, chunk_y) for chunk_y in range(first_y, last_y + 1)
+                for chunk_x in range(first_x, last_x + 1)]
+
+    def draw(self, surface, rect, view):
+        """Draws walls lying under given window rectangle, returns it"""
+        world_rect = pygame.Rect(rect).move(view.x, view.y)
+        for chunk_x, chunk_y in self.get_chunk_range(world_rect):
+            chunk_rect = pygame.Rect(chunk_x * self.chunk_size,
+                                     chunk_y * self.chunk_size,
+                                     self.chunk_size, self.chunk_size)
+            area = chunk_rect.clip(world_rect)
+            surface.blit(self.get_chunk(chunk_x, chunk_y),
+                         view.to_screen(area.x, area.y),
+                         area.move(-chunk_rect.x, -chunk_rect.y))
+        return pygame.Rect(rect)
+
+    def prefetch(self, view):
+        """Renders one missing chunk next to the view, returns if it did
+
+        Called once a frame, so chunks are ready before the view moves.
+        Nothing is checked again until the view moves once all are ready."""
+        if self.prefetched == (view.x, view.y):
+            return False
+        for chunk_x, chunk_y in self.get_chunk_range(view.world_rect, 1):
+            if (chunk_x, chunk_y) not in self.chunks:
+                self.get_chunk(chunk_x, chunk_y)
+                return True
+        self.prefetched = (view.x, view.y)
+        return False